@@ -0,0 +1,97 @@
+import argparse
+import json
+import time
+
+from gurobipy import Model, GRB
+
+from generate import generate
+from gurobi import build
+
+SIZES = [(5, 6), (50, 52), (100, 52), (200, 104), (400, 104)]
+
+
+def build_loop_model(data):
+    """Previous formulation: one addConstr per (month, oil) row."""
+    months = data["months"]
+    veg_oils = data["veg_oils"]
+    oil_oils = data["oil_oils"]
+    all_oils = veg_oils + oil_oils
+    prices = data["prices"]
+    hardness = data["hardness"]
+    max_refining = data["max_refining"]
+    params = data["parameters"]
+    h_min, h_max = params["h_min"], params["h_max"]
+    initial_stock = params["initial_stock"]
+
+    model = Model("Oil Blending Extended")
+    purchase = model.addVars(months, all_oils, lb=0, name="purchase")
+    storage = model.addVars(months, all_oils, lb=0, name="storage")
+    refine = model.addVars(months, all_oils, lb=0, name="refine")
+    production = model.addVars(months, lb=0, name="production")
+    use = model.addVars(months, all_oils, vtype=GRB.BINARY, name="use")
+
+    model.setObjective(
+        sum(params["sell_price"] * production[m] - sum(prices[m][i] * purchase[m, oil] for i, oil in enumerate(all_oils))
+            - sum(params["storage_cost"] * storage[m, oil] for oil in all_oils) for m in months),
+        GRB.MAXIMIZE
+    )
+
+    for oil in all_oils:
+        for t, month in enumerate(months):
+            prev_stock = initial_stock if t == 0 else storage[months[t - 1], oil]
+            model.addConstr(storage[month, oil] == prev_stock + purchase[month, oil] - refine[month, oil])
+    for m in months:
+        model.addConstr(sum(refine[m, oil] for oil in veg_oils) <= params["refine_cap_veg"])
+        model.addConstr(sum(refine[m, oil] for oil in oil_oils) <= params["refine_cap_oil"])
+        model.addConstr(production[m] == sum(refine[m, oil] for oil in all_oils))
+        model.addConstr(h_min * production[m] <= sum(hardness[oil] * refine[m, oil] for oil in all_oils))
+        model.addConstr(h_max * production[m] >= sum(hardness[oil] * refine[m, oil] for oil in all_oils))
+        for oil in all_oils:
+            model.addConstr(storage[m, oil] <= params["storage_cap"])
+    for oil in all_oils:
+        model.addConstr(storage[months[-1], oil] == initial_stock)
+    for m in months:
+        model.addConstr(sum(use[m, oil] for oil in all_oils) <= 3)
+        for oil in all_oils:
+            model.addConstr(refine[m, oil] >= 20 * use[m, oil])
+            model.addConstr(refine[m, oil] <= max_refining[oil] * use[m, oil])
+        if all(oil in all_oils for oil in ("VEG1", "VEG2", "OIL3")):
+            model.addConstr(use[m, "VEG1"] + use[m, "VEG2"] <= use[m, "OIL3"])
+
+    model.update()
+    return model
+
+
+def time_build(builder, data):
+    start = time.perf_counter()
+    model = builder(data)
+    model.update()
+    elapsed = time.perf_counter() - start
+    size = (model.NumVars, model.NumConstrs)
+    model.dispose()
+    return elapsed, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare loop and matrix model build times for Food Manufacture")
+    parser.add_argument("--sizes", nargs="*", default=[f"{n}x{t}" for n, t in SIZES],
+                        help="instance sizes as OILSxMONTHS")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'oils':>6} {'months':>7} {'vars':>9} {'constrs':>9} {'loop (s)':>10} {'matrix (s)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        n_oils, n_months = (int(v) for v in size.lower().split("x"))
+        data = generate(n_oils, n_months)
+        loop_time, (n_vars, n_constrs) = time_build(build_loop_model, data)
+        matrix_time, _ = time_build(build, data)
+        results.append({"oils": n_oils, "months": n_months, "vars": n_vars, "constrs": n_constrs,
+                        "loop_seconds": loop_time, "matrix_seconds": matrix_time})
+        print(f"{n_oils:>6} {n_months:>7} {n_vars:>9} {n_constrs:>9} {loop_time:>10.3f} {matrix_time:>11.3f} "
+              f"{loop_time / matrix_time:>7.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,76 @@
+import argparse
+import json
+
+from gurobipy import GRB, GurobiError
+
+from generate import generate
+from tighten import VARIANTS, build_variant
+
+SIZES = [(5, 6), (10, 12), (20, 12), (30, 12)]
+TOLERANCE = 1e-6
+
+
+def run(data, variant, time_limit):
+    model = build_variant(data, variant)
+    model.Params.OutputFlag = 0
+    model.Params.TimeLimit = time_limit
+    relaxed = model.relax()
+    relaxed.optimize()
+    model.optimize()
+    return {"variant": variant, "root_bound": relaxed.ObjVal if relaxed.Status == GRB.OPTIMAL else None,
+            "objective": model.ObjVal if model.SolCount else None, "bound": model.ObjBound,
+            "nodes": int(model.NodeCount), "time": model.Runtime, "optimal": model.Status == GRB.OPTIMAL}
+
+
+def objectives_agree(rows):
+    """Whether the variants solved to optimality reach the same objective (they are the same model)."""
+    objectives = [row["objective"] for row in rows if row.get("optimal")]
+    return not objectives or max(objectives) - min(objectives) <= TOLERANCE * max(1.0, max(map(abs, objectives)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Node counts and solve times of the big-M, tightened, indicator and SOS "
+                                                 "formulations")
+    parser.add_argument("--sizes", nargs="*", default=[f"{n}x{t}" for n, t in SIZES], help="OILSxMONTHS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--loose", action="store_true",
+                        help="use the storage cap as max_refining (a naive big-M) to show what propagation recovers")
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results, mismatches = [], []
+    print(f"{'oils':>5} {'months':>6} {'variant':>10} {'root bound':>12} {'objective':>12} {'nodes':>8} {'time (s)':>9}")
+    for size in args.sizes:
+        n_oils, n_months = (int(v) for v in size.lower().split("x"))
+        if (n_oils, n_months) == (5, 6):
+            with open("data.json", "r") as file:
+                data = json.load(file)
+        else:
+            data = generate(n_oils, n_months, args.seed)
+        if args.loose:
+            data["max_refining"] = {oil: data["parameters"]["storage_cap"] for oil in data["max_refining"]}
+        rows = []
+        for variant in VARIANTS:
+            try:
+                row = run(data, variant, args.time_limit)
+            except GurobiError as error:
+                row = {"variant": variant, "error": str(error)}
+            rows.append(row)
+            results.append({"oils": n_oils, "months": n_months, **row})
+            if "error" in row:
+                print(f"{n_oils:>5} {n_months:>6} {variant:>10} {'error':>12}")
+                continue
+            root = f"{row['root_bound']:>12.2f}" if row["root_bound"] is not None else f"{'-':>12}"
+            print(f"{n_oils:>5} {n_months:>6} {variant:>10} {root} {row['objective']:>12.2f} {row['nodes']:>8} "
+                  f"{row['time']:>9.3f}{'' if row['optimal'] else ' (time limit)'}")
+        if not objectives_agree(rows):
+            mismatches.append(size)
+            print(f"{n_oils:>5} {n_months:>6}   optimal objectives differ between variants")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
+    if mismatches:
+        raise SystemExit(f"Variants disagree on {', '.join(mismatches)}")
@@ -0,0 +1,94 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS, BINARY, EQUAL, GREATER_EQUAL, LESS_EQUAL, MAXIMIZE, Model  # noqa: E402
+
+MAX_OILS_PER_MONTH = 3
+MIN_REFINE_IF_USED = 20
+VEG_TRIGGERS = ("VEG1", "VEG2")
+REQUIRED_OIL = "OIL3"
+
+
+# Food Manufacture on the solver-agnostic layer; gurobi.py and matrix_gurobi.py compile this model.
+# Each constraint family is one sparse block over months x oils, so large blends build in bulk.
+def build(data, big_m=None):
+    """``big_m`` optionally overrides the refine <= M * use coefficients with a (months x oils) array."""
+    months = data["months"]
+    veg_oils = data["veg_oils"]
+    all_oils = veg_oils + data["oil_oils"]
+    params = data["parameters"]
+    T, N = len(months), len(all_oils)
+
+    prices = np.array([data["prices"][m] for m in months], dtype=float)
+    hardness = np.array([data["hardness"][oil] for oil in all_oils], dtype=float)
+    is_veg = np.array([oil in veg_oils for oil in all_oils], dtype=float)
+    if big_m is None:
+        big_m = np.broadcast_to(np.array([data["max_refining"][oil] for oil in all_oils], dtype=float), (T, N))
+
+    model = Model("Oil Blending Extended")
+
+    # Decision variables, with the final stock requirement as bounds on the last month's storage
+    final = np.zeros((T, N), dtype=bool)
+    final[-1] = True
+    purchase = model.add_block(months, all_oils, obj=-prices, name="purchase")
+    storage = model.add_block(months, all_oils, lb=np.where(final, params["initial_stock"], 0.0),
+                              ub=np.where(final, params["initial_stock"], params["storage_cap"]),
+                              obj=-params["storage_cost"], name="storage")
+    refine = model.add_block(months, all_oils, name="refine")
+    production = model.add_block(months, obj=params["sell_price"], name="production")
+    use = model.add_block(months, all_oils, vtype=BINARY, name="use")
+
+    # Objective: Maximize profit
+    model.model_sense = MAXIMIZE
+
+    I_T, I_TN = sp.identity(T, format="csr"), sp.identity(T * N, format="csr")
+    per_month = sp.kron(I_T, np.ones((1, N)), format="csr")  # sums a [month, oil] block over oils
+
+    # Inventory balance: storage[t] - storage[t-1] - purchase[t] + refine[t] = opening stock in month 0
+    previous = sp.kron(sp.eye(T, k=-1), sp.identity(N), format="csr")
+    opening = np.zeros((T, N))
+    opening[0] = params["initial_stock"]
+    model.add_mconstr([(storage, I_TN - previous), (purchase, -I_TN), (refine, I_TN)], EQUAL, opening.ravel(),
+                      "balance")
+
+    # Refining capacity, production balance and hardness window
+    model.add_mconstr([(refine, sp.kron(I_T, is_veg[None, :]))], LESS_EQUAL, params["refine_cap_veg"], "refine_veg")
+    model.add_mconstr([(refine, sp.kron(I_T, 1 - is_veg[None, :]))], LESS_EQUAL, params["refine_cap_oil"],
+                      "refine_oil")
+    model.add_mconstr([(production, I_T), (refine, -per_month)], EQUAL, 0.0, "production")
+    hard = sp.kron(I_T, hardness[None, :])
+    model.add_mconstr([(refine, hard), (production, -params["h_min"] * I_T)], GREATER_EQUAL, 0.0, "hardness_min")
+    model.add_mconstr([(refine, hard), (production, -params["h_max"] * I_T)], LESS_EQUAL, 0.0, "hardness_max")
+
+    # At most 3 oils, minimum 20 tons if used, and refine <= M * use
+    model.add_mconstr([(use, per_month)], LESS_EQUAL, MAX_OILS_PER_MONTH, "max_oils")
+    model.add_mconstr([(refine, I_TN), (use, -MIN_REFINE_IF_USED * I_TN)], GREATER_EQUAL, 0.0, "min_batch")
+    model.add_mconstr([(refine, I_TN), (use, -sp.diags(np.asarray(big_m, dtype=float).ravel()))], LESS_EQUAL, 0.0,
+                      "max_refine")
+
+    # Using VEG1 or VEG2 requires OIL3
+    if all(oil in all_oils for oil in VEG_TRIGGERS + (REQUIRED_OIL,)):
+        rule = np.zeros((1, N))
+        rule[0, [all_oils.index(oil) for oil in VEG_TRIGGERS]] = 1
+        rule[0, all_oils.index(REQUIRED_OIL)] = -1
+        model.add_mconstr([(use, sp.kron(I_T, rule))], LESS_EQUAL, 0.0, "veg_requires_oil3")
+
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Food Manufacture with a selectable backend")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--data", default="data.json")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    result = build(data).solve(args.backend)
+    print(f"[{result.backend}] status: {result.status}, profit: £{result.objective:.2f}, time: {result.runtime:.3f}s")
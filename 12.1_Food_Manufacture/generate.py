@@ -0,0 +1,52 @@
+import argparse
+import json
+
+import numpy as np
+
+
+# Generate a synthetic Food Manufacture instance with the same schema as data.json
+def generate(n_oils=5, n_months=6, seed=0):
+    rng = np.random.default_rng(seed)
+    n_veg = max(2, n_oils * 2 // 5)
+    n_oil = max(3, n_oils - n_veg)
+
+    veg_oils = [f"VEG{i + 1}" for i in range(n_veg)]
+    oil_oils = [f"OIL{i + 1}" for i in range(n_oil)]
+    all_oils = veg_oils + oil_oils
+    months = [f"M{t + 1}" for t in range(n_months)]
+
+    prices = rng.integers(80, 151, size=(n_months, len(all_oils)))
+    hardness = np.concatenate([rng.uniform(5.0, 9.0, n_veg), rng.uniform(1.5, 5.5, n_oil)]).round(1)
+
+    return {
+        "months": months,
+        "veg_oils": veg_oils,
+        "oil_oils": oil_oils,
+        "prices": {m: prices[t].tolist() for t, m in enumerate(months)},
+        "hardness": dict(zip(all_oils, hardness.tolist())),
+        "max_refining": {oil: 200 if oil in veg_oils else 250 for oil in all_oils},
+        "parameters": {
+            "refine_cap_veg": 200,
+            "refine_cap_oil": 250,
+            "storage_cap": 1000,
+            "storage_cost": 5,
+            "sell_price": 150,
+            "h_min": 3,
+            "h_max": 6,
+            "initial_stock": 500,
+            "final_stock": 500
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Food Manufacture instance")
+    parser.add_argument("--oils", type=int, default=5)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="generated_data.json")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as file:
+        json.dump(generate(args.oils, args.months, args.seed), file, indent=2)
+    print(f"Instance with {args.oils} oils x {args.months} months saved to {args.output} ✅")
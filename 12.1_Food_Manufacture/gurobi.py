@@ -1,135 +1,79 @@
-import json
-from gurobipy import Model, GRB
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+from gurobipy import GRB
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common import binary, export, instrument  # noqa: E402
+from common.backend import optimize_gurobi as solve  # noqa: E402
+from common.backend import to_gurobi_model  # noqa: E402
+from common.chapters import load_module  # noqa: E402
+
+__all__ = ["load_data", "build", "solve", "report", "main"]
+
+formulation = load_module("12.1", "formulation")
+
 
 # Load data from JSON file
-with open("data.json", "r") as file:
-    data = json.load(file)
-
-# Extract data
-months = data["months"]
-veg_oils = data["veg_oils"]
-oil_oils = data["oil_oils"]
-all_oils = veg_oils + oil_oils
-prices = data["prices"]
-hardness = data["hardness"]
-max_refining = data["max_refining"]
-
-# Extract parameters
-params = data["parameters"]
-refine_cap_veg = params["refine_cap_veg"]
-refine_cap_oil = params["refine_cap_oil"]
-storage_cap = params["storage_cap"]
-storage_cost = params["storage_cost"]
-sell_price = params["sell_price"]
-h_min, h_max = params["h_min"], params["h_max"]
-initial_stock = params["initial_stock"]
-
-# Model
-model = Model("Oil Blending Extended")
-
-# Decision variables
-purchase = model.addVars(months, all_oils, lb=0, name="purchase")
-storage = model.addVars(months, all_oils, lb=0, name="storage")
-refine = model.addVars(months, all_oils, lb=0, name="refine")
-production = model.addVars(months, lb=0, name="production")
-use = model.addVars(months, all_oils, vtype=GRB.BINARY, name="use")  # Binary variables
-
-# Objective: Maximize profit
-model.setObjective(
-    sum(sell_price * production[m] - sum(prices[m][i] * purchase[m, oil] for i, oil in enumerate(all_oils))
-        - sum(storage_cost * storage[m, oil] for oil in all_oils) for m in months),
-    GRB.MAXIMIZE
-)
-
-# Constraints
-
-# Inventory balance
-for i, oil in enumerate(all_oils):
-    for t, month in enumerate(months):
-        prev_stock = initial_stock if t == 0 else storage[months[t - 1], oil]
-        model.addConstr(storage[month, oil] == prev_stock + purchase[month, oil] - refine[month, oil])
-
-# Refining capacity constraints
-for m in months:
-    model.addConstr(sum(refine[m, oil] for oil in veg_oils) <= refine_cap_veg)
-    model.addConstr(sum(refine[m, oil] for oil in oil_oils) <= refine_cap_oil)
-
-# Production balance
-for m in months:
-    model.addConstr(production[m] == sum(refine[m, oil] for oil in all_oils))
-
-# Hardness constraints
-for m in months:
-    model.addConstr(
-        h_min * production[m] <= sum(hardness[oil] * refine[m, oil] for oil in all_oils)
-    )
-    model.addConstr(
-        h_max * production[m] >= sum(hardness[oil] * refine[m, oil] for oil in all_oils)
-    )
-
-# Storage limits
-for m in months:
-    for oil in all_oils:
-        model.addConstr(storage[m, oil] <= storage_cap)
-
-# # Final stock requirement
-for oil in all_oils:
-    model.addConstr(storage["Jun", oil] == initial_stock)
-
-# **Additional Constraints**
-
-# (1) At most 3 oils are used in a month
-for m in months:
-    model.addConstr(sum(use[m, oil] for oil in all_oils) <= 3)
-
-# (2) If an oil is used, at least 20 tons must be refined
-for m in months:
-    for oil in all_oils:
-        model.addConstr(refine[m, oil] >= 20 * use[m, oil])
-        model.addConstr(refine[m, oil] <= max_refining[oil] * use[m, oil])  # Using Mi instead of a single M
-
-# (3) If VEG1 or VEG2 is used, then OIL3 must also be used
-for m in months:
-    model.addConstr(use[m, "VEG1"] + use[m, "VEG2"] <= use[m, "OIL3"])
-
-# Solve the model
-model.optimize()
-
-# Print results
-with open('solution.txt', 'w') as file:
-    if model.status == GRB.OPTIMAL:
-        print(f"\n===========================")
-        print(f"Optimal Total Profit: £{model.objVal:.2f}")
-        file.write(f"Optimal Total Profit: £{model.objVal:.2f}\n")
-        print(f"===========================")
-
-        for t, m in enumerate(months):
-            # Compute monthly profit
-            revenue = sell_price * production[m].x
-            cost_oil = sum(prices[m][i] * purchase[m, oil].x for i, oil in enumerate(all_oils))
-            cost_storage = sum(storage_cost * storage[months[t - 1], oil].x for oil in all_oils) if t > 0 else 0
-            profit_t = revenue - cost_oil - cost_storage
-
-            print(f"\nMonth: {m}")
-            print(f"  Profit: £{profit_t:.2f}")
-            print(f"  Production: {production[m].x:.2f} tons")
-            file.write(f"\nMonth: {m}\n")
-            file.write(f"  Profit: £{profit_t:.2f}\n")
-            file.write(f"  Production: {production[m].x:.2f} tons\n")
-
-            used_oils = []
-            for oil in all_oils:
-                if use[m, oil].x > 0.5:  # Used in the blend
-                    used_oils.append(oil)
-                    print(f"  Purchase {oil}: {purchase[m, oil].x:.2f} tons")
-                    print(f"  Refine {oil}: {refine[m, oil].x:.2f} tons")
-                    print(f"  Storage {oil}: {storage[m, oil].x:.2f} tons")
-                    file.write(f"  Purchase {oil}: {purchase[m, oil].x:.2f} tons\n")
-                    file.write(f"  Refine {oil}: {refine[m, oil].x:.2f} tons\n")
-                    file.write(f"  Storage {oil}: {storage[m, oil].x:.2f} tons\n")
-
-            print(f"  Oils Used: {used_oils}")
-            file.write(f"  Oils Used: {used_oils}\n")
-
-file.close()
-print("\nResults saved to solution.txt ✅")
+def load_data(path="data.json"):
+    return binary.read(path)
+
+
+def build(data, env=None):
+    # The model is the layer formulation of formulation.py, compiled to a named gurobipy model
+    return to_gurobi_model(formulation.build(data), env)
+
+
+# Export results
+def report(model, data, out):
+    if model.status != GRB.OPTIMAL:
+        return
+    months, all_oils = data["months"], data["veg_oils"] + data["oil_oils"]
+    storage_cost, sell_price = data["parameters"]["storage_cost"], data["parameters"]["sell_price"]
+    out.line(f"Optimal Total Profit: £{model.objVal:.2f}")
+    purchase_x, storage_x, refine_x, use_x = (
+        pd.DataFrame(model._vars[name].X, index=months, columns=all_oils)
+        for name in ("purchase", "storage", "refine", "use"))
+    production_x = pd.Series(model._vars["production"].X, index=months)
+
+    # Monthly profit (storage is charged on the previous month's closing stock)
+    cost_oil = (pd.DataFrame(binary.array(data["prices"], months), index=months, columns=all_oils) * purchase_x).sum(axis=1)
+    cost_storage = storage_cost * storage_x.shift(1).fillna(0).sum(axis=1)
+    used = use_x > 0.5
+    summary = pd.DataFrame({
+        "Profit": sell_price * production_x - cost_oil - cost_storage,
+        "Production": production_x,
+        "Oils Used": used.apply(lambda row: ", ".join(row.index[row]), axis=1),
+    }).round(2)
+    out.table("Monthly Plan", summary)
+
+    blend = pd.DataFrame({"Purchase": purchase_x.stack(), "Refine": refine_x.stack(),
+                          "Storage": storage_x.stack()})[used.stack()]
+    out.table("Blend Plan", blend.rename_axis(["Month", "Oil"]).round(2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Food Manufacture with extra logical conditions")
+    parser.add_argument("--data", default="data.json")
+    export.add_arguments(parser, "solution.txt")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics = instrument.Instrument(args.metrics, args.metrics_format, run="12.1")
+
+    metrics.mark("load")
+    data = load_data(args.data)
+    metrics.mark("build")
+    model = build(data)
+    solve(model, metrics=metrics)
+    metrics.mark("report")
+    with export.SolutionWriter(args.output, args.format, args.echo) as out:
+        report(model, data, out)
+    metrics.close()
+
+    print(f"\nResults saved to {args.output} ✅")
+
+
+if __name__ == "__main__":
+    main()
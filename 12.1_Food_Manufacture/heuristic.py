@@ -0,0 +1,172 @@
+"""Construction heuristic and local search for Food Manufacture, used as a MIP start.
+
+A plan is the set of oils used in each month (the binary ``use``). With the sets fixed, what is
+left (purchases, storage and refining) is an LP. ``Completion`` solves that LP on a continuous
+copy of the built model by fixing the ``use`` bounds, so each plan is scored exactly and re-solves
+start from the previous basis.
+
+    construct   per month, ranks each group's oils by price plus a penalty for hardness outside
+                the window, and keeps the best set of at most 3 of the top oils by a one-month
+                blending LP (``MonthBlend``)
+    improve     first-improvement local search over swap, drop and add moves in one month,
+                scored with the completion LP
+    warm_start  runs both and writes the completed plan into the model's Start attributes
+"""
+import itertools as it
+import time
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from matrix_gurobi import MAX_OILS_PER_MONTH, MIN_REFINE_IF_USED, REQUIRED_OIL, VEG_TRIGGERS
+
+
+def allowed(oils):
+    """The VEG1/VEG2 rule of gurobi.py: at most one of them, and only together with OIL3."""
+    triggers = sum(oil in VEG_TRIGGERS for oil in oils)
+    return triggers <= (REQUIRED_OIL in oils)
+
+
+class MonthBlend:
+    """One month's blending LP over all oils; a set of oils is scored by opening only their bounds."""
+
+    def __init__(self, data, env=None):
+        self.data = data
+        self.all_oils = data["veg_oils"] + data["oil_oils"]
+        params = data["parameters"]
+        hardness = np.array([data["hardness"][oil] for oil in self.all_oils])
+        is_veg = np.array([oil in data["veg_oils"] for oil in self.all_oils], dtype=float)
+        self.model = gp.Model(env=env)
+        self.model.Params.OutputFlag = 0
+        self.refine = self.model.addMVar(len(self.all_oils), ub=0.0)
+        self.model.addConstr(is_veg @ self.refine <= params["refine_cap_veg"])
+        self.model.addConstr((1 - is_veg) @ self.refine <= params["refine_cap_oil"])
+        self.model.addConstr((hardness - params["h_min"]) @ self.refine >= 0)
+        self.model.addConstr((hardness - params["h_max"]) @ self.refine <= 0)
+        self.max_refining = np.array([data["max_refining"][oil] for oil in self.all_oils], dtype=float)
+
+    def profit(self, month, oils):
+        """Best profit of refining exactly these oils, all bought at this month's prices (None if infeasible)."""
+        params = self.data["parameters"]
+        chosen = np.isin(self.all_oils, oils)
+        self.refine.LB = np.where(chosen, MIN_REFINE_IF_USED, 0.0)
+        self.refine.UB = np.where(chosen, self.max_refining, 0.0)
+        self.refine.Obj = params["sell_price"] - np.array(self.data["prices"][month], dtype=float)
+        self.model.ModelSense = GRB.MAXIMIZE
+        self.model.optimize()
+        return self.model.ObjVal if self.model.Status == GRB.OPTIMAL else None
+
+    def dispose(self):
+        self.model.dispose()
+
+
+def ranked(data, month, hardness_weight=10.0):
+    """Each group's oils, cheapest first, with prices raised by the hardness distance outside the window."""
+    params = data["parameters"]
+    all_oils = data["veg_oils"] + data["oil_oils"]
+    score = {}
+    for oil, price in zip(all_oils, data["prices"][month]):
+        outside = max(params["h_min"] - data["hardness"][oil], data["hardness"][oil] - params["h_max"], 0.0)
+        score[oil] = price + hardness_weight * outside
+    return [sorted(group, key=score.get) for group in (data["veg_oils"], data["oil_oils"])]
+
+
+def candidates(data, month, top):
+    veg, oil = ranked(data, month)
+    pool = veg[:top] + oil[:top]
+    if any(trigger in pool for trigger in VEG_TRIGGERS) and REQUIRED_OIL in oil and REQUIRED_OIL not in pool:
+        pool.append(REQUIRED_OIL)
+    return pool
+
+
+def construct(data, top=3, env=None):
+    """Use sets per month, as a (months x oils) boolean array in the order veg_oils + oil_oils."""
+    all_oils = data["veg_oils"] + data["oil_oils"]
+    blend = MonthBlend(data, env)
+    use = np.zeros((len(data["months"]), len(all_oils)), dtype=bool)
+    for t, month in enumerate(data["months"]):
+        best, best_profit = (), -np.inf
+        pool = candidates(data, month, top)
+        for size in range(1, MAX_OILS_PER_MONTH + 1):
+            for oils in it.combinations(pool, size):
+                if not allowed(oils):
+                    continue
+                profit = blend.profit(month, oils)
+                if profit is not None and profit > best_profit:
+                    best, best_profit = oils, profit
+        use[t, [all_oils.index(oil) for oil in best]] = True
+    blend.dispose()
+    return use
+
+
+class Completion:
+    """The model's LP with ``use`` fixed; scores a plan and returns the values of every variable."""
+
+    def __init__(self, model, data):
+        model.update()
+        self.index = np.array([var.index for var in model._vars["use"].reshape(-1).tolist()]).reshape(
+            len(data["months"]), -1)
+        self.lp = model.relax()
+        self.lp.Params.OutputFlag = 0
+        self.vars = self.lp.getVars()
+
+    def fix(self, use, months=slice(None)):
+        fixed = [self.vars[j] for j in self.index[months].ravel().tolist()]
+        value = use[months].ravel().astype(float).tolist()
+        self.lp.setAttr("LB", fixed, value)
+        self.lp.setAttr("UB", fixed, value)
+
+    def solve(self, use, months=slice(None)):
+        """Objective and variable values with ``use`` fixed; only the given months' bounds are rewritten."""
+        self.fix(use, months)
+        self.lp.optimize()
+        if self.lp.Status != GRB.OPTIMAL:
+            return -np.inf, None
+        return self.lp.ObjVal, np.array(self.lp.getAttr("X", self.vars))
+
+    def dispose(self):
+        self.lp.dispose()
+
+
+def improve(data, use, completion, top=4, time_limit=5.0):
+    """First-improvement local search on one month's set at a time, scored by the completion LP."""
+    all_oils = data["veg_oils"] + data["oil_oils"]
+    use = use.copy()
+    best, _ = completion.solve(use)
+    deadline = time.perf_counter() + time_limit
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for t, month in enumerate(data["months"]):
+            current = [all_oils[n] for n in np.flatnonzero(use[t])]
+            others = [oil for oil in candidates(data, month, top) if oil not in current]
+            moves = [(out, into) for out in current for into in others + [None] if len(current) > 1 or into]
+            if len(current) < MAX_OILS_PER_MONTH:
+                moves += [(None, into) for into in others]
+            for out, into in moves:
+                oils = [oil for oil in current if oil != out] + ([into] if into else [])
+                if not allowed(oils):
+                    continue
+                trial = use.copy()
+                trial[t] = False
+                trial[t, [all_oils.index(oil) for oil in oils]] = True
+                profit, _ = completion.solve(trial, [t])
+                if profit > best + 1e-6:
+                    use, best, improved = trial, profit, True
+                    break
+            completion.fix(use, [t])
+            if time.perf_counter() >= deadline:
+                break
+    return use
+
+
+def warm_start(model, data, top=3, time_limit=5.0, env=None):
+    """Set the completed heuristic plan as the MIP start of a model built by gurobi.build; returns its objective."""
+    completion = Completion(model, data)
+    use = improve(data, construct(data, top, env), completion, time_limit=time_limit)
+    objective, values = completion.solve(use)
+    completion.dispose()
+    if values is not None:
+        model.setAttr("Start", model.getVars(), values.tolist())
+    return objective
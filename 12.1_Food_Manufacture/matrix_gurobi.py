@@ -0,0 +1,71 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from gurobipy import GRB
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import to_gurobi_model  # noqa: E402
+from common.chapters import load_module  # noqa: E402
+
+formulation = load_module("12.1", "formulation")
+MAX_OILS_PER_MONTH = formulation.MAX_OILS_PER_MONTH
+MIN_REFINE_IF_USED = formulation.MIN_REFINE_IF_USED
+VEG_TRIGGERS = formulation.VEG_TRIGGERS
+REQUIRED_OIL = formulation.REQUIRED_OIL
+
+LINKING = ("bigm", "indicator", "sos")
+
+
+def build_matrix_model(data, big_m=None, linking="bigm", env=None):
+    """The sparse-block formulation of formulation.py as a gurobipy model, with a choice of use/refine linking.
+
+    ``big_m`` optionally overrides the refine <= M * use coefficients with a (months x oils)
+    array. ``linking`` selects how use switches refine on and off: "bigm" rows, "indicator"
+    constraints, or "sos" (SOS1 pairs of refine and 1 - use, with the min-batch row kept). The
+    last two are Gurobi-only, so they replace the big-M rows after the model is compiled.
+    """
+    if linking not in LINKING:
+        raise ValueError(f"Unknown linking '{linking}', expected one of {LINKING}")
+    model = to_gurobi_model(formulation.build(data, big_m), env)
+    if linking == "bigm":
+        return model
+
+    refine, use = model._vars["refine"], model._vars["use"]
+    model.remove(model._rows["max_refine"])
+    # Without big-M rows the per-oil refining limit is a bound
+    refine.UB = np.broadcast_to([data["max_refining"][oil] for oil in data["veg_oils"] + data["oil_oils"]],
+                                refine.shape)
+    pairs = list(zip(refine.reshape(-1).tolist(), use.reshape(-1).tolist()))
+    if linking == "indicator":
+        model.remove(model._rows["min_batch"])
+        for r, u in pairs:
+            model.addGenConstrIndicator(u, True, r, GRB.GREATER_EQUAL, MIN_REFINE_IF_USED)
+            model.addGenConstrIndicator(u, False, r, GRB.LESS_EQUAL, 0.0)
+    else:
+        # unused = 1 - use, and at most one of (refine, unused) is nonzero
+        unused = model.addMVar(use.shape, ub=1.0, name="unused")
+        model.addConstr(unused + use == 1, name="unused")
+        for (r, _), n in zip(pairs, unused.reshape(-1).tolist()):
+            model.addSOS(GRB.SOS_TYPE1, [r, n], [1, 2])
+    model.update()
+    return model
+
+
+if __name__ == "__main__":
+    with open("data.json", "r") as file:
+        data = json.load(file)
+
+    profits = {}
+    for linking in LINKING:
+        model = build_matrix_model(data, linking=linking)
+        model.Params.OutputFlag = 0
+        model.optimize()
+        profits[linking] = model.objVal if model.status == GRB.OPTIMAL else None
+        model.dispose()
+
+    print(f"\n===========================")
+    for linking, profit in profits.items():
+        print(f"{linking:<10} profit: " + (f"£{profit:.2f}" if profit is not None else "no optimal solution"))
+    print(f"===========================")
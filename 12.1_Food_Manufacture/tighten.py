@@ -0,0 +1,87 @@
+import argparse
+import json
+
+import numpy as np
+from scipy.optimize import linprog
+
+from matrix_gurobi import MAX_OILS_PER_MONTH, MIN_REFINE_IF_USED, REQUIRED_OIL, VEG_TRIGGERS, build_matrix_model
+
+
+def propagate_bounds(data, max_rounds=10):
+    """Tightest valid M for refine[m, oil] <= M * use[m, oil], as a (months x oils) array.
+
+    For each oil, M is the optimum of a small LP over one month's refining: maximize that oil's
+    refining subject to the veg/non-veg refining capacities, the per-oil limits, the hardness
+    window, the "at most 3 oils" cardinality (as sum(refine / M) <= 3) and, for VEG1/VEG2, the
+    minimum batch of OIL3 that using them forces. The M values feed back into the limits and
+    the LPs are re-solved until nothing tightens. Oils whose M falls below the minimum batch
+    can never be used and get M = 0. Purchases are unbounded, so the storage cap and opening
+    stock do not limit a month's refining and every month gets the same bound.
+    """
+    all_oils = data["veg_oils"] + data["oil_oils"]
+    params = data["parameters"]
+    N = len(all_oils)
+    hardness = np.array([data["hardness"][oil] for oil in all_oils], dtype=float)
+    is_veg = np.array([oil in data["veg_oils"] for oil in all_oils])
+    M = np.array([data["max_refining"][oil] for oil in all_oils], dtype=float)
+    required = all_oils.index(REQUIRED_OIL) if REQUIRED_OIL in all_oils else None
+
+    # Rows: veg capacity, oil capacity, hardness >= h_min, hardness <= h_max (cardinality row added per round)
+    A = np.vstack([is_veg, ~is_veg, params["h_min"] - hardness, hardness - params["h_max"]]).astype(float)
+    b = np.array([params["refine_cap_veg"], params["refine_cap_oil"], 0.0, 0.0])
+
+    for _ in range(max_rounds):
+        usable = M >= MIN_REFINE_IF_USED
+        cardinality = np.where(usable, 1 / np.where(usable, M, 1), 0.0)
+        A_ub, b_ub = np.vstack([A, cardinality]), np.r_[b, MAX_OILS_PER_MONTH]
+        tight = np.zeros(N)
+        for i in np.flatnonzero(usable):
+            bounds = np.column_stack([np.zeros(N), np.where(usable, M, 0.0)])
+            if all_oils[i] in VEG_TRIGGERS and required is not None:
+                bounds[required, 0] = MIN_REFINE_IF_USED
+            c = np.zeros(N)
+            c[i] = -1
+            result = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method="highs")
+            tight[i] = -result.fun if result.status == 0 else 0.0
+        tight[tight < MIN_REFINE_IF_USED] = 0.0
+        if np.allclose(tight, M):
+            break
+        M = np.minimum(M, tight)
+    return np.broadcast_to(M, (len(data["months"]), N)).copy()
+
+
+VARIANTS = ("bigm", "tight", "indicator", "sos")
+
+
+def build_variant(data, variant):
+    """bigm: max_refining as M; tight: propagated M; indicator/sos: no M, oils that can never be used are fixed off."""
+    if variant == "bigm":
+        return build_matrix_model(data)
+    M = propagate_bounds(data)
+    if variant == "tight":
+        return build_matrix_model(data, big_m=M)
+    model = build_matrix_model(data, linking=variant)
+    use = model._vars["use"]
+    use.UB = np.where(M == 0, 0.0, 1.0)
+    model.update()
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Big-M tightening for Food Manufacture's use/refine linking")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--variant", choices=VARIANTS, default="tight")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    all_oils = data["veg_oils"] + data["oil_oils"]
+    M = propagate_bounds(data)
+    print("Big-M per oil (max_refining -> propagated):")
+    for n, oil in enumerate(all_oils):
+        print(f"  {oil:8} {data['max_refining'][oil]:>8.1f} -> {M[0, n]:8.1f}")
+
+    model = build_variant(data, args.variant)
+    model.Params.OutputFlag = 0
+    model.optimize()
+    print(f"[{args.variant}] profit: £{model.ObjVal:.2f}, nodes: {model.NodeCount:.0f}, time: {model.Runtime:.3f}s")
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import time
+
+import gurobipy as gp
+from gurobipy import GurobiError
+
+from stochastic import extensive_form, l_shaped, sample_scenarios
+
+SCENARIOS = [10, 30, 100, 300, 1000]
+
+
+def run_extensive(data, scenarios):
+    try:
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            start = time.perf_counter()
+            model, _ = extensive_form(data, scenarios, env)
+            model.optimize()
+            result = {"objective": model.ObjVal, "seconds": time.perf_counter() - start}
+            model.dispose()
+            return result
+    except GurobiError as error:
+        return {"error": str(error)}
+
+
+def run_l_shaped(data, scenarios, workers, groups):
+    try:
+        result = l_shaped(data, scenarios, workers, groups)
+    except GurobiError as error:
+        return {"error": str(error)}
+    result.pop("production")
+    result.pop("history")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve time of the stochastic Factory Planning model by scenario count")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--scenarios", type=int, nargs="*", default=SCENARIOS)
+    parser.add_argument("--cv", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--groups", type=int, default=10, help="L-shaped cuts per iteration (0: one per scenario)")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+
+    results = []
+    print(f"{'scenarios':>9} {'extensive':>12} {'time (s)':>9} {'l-shaped':>12} {'time (s)':>9} {'master':>7} "
+          f"{'scen.':>7} {'iters':>6} {'cuts':>5} {'blocks':>6}")
+    for n in args.scenarios:
+        scenarios = sample_scenarios(data, n, args.cv, args.seed)
+        extensive = run_extensive(data, scenarios)
+        shaped = run_l_shaped(data, scenarios, args.workers, args.groups or None)
+        results.append({"scenarios": n, "extensive": extensive, "l_shaped": shaped})
+
+        def cells(r):
+            if "error" in r:
+                return f"{'error':>12} {'-':>9}"
+            return f"{r['objective']:>12.2f} {r['seconds']:>9.3f}"
+        detail = f"{'-':>7} {'-':>7} {'-':>6} {'-':>5} {'-':>6}" if "error" in shaped else (
+            f"{shaped['master_seconds']:>7.2f} {shaped['recourse_seconds']:>7.2f} {shaped['iterations']:>6} "
+            f"{shaped['cuts']:>5} {shaped['feasibility_blocks']:>6}")
+        print(f"{n:>9} {cells(extensive)} {cells(shaped)} {detail}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
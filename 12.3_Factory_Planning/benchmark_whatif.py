@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import gurobipy as gp
+from gurobipy import GRB, GurobiError
+
+from gurobi import build, load_data
+from whatif import MONTHS, WhatIf, apply, parse
+
+BATCHES = [10, 100, 1000]
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gurobi.py")
+
+
+def random_scenarios(data, n, seed=0):
+    """Scenarios of one to three lost machine-days or demand changes of up to 200 units."""
+    rng = random.Random(seed)
+    machines, products = list(data["machine_availability"]), range(1, len(data["demand"]) + 1)
+    scenarios = []
+    for _ in range(n):
+        specs = []
+        for _ in range(rng.randint(1, 3)):
+            month = rng.choice(MONTHS[1:])
+            if rng.random() < 0.5:
+                specs.append(f"days:{rng.choice(machines)}:{month}-{rng.randint(1, 5)}")
+            else:
+                specs.append(f"demand:{rng.choice(products)}:{month}{rng.randint(-200, 200):+d}")
+        scenarios.append(",".join(specs))
+    return scenarios
+
+
+def run_batch(data, scenarios, method):
+    try:
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            start = time.perf_counter()
+            whatif = WhatIf(data, env)
+            profits = getattr(whatif, method.replace("-", "_"))(scenarios)
+            seconds = time.perf_counter() - start
+            whatif.dispose()
+    except GurobiError as error:
+        return {"error": str(error)}
+    return {"profits": profits, "seconds": seconds}
+
+
+def run_rebuild(data, scenarios):
+    """Build and solve gurobi.py's model from the perturbed data of each scenario, in this process."""
+    profits = []
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        start = time.perf_counter()
+        for scenario in scenarios:
+            model = build(apply(data, parse(scenario)), env)
+            model.optimize()
+            profits.append(model.ObjVal if model.Status == GRB.OPTIMAL else None)
+            model.dispose()
+    return {"profits": profits, "seconds": time.perf_counter() - start}
+
+
+def run_script(data, scenarios):
+    """Write each scenario's data.json and run gurobi.py on it, as is done by hand today."""
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as folder:
+        for k, scenario in enumerate(scenarios):
+            path = os.path.join(folder, f"data_{k}.json")
+            with open(path, "w") as file:
+                json.dump(apply(data, parse(scenario)), file)
+            subprocess.run([sys.executable, SCRIPT, "--data", path, "--output", os.path.join(folder, f"solution_{k}.txt")],
+                           check=True, capture_output=True)
+    return {"seconds": time.perf_counter() - start}
+
+
+def max_difference(profits, reference):
+    return max((abs(a - b) for a, b in zip(profits, reference) if a is not None and b is not None), default=0.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput of batched what-if solves vs one solve per scenario")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--batches", type=int, nargs="*", default=BATCHES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--script-runs", type=int, default=20,
+                        help="scenarios run as separate gurobi.py processes (their rate is per scenario)")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    data = load_data(args.data)
+    script = run_script(data, random_scenarios(data, args.script_runs, args.seed))
+    script_rate = args.script_runs / script["seconds"]
+    print(f"gurobi.py per scenario: {script_rate:.1f} scenarios/s ({args.script_runs} runs)\n")
+
+    results = []
+    print(f"{'scenarios':>9} {'method':>15} {'time (s)':>9} {'scenarios/s':>12} {'vs script':>10} {'max diff':>9}")
+    for n in args.batches:
+        scenarios = random_scenarios(data, n, args.seed)
+        rebuild = run_rebuild(data, scenarios)
+        rows = {"rebuild": rebuild, **{method: run_batch(data, scenarios, method)
+                                       for method in ("resolve", "multi-scenario")}}
+        for method, row in rows.items():
+            if "error" in row:
+                print(f"{n:>9} {method:>15} {'error':>9}   {row['error']}")
+                continue
+            row["rate"] = n / row["seconds"]
+            row["max_difference"] = max_difference(row["profits"], rebuild["profits"])
+            print(f"{n:>9} {method:>15} {row['seconds']:>9.3f} {row['rate']:>12.1f} {row['rate'] / script_rate:>9.0f}x "
+                  f"{row['max_difference']:>9.2e}")
+        for row in rows.values():
+            row.pop("profits", None)
+        results.append({"scenarios": n, **rows})
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"script_rate": script_rate, "batches": results}, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS, MAXIMIZE, Model, quicksum  # noqa: E402
+
+
+# Factory Planning formulation on the solver-agnostic layer (same model as gurobi.py)
+def build(data):
+    products = data["products"]
+    months = range(0, len(data["demand"][0]))
+    # Rows are indexed by product position, so binary-instance arrays are used without a copy
+    profit = data["profit"]
+    processing_time = data["time_required"]
+    machine_availability = data["machine_availability"]
+    market_demand = data["demand"]
+    total_hours_per_machine = data["working_hours_per_day"] * data["working_days_per_month"]
+    holding_cost = data["holding_cost"]
+    max_inventory = data.get("max_inventory", 100)
+
+    model = Model("Factory_Production_Optimization")
+
+    # Decision variables
+    MPROD = model.add_vars(products, months, name="MPROD")
+    SPROD = model.add_vars(products, months, name="SPROD")
+    HPROD = model.add_vars(products, months, name="HPROD")
+
+    # Objective function: Maximize total profit
+    model.set_objective(
+        quicksum(profit[i - 1] * SPROD[i, t] for i in products for t in months)
+        - holding_cost * quicksum(HPROD[i, t] for i in products for t in months),
+        MAXIMIZE
+    )
+
+    # Machine capacity (month 0 uses the first month's availability)
+    for machine, times in processing_time.items():
+        for t in months:
+            available_capacity = machine_availability[machine][max(t - 1, 0)] * total_hours_per_machine
+            model.add_constr(quicksum(times[i - 1] * MPROD[i, t] for i in products) <= available_capacity,
+                             f"{machine}_capacity_month_{t}")
+
+    for i in products:
+        for t in months:
+            model.add_constr(SPROD[i, t] <= market_demand[i - 1][t], f"Market_demand_{i}_month_{t}")
+            model.add_constr(SPROD[i, t] <= MPROD[i, t] + HPROD[i, t], f"Sales_limit_{i}_month_{t}")
+            model.add_constr(HPROD[i, t] <= max_inventory, f"Max_hold_{i}_month_{t}")
+        for t in months[1:]:
+            model.add_constr(HPROD[i, t - 1] + MPROD[i, t] - SPROD[i, t] - HPROD[i, t] == 0,
+                             f"Stock_balance_{i}_month_{t}")
+        model.add_constr(HPROD[i, months[-1]] == data["final_inventory"], f"End_inventory_{i}")
+        model.add_constr(HPROD[i, 1] == data["initial_inventory"], f"Initial_inventory_{i}")
+
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Factory Planning with a selectable backend")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--data", default="data.json")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    result = build(data).solve(args.backend)
+    print(f"[{result.backend}] status: {result.status}, profit: £{result.objective:.2f}, time: {result.runtime:.3f}s")
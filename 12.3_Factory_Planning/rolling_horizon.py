@@ -0,0 +1,201 @@
+import argparse
+import json
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+
+
+class RollingHorizonPlanner:
+    """Factory Planning model kept in memory and shifted one month at a time.
+
+    Months are calendar months 1, 2, ...; demand and machine availability for month t are
+    taken from the data cyclically, so the horizon can roll past the months in data.json.
+    The first month of every window starts from the inventory left by the last realized month.
+    """
+
+    def __init__(self, data, start=1, window=6, opening_inventory=None, warm_start=True, output_flag=0):
+        self.data = data
+        self.products = data["products"]
+        self.profit = dict(zip(self.products, data["profit"]))
+        self.processing_time = data["time_required"]
+        self.hours = data["working_hours_per_day"] * data["working_days_per_month"]
+        self.max_inventory = data.get("max_inventory", 100)
+        self.warm_start = warm_start
+
+        self.model = gp.Model("Factory_Rolling_Horizon")
+        self.model.Params.OutputFlag = output_flag
+        self.model.ModelSense = GRB.MAXIMIZE
+        self.periods = {}
+        self.opening_inventory = opening_inventory or {i: data["initial_inventory"] for i in self.products}
+        self.terminal = []
+        for t in range(start, start + window):
+            self._add_period(t)
+        self._set_terminal()
+
+    # Forecasts for month t, cycling through the months in the data
+    def demand(self, i, t):
+        columns = len(self.data["demand"][0]) - 1
+        return self.data["demand"][i - 1][(t - 1) % columns + 1]
+
+    def availability(self, machine, t):
+        months = self.data["machine_availability"][machine]
+        return months[(t - 1) % len(months)]
+
+    @property
+    def window(self):
+        return [t for t in sorted(self.periods) if not self.periods[t]["fixed"]]
+
+    def _add_period(self, t):
+        model, products = self.model, self.products
+        M = {i: model.addVar(name=f"MPROD[{i},{t}]") for i in products}
+        S = {i: model.addVar(ub=self.demand(i, t), obj=self.profit[i], name=f"SPROD[{i},{t}]") for i in products}
+        H = {i: model.addVar(ub=self.max_inventory, obj=-self.data["holding_cost"], name=f"HPROD[{i},{t}]")
+             for i in products}
+        constrs = []
+        for machine, times in self.processing_time.items():
+            constrs.append(model.addConstr(gp.quicksum(times[i - 1] * M[i] for i in products)
+                                           <= self.availability(machine, t) * self.hours,
+                                           f"{machine}_capacity_month_{t}"))
+        previous = self.periods.get(t - 1)
+        for i in products:
+            constrs.append(model.addConstr(S[i] <= M[i] + H[i], f"Sales_limit_{i}_month_{t}"))
+            if previous is None:
+                constrs.append(model.addConstr(M[i] - S[i] - H[i] == -self.opening_inventory[i],
+                                               f"Stock_balance_{i}_month_{t}"))
+            else:
+                constrs.append(model.addConstr(previous["H"][i] + M[i] - S[i] - H[i] == 0,
+                                               f"Stock_balance_{i}_month_{t}"))
+        self.periods[t] = {"M": M, "S": S, "H": H, "constrs": constrs, "fixed": False}
+
+    def _set_terminal(self):
+        if self.terminal:
+            self.model.remove(self.terminal)
+        last = self.periods[max(self.periods)]["H"]
+        self.terminal = [self.model.addConstr(last[i] == self.data["final_inventory"], f"End_inventory_{i}")
+                         for i in self.products]
+
+    def solve(self):
+        self.model.optimize()
+        if self.model.Status != GRB.OPTIMAL:
+            raise RuntimeError(f"Window {self.window[0]}-{self.window[-1]} not solved to optimality "
+                               f"(status {self.model.Status})")
+        return self.model.ObjVal
+
+    def shift(self):
+        """Fix the first month of the window at its plan and append the next month."""
+        first = self.window[0]
+        period = self.periods[first]
+        if self.warm_start:
+            vbasis = self.model.getAttr("VBasis", self.model.getVars())
+            cbasis = self.model.getAttr("CBasis", self.model.getConstrs())
+            rows = len(self.periods[max(self.periods)]["constrs"])
+            dropped = sum(3 * len(self.products) for t in self.periods if t < first)
+        # Realized month: fix its decisions and drop its sunk contribution from the objective
+        realized = [*period["M"].values(), *period["S"].values(), *period["H"].values()]
+        values = self.model.getAttr("X", realized)
+        self.model.setAttr("LB", realized, values)
+        self.model.setAttr("UB", realized, values)
+        self.model.setAttr("Obj", realized, [0.0] * len(realized))
+        period["fixed"] = True
+        # Only the latest realized inventory is needed, so older realized months are removed
+        for t in [t for t in self.periods if t < first]:
+            old = self.periods.pop(t)
+            self.model.remove([*old["M"].values(), *old["S"].values(), *old["H"].values()])
+        self.model.remove(period["constrs"])
+        period["constrs"] = []
+        self._add_period(max(self.periods) + 1)
+        self._set_terminal()
+        if self.warm_start:
+            self._shift_basis(vbasis, cbasis, dropped, rows)
+        else:
+            self.model.reset()
+
+    def _shift_basis(self, vbasis, cbasis, dropped, rows):
+        """Carry the previous basis over to the shifted window by position.
+
+        Columns are laid out month by month (the realized month, then the window) and rows month
+        by month (``rows`` per window month) with the end-of-window rows last. Shifting the window
+        drops the first ``dropped`` column statuses and the first month of row statuses, and the
+        appended month and end-of-window rows copy the statuses of the month before them. Removing
+        the realized month's rows changes the number of basic columns needed, so the count is
+        repaired by making the realized columns and then the appended ones nonbasic, or the
+        appended ones basic, as required.
+        """
+        block, terminal = 3 * len(self.products), len(self.terminal)
+        vstatus = vbasis[dropped:] + vbasis[-block:]
+        cstatus = cbasis[rows:-terminal] + cbasis[-(rows + terminal):]
+        self.model.update()
+        surplus = vstatus.count(0) + cstatus.count(0) - len(cstatus)
+        appended = [(vstatus, k) for k in range(len(vstatus) - block, len(vstatus))]
+        appended += [(cstatus, k) for k in range(len(cstatus) - rows - terminal, len(cstatus))]
+        realized = [(vstatus, k) for k in range(block)]
+        for status, k in (realized + appended if surplus > 0 else appended):
+            if surplus == 0:
+                break
+            if surplus > 0 and status[k] == 0:
+                status[k], surplus = -1, surplus - 1
+            elif surplus < 0 and status[k] != 0:
+                status[k], surplus = 0, surplus + 1
+        self.model.setAttr("VBasis", self.model.getVars(), vstatus)
+        self.model.setAttr("CBasis", self.model.getConstrs(), cstatus)
+
+    def plan(self):
+        return {t: {i: (self.periods[t]["M"][i].X, self.periods[t]["S"][i].X, self.periods[t]["H"][i].X)
+                    for i in self.products} for t in self.window}
+
+
+def cold_rebuild(data, start, window, opening_inventory):
+    """Build and solve a fresh model for the window (the baseline a rolling re-plan is compared with)."""
+    planner = RollingHorizonPlanner(data, start, window, opening_inventory)
+    objective = planner.solve()
+    iterations = planner.model.IterCount
+    planner.model.dispose()
+    return objective, iterations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling-horizon re-planning for Factory Planning")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--window", type=int, default=6, help="months in each planning window")
+    parser.add_argument("--replans", type=int, default=12, help="number of monthly re-plans")
+    parser.add_argument("--no-warm-start", action="store_true", help="discard the basis between re-plans")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+
+    start = time.perf_counter()
+    planner = RollingHorizonPlanner(data, window=args.window, warm_start=not args.no_warm_start)
+    planner.solve()
+    print(f"Initial plan for months 1-{args.window} in {time.perf_counter() - start:.4f}s")
+
+    print(f"\n{'window':>8} {'profit':>12} {'warm (s)':>9} {'iters':>6} {'cold (s)':>9} {'iters':>6} {'speedup':>8}")
+    warm_total = cold_total = 0.0
+    warm_iterations = cold_iterations = 0
+    for _ in range(args.replans):
+        start = time.perf_counter()
+        planner.shift()
+        objective = planner.solve()
+        warm_time = time.perf_counter() - start
+        warm_iters = planner.model.IterCount
+
+        first = planner.window[0]
+        opening = {i: planner.periods[first - 1]["H"][i].X for i in planner.products}
+        start = time.perf_counter()
+        cold_objective, cold_iters = cold_rebuild(data, first, args.window, opening)
+        cold_time = time.perf_counter() - start
+        if abs(cold_objective - objective) > 1e-6 * max(1.0, abs(objective)):
+            raise RuntimeError(f"Warm ({objective}) and cold ({cold_objective}) plans disagree")
+
+        warm_total += warm_time
+        cold_total += cold_time
+        warm_iterations += warm_iters
+        cold_iterations += cold_iters
+        window = f"{first}-{planner.window[-1]}"
+        print(f"{window:>8} {objective:>12.2f} {warm_time:>9.4f} {warm_iters:>6.0f} {cold_time:>9.4f} "
+              f"{cold_iters:>6.0f} {cold_time / warm_time:>7.1f}x")
+
+    label = "in-memory, no basis" if args.no_warm_start else "warm"
+    print(f"\nMean re-plan latency: {label} {warm_total / args.replans:.4f}s, cold rebuild {cold_total / args.replans:.4f}s")
+    print(f"Simplex iterations: {label} {warm_iterations:.0f}, cold rebuild {cold_iterations:.0f}")
@@ -0,0 +1,179 @@
+"""What-if analysis of machine availability and market demand for Factory Planning, solved as one batch.
+
+A scenario is one or more perturbations of data.json, written KIND:NAME:MONTH+AMOUNT (or -AMOUNT)
+and joined by commas:
+
+    days:Grinding:2-1         a grinder loses one working day in month 2
+    machines:Boring:3+1       one more boring machine in month 3
+    demand:5:3-100            100 fewer units of product 5 can be sold in month 3
+
+Only right-hand sides change: the capacity and market-demand rows of gurobi.py, set to what
+gurobi.py would build from the perturbed data (availability and demand are floored at 0). The
+batch therefore runs on one model of gurobi.py, built and solved once, either as a Gurobi
+multi-scenario model (``NumScenarios``, one ``ScenNRHS`` set per scenario) or by warm-started
+re-solves that change the right-hand sides, re-optimize from the previous basis and restore them.
+
+    python whatif.py "days:Grinding:2-1" "days:Boring:3-1,demand:5:3+100"
+    python whatif.py --each-day-lost --method resolve --output whatif.csv --format csv
+"""
+import argparse
+import copy
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+from gurobipy import GRB
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common import export  # noqa: E402
+from gurobi import build, load_data  # noqa: E402
+
+METHODS = ("multi-scenario", "resolve")
+KINDS = ("days", "machines", "demand")
+MONTHS = range(0, 7)  # the months of gurobi.py; month 0 has no demand and month 1's availability
+
+_SPEC = re.compile(r"^(?P<kind>\w+):(?P<name>\w+):(?P<month>\d+)(?P<amount>[+-]\d+(\.\d*)?)$")
+
+
+def parse(scenario):
+    """The perturbations of a scenario string as (kind, name, month, amount) tuples."""
+    perturbations = []
+    for spec in scenario.split(","):
+        match = _SPEC.match(spec.strip())
+        if match is None or match["kind"] not in KINDS:
+            raise ValueError(f"bad perturbation {spec!r}, expected KIND:NAME:MONTH+AMOUNT with KIND in {KINDS}")
+        perturbations.append((match["kind"], match["name"], int(match["month"]), float(match["amount"])))
+    return perturbations
+
+
+def apply(data, perturbations):
+    """A copy of ``data`` with the perturbations applied."""
+    data = copy.deepcopy(data)
+    for kind, name, month, amount in perturbations:
+        if not 1 <= month < len(MONTHS):
+            raise ValueError(f"month {month} is outside 1..{len(MONTHS) - 1}")
+        if kind == "demand":
+            row = data["demand"][int(name) - 1]
+            row[month] = max(row[month] + amount, 0)
+        else:
+            if name not in data["machine_availability"]:
+                raise ValueError(f"unknown machine {name!r}, expected one of {list(data['machine_availability'])}")
+            if kind == "days":
+                amount /= data["working_days_per_month"]
+            months = data["machine_availability"][name]
+            months[month - 1] = max(months[month - 1] + amount, 0)
+    return data
+
+
+def right_hand_sides(data):
+    """Right-hand side of each capacity and market-demand row that gurobi.py builds from ``data``."""
+    hours = data["working_hours_per_day"] * data["working_days_per_month"]
+    rows = {}
+    for machine, months in data["machine_availability"].items():
+        for t in MONTHS:
+            rows[f"{machine}_capacity_month_{t}"] = months[max(t - 1, 0)] * hours
+    for i, row in enumerate(data["demand"], start=1):
+        for t in MONTHS:
+            rows[f"Market_demand_{i}_month_{t}"] = row[t]
+    return rows
+
+
+def each_day_lost(data):
+    """One scenario per machine and month in which a machine of that kind loses a working day."""
+    return [f"days:{machine}:{t}-1" for machine in data["machine_availability"] for t in MONTHS[1:]]
+
+
+class WhatIf:
+    """The model of gurobi.py, solved once, against which batches of scenarios are evaluated."""
+
+    def __init__(self, data, env=None):
+        self.data = data
+        self.model = build(data, env)
+        self.model.Params.OutputFlag = 0
+        self.model.optimize()
+        self.base = self.model.ObjVal
+        self.rows = {row.ConstrName: row for row in self.model.getConstrs()}
+        self.base_rhs = right_hand_sides(data)
+
+    def changes(self, scenario):
+        """The rows whose right-hand side the scenario changes, with their new values."""
+        rhs = right_hand_sides(apply(self.data, parse(scenario)))
+        return {self.rows[name]: value for name, value in rhs.items() if value != self.base_rhs[name]}
+
+    def multi_scenario(self, scenarios):
+        """Profits of all scenarios from one multi-scenario solve (None when infeasible)."""
+        model = self.model
+        model.NumScenarios = 0  # drop the scenarios of a previous batch
+        model.NumScenarios = len(scenarios)
+        model.Params.MIPGap = 0.0  # a multi-scenario model is solved by the MIP code
+        for k, scenario in enumerate(scenarios):
+            model.Params.ScenarioNumber = k
+            for row, value in self.changes(scenario).items():
+                row.ScenNRHS = value
+        model.optimize()
+        profits = []
+        for k in range(len(scenarios)):
+            model.Params.ScenarioNumber = k
+            profits.append(model.ScenNObjVal if abs(model.ScenNObjVal) < GRB.INFINITY else None)
+        return profits
+
+    def resolve(self, scenarios):
+        """Profits of the scenarios by warm-started re-solves of the base model (None when infeasible)."""
+        model = self.model
+        model.NumScenarios = 0
+        profits = []
+        for scenario in scenarios:
+            changes = self.changes(scenario)
+            rows = list(changes)
+            model.setAttr("RHS", rows, list(changes.values()))
+            model.optimize()
+            profits.append(model.ObjVal if model.Status == GRB.OPTIMAL else None)
+            # Restored from the data, as RHS reads still see the last update before the next optimize
+            model.setAttr("RHS", rows, [self.base_rhs[name] for name in model.getAttr("ConstrName", rows)])
+        return profits
+
+    def evaluate(self, scenarios, method="multi-scenario"):
+        """Table of the profit and its change from the base plan per scenario."""
+        profits = getattr(self, method.replace("-", "_"))(scenarios)
+        table = pd.DataFrame({"Profit": profits}, index=pd.Index(scenarios, name="Scenario"), dtype=float)
+        table["Delta"] = table["Profit"] - self.base
+        return table
+
+    def dispose(self):
+        self.model.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Factory Planning profit under availability and demand perturbations")
+    parser.add_argument("scenarios", nargs="*", help="perturbations KIND:NAME:MONTH+AMOUNT joined by commas")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--each-day-lost", action="store_true",
+                        help="add one scenario per machine and month that loses a working day")
+    parser.add_argument("--method", choices=METHODS, default="multi-scenario")
+    export.add_arguments(parser, "whatif.txt")
+    args = parser.parse_args(argv)
+
+    data = load_data(args.data)
+    scenarios = args.scenarios + (each_day_lost(data) if args.each_day_lost else [])
+    if not scenarios:
+        parser.error("no scenarios given")
+    for scenario in scenarios:
+        apply(data, parse(scenario))  # reject bad scenarios before solving
+
+    whatif = WhatIf(data)
+    start = time.perf_counter()
+    table = whatif.evaluate(scenarios, args.method)
+    seconds = time.perf_counter() - start
+    whatif.dispose()
+    with export.SolutionWriter(args.output, args.format, args.echo) as out:
+        out.line(f"Base profit: £{whatif.base:.2f}")
+        out.line(f"{len(scenarios)} scenarios solved by {args.method} in {seconds:.3f}s")
+        out.table("What-if", table.round(2))
+
+    print(f"\nResults saved to {args.output} ✅")
+
+
+if __name__ == "__main__":
+    main()
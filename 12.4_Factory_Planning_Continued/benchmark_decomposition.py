@@ -0,0 +1,50 @@
+import argparse
+import json
+
+from gurobipy import GurobiError
+
+from decomposition import solve_benders, solve_monolithic
+from generate import generate
+
+SIZES = [(5, 6), (10, 12), (20, 12), (40, 24)]
+
+
+def run(solver, *args):
+    try:
+        return solver(*args)
+    except GurobiError as error:
+        return {"error": str(error)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benders vs monolithic MIP on generated maintenance instances")
+    parser.add_argument("--sizes", nargs="*", default=[f"{m}x{t}" for m, t in SIZES], help="MACHINESxMONTHS")
+    parser.add_argument("--products", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=1, help="processes for the month LPs (1: in this process)")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'machines':>8} {'months':>7} {'monolithic':>14} {'time (s)':>9} {'aggregate':>14} {'time (s)':>9} "
+          f"{'benders':>14} {'time (s)':>9} {'rounds':>6} {'cuts':>5}")
+    for size in args.sizes:
+        n_machines, n_months = (int(v) for v in size.lower().split("x"))
+        data = generate(n_machines, n_months, args.products)
+        mono = run(solve_monolithic, data)
+        aggregate = run(solve_monolithic, data, "aggregate")
+        benders = run(solve_benders, data, args.workers)
+        benders.pop("schedule", None)
+        results.append({"machines": n_machines, "months": n_months, "monolithic": mono, "aggregate": aggregate,
+                        "benders": benders})
+
+        def cells(r):
+            if "error" in r:
+                return f"{'error':>14} {'-':>9}"
+            return f"{r['objective']:>14.2f} {r['time']:>9.3f}"
+        print(f"{n_machines:>8} {n_months:>7} {cells(mono)} {cells(aggregate)} {cells(benders)} "
+              f"{benders.get('iterations', '-'):>6} {benders.get('cuts', '-'):>5}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,116 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB, GurobiError
+
+from formulation import SYMMETRY, build, schedule
+from generate import generate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import Result, gurobi_status, to_gurobi  # noqa: E402
+
+SIZES = [(5, 6, 3), (5, 12, 6), (10, 12, 6), (10, 12, 10), (20, 12, 6)]
+
+
+def scale_demand(data, load):
+    """Demand scaled so that ``load`` = 1 needs the capacity of the least loaded machine type (median month)."""
+    demand = np.array(data["demand"], dtype=float)
+    hours = data["working_hours_per_day"] * data["working_days_per_month"]
+    ratios = []
+    for machine, count in data["machine_types"].items():
+        capacity = count * np.array(data["machine_availability"][machine]) * hours
+        needed = np.array(data["time_required"][machine]) @ demand[:, 1:]
+        ratios.append(np.median(capacity / np.maximum(needed, 1e-9)))
+    data["demand"] = (demand * min(ratios) * load).round().tolist()
+    return data
+
+
+def run(data, symmetry, time_limit, env):
+    """Solve one formulation; returns its record and the per-machine schedule it expands to."""
+    model = build(data, symmetry)
+    model_gp, x = to_gurobi(model.to_matrix(), env)
+    model_gp.Params.TimeLimit = time_limit
+    start = time.perf_counter()
+    model_gp.optimize()
+    record = {"status": gurobi_status(model_gp), "seconds": time.perf_counter() - start,
+              "nodes": model_gp.NodeCount, "variables": model.num_vars, "constraints": model.num_constrs}
+    plan = None
+    if model_gp.SolCount > 0:
+        record.update(objective=model_gp.ObjVal, bound=model_gp.ObjBound)
+        plan = schedule(model, Result("gurobi", record["status"], model_gp.ObjVal, x.X), data)
+    model_gp.dispose()
+    return record, plan
+
+
+def run_highs(data, symmetry, time_limit):
+    result = build(data, symmetry).solve("highs", time_limit=time_limit)
+    return {"status": result.status, "objective": result.objective, "seconds": result.runtime}
+
+
+def check(data, plan, env):
+    """Profit of the per-machine model with its maintenance binaries fixed to an expanded schedule."""
+    model = build(data, "none")
+    down = set(plan)
+    for key, var in model.variables["MDown"].items():
+        model.set_bounds(var, lb=float(key in down), ub=float(key in down))
+    model_gp, _ = to_gurobi(model.to_matrix(), env)
+    model_gp.optimize()
+    value = model_gp.ObjVal if model_gp.Status == GRB.OPTIMAL else None
+    model_gp.dispose()
+    return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Node count and solve time of the maintenance symmetry handlings")
+    parser.add_argument("--sizes", nargs="*", default=[f"{m}x{t}x{c}" for m, t, c in SIZES],
+                        help="MACHINESxMONTHSxMAXCOUNT")
+    parser.add_argument("--products", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load", type=float, default=None,
+                        help="scale demand to this multiple of the capacity (default: generated demand)")
+    parser.add_argument("--time-limit", type=float, default=120.0)
+    parser.add_argument("--gurobi-symmetry", type=int, default=-1,
+                        help="Gurobi's own Symmetry parameter (-1 automatic, 0 off)")
+    parser.add_argument("--highs", action="store_true", help="also time each formulation with HiGHS")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'size':>10} {'machines':>8} {'symmetry':>10} {'vars':>6} {'objective':>12} {'bound':>12} {'nodes':>9} "
+          f"{'time (s)':>9} {'expanded':>12}" + (f" {'HiGHS (s)':>10}" if args.highs else ""))
+    with gp.Env(params={"OutputFlag": 0, "Symmetry": args.gurobi_symmetry}) as env:
+        for size in args.sizes:
+            n_machines, n_months, max_count = (int(v) for v in size.lower().split("x"))
+            data = generate(n_machines, n_months, args.products, args.seed, max_count)
+            if args.load is not None:
+                scale_demand(data, args.load)
+            total = sum(data["machine_types"].values())
+            for symmetry in SYMMETRY:
+                try:
+                    record, plan = run(data, symmetry, args.time_limit, env)
+                    # The expanded schedule is re-solved on the per-machine model as a check
+                    record["expanded"] = check(data, plan, env) if plan is not None else None
+                    if args.highs:
+                        record["highs"] = run_highs(data, symmetry, args.time_limit)
+                except GurobiError as error:
+                    record = {"error": str(error)}
+                results.append({"size": size, "machines": total, "symmetry": symmetry, **record})
+                if "error" in record:
+                    print(f"{size:>10} {total:>8} {symmetry:>10}   {record['error']}")
+                    continue
+                expanded = f"{record['expanded']:>12.2f}" if record["expanded"] is not None else f"{'-':>12}"
+                if args.highs:
+                    expanded += f" {record['highs']['seconds']:>10.2f}"
+                print(f"{size:>10} {total:>8} {symmetry:>10} {record['variables']:>6} "
+                      f"{record.get('objective', float('nan')):>12.2f} {record.get('bound', float('nan')):>12.2f} "
+                      f"{record['nodes']:>9.0f} {record['seconds']:>9.2f} {expanded}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,191 @@
+import argparse
+import functools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from formulation import GRINDERS_MAINTAINED, GRINDING, expand
+
+# Benders decomposition of the maintenance model.
+#
+# Master: machines down per type and month NDown[m, t] (machines of a type are interchangeable,
+# as in formulation.py's "aggregate" symmetry handling), end-of-month stocks HPROD[i, t] and one
+# value estimate theta[t] per month. Given those, each month t >= 1 is an independent production
+# LP (MPROD, SPROD) whose capacity depends on NDown[., t] and whose stock balance depends on
+# HPROD[., t-1] and HPROD[., t]. Subproblem duals give optimality cuts on theta[t], added as lazy
+# constraints whenever the master's branch-and-bound finds an integer solution, so the master is
+# solved once and keeps its tree and incumbent. The balance rows carry penalised slacks so every
+# subproblem is feasible for any master proposal.
+
+_worker = {}
+
+
+def problem_data(data):
+    products = data["products"]
+    T = len(data["demand"][0]) - 1
+    hours = data["working_hours_per_day"] * data["working_days_per_month"]
+    profit = dict(zip(products, data["profit"]))
+    return {
+        "products": products,
+        "months": list(range(1, T + 1)),
+        "profit": profit,
+        "times": {m: dict(zip(products, times)) for m, times in data["time_required"].items()},
+        "counts": data["machine_types"],
+        "hours": {(m, t): data["machine_availability"][m][t - 1] * hours
+                  for m in data["machine_types"] for t in range(1, T + 1)},
+        "demand": {(i, t): data["demand"][k][t] for k, i in enumerate(products) for t in range(T + 1)},
+        "holding_cost": data["holding_cost"],
+        "max_inventory": data.get("max_inventory", 100),
+        "penalty": 100 * (max(profit.values()) + data["holding_cost"] * T),
+    }
+
+
+class MonthSubproblem:
+    """Production LP for one month; only right-hand sides change between Benders iterations."""
+
+    def __init__(self, p, t, env):
+        self.t = t
+        self.model = model = gp.Model(f"month_{t}", env=env)
+        products = p["products"]
+        M = model.addVars(products, name="MPROD")
+        S = model.addVars(products, ub=[p["demand"][i, t] for i in products], name="SPROD")
+        u = model.addVars(products, name="short")
+        v = model.addVars(products, name="excess")
+        model.setObjective(gp.quicksum(p["profit"][i] * S[i] for i in products)
+                           - p["penalty"] * gp.quicksum(u[i] + v[i] for i in products), GRB.MAXIMIZE)
+        self.capacity = {m: model.addConstr(gp.quicksum(times[i] * M[i] for i in products) <= 0)
+                         for m, times in p["times"].items()}
+        self.sales = {i: model.addConstr(S[i] - M[i] <= 0) for i in products}
+        self.balance = {i: model.addConstr(M[i] - S[i] + u[i] - v[i] == 0) for i in products}
+
+    def solve(self, capacity, held, previous):
+        for m, constr in self.capacity.items():
+            constr.RHS = capacity[m]
+        for i in self.sales:
+            self.sales[i].RHS = held[i]
+            self.balance[i].RHS = held[i] - previous[i]
+        self.model.optimize()
+        return (self.model.ObjVal,
+                {m: c.Pi for m, c in self.capacity.items()},
+                {i: c.Pi for i, c in self.sales.items()},
+                {i: c.Pi for i, c in self.balance.items()})
+
+
+def _init_worker(p, threads):
+    env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+    _worker["subproblems"] = {t: MonthSubproblem(p, t, env) for t in p["months"]}
+
+
+def _solve_month(args):
+    t, capacity, held, previous = args
+    return t, _worker["subproblems"][t].solve(capacity, held, previous)
+
+
+def solve_benders(data, workers=1, tol=1e-6, time_limit=None, output_flag=0):
+    """Benders with lazy optimality cuts; month LPs run in ``workers`` processes, or in this one when 1."""
+    p = problem_data(data)
+    products, months, counts = p["products"], p["months"], p["counts"]
+
+    master = gp.Model("Benders_master")
+    master.Params.OutputFlag = output_flag
+    master.Params.LazyConstraints = 1
+    if time_limit is not None:
+        master.Params.TimeLimit = time_limit
+    NDown = master.addVars(counts, months, ub=[counts[m] for m in counts for t in months], vtype=GRB.INTEGER,
+                           name="NDown")
+    HPROD = master.addVars(products, [0] + months, ub=p["max_inventory"], name="HPROD")
+    theta = master.addVars(months, ub=[sum(p["profit"][i] * p["demand"][i, t] for i in products) for t in months],
+                           name="theta")
+    # Month 0 has no capacity limit, so its sales always meet demand
+    month0 = sum(p["profit"][i] * p["demand"][i, 0] for i in products)
+    master.setObjective(month0 + theta.sum() - p["holding_cost"] * HPROD.sum(), GRB.MAXIMIZE)
+    for m, count in counts.items():
+        master.addConstr(NDown.sum(m, "*") == (GRINDERS_MAINTAINED if m == GRINDING else count))
+    for i in products:
+        HPROD[i, months[-1]].LB = HPROD[i, months[-1]].UB = data["final_inventory"]
+        HPROD[i, 1].LB = HPROD[i, 1].UB = data["initial_inventory"]
+
+    if workers > 1:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(p, 1))
+        evaluate = functools.partial(pool.map, _solve_month)
+    else:
+        pool = None
+        _init_worker(p, 1)
+        evaluate = functools.partial(map, _solve_month)
+
+    start = time.perf_counter()
+    state = {"lower": -float("inf"), "incumbent": {}, "rounds": 0, "cuts": 0, "history": []}
+
+    def add_cuts(model, where):
+        if where == GRB.Callback.MIPSOL:
+            get = model.cbGetSolution
+        elif (where == GRB.Callback.MIPNODE and model.cbGet(GRB.Callback.MIPNODE_NODCNT) == 0
+              and model.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL):
+            get = model.cbGetNodeRel  # cuts at fractional root points tighten the bound before branching
+        else:
+            return
+        down, held, estimate = get(NDown), get(HPROD), get(theta)
+        capacity = {t: {m: p["hours"][m, t] * (counts[m] - down[m, t]) for m in counts} for t in months}
+        jobs = [(t, capacity[t], {i: held[i, t] for i in products}, {i: held[i, t - 1] for i in products})
+                for t in months]
+        value = month0 - p["holding_cost"] * sum(held.values())
+        for t, (q, cap_dual, sales_dual, balance_dual) in evaluate(jobs):
+            value += q
+            if estimate[t] > q + tol * max(1.0, abs(q)):
+                # theta[t] <= Q + sum(dual * (rhs(x) - rhs(x_hat)))
+                model.cbLazy(theta[t] <= q
+                             - gp.quicksum(cap_dual[m] * p["hours"][m, t] * (NDown[m, t] - down[m, t]) for m in counts)
+                             + gp.quicksum(sales_dual[i] * (HPROD[i, t] - held[i, t])
+                                           + balance_dual[i] * (HPROD[i, t] - HPROD[i, t - 1]
+                                                                - held[i, t] + held[i, t - 1])
+                                           for i in products))
+                state["cuts"] += 1
+        state["rounds"] += 1
+        if where == GRB.Callback.MIPSOL:
+            # Every proposal is evaluated exactly, so the best one is a feasible schedule even if cut off
+            if value > state["lower"]:
+                state["lower"], state["incumbent"] = value, down
+            state["history"].append((state["rounds"], state["lower"], model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+                                     time.perf_counter() - start))
+
+    try:
+        master.optimize(add_cuts)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    result = {"objective": state["lower"], "bound": master.ObjBound, "iterations": state["rounds"],
+              "cuts": state["cuts"], "nodes": int(master.NodeCount), "time": time.perf_counter() - start,
+              "schedule": expand(data, state["incumbent"]), "history": state["history"]}
+    master.dispose()
+    return result
+
+
+def solve_monolithic(data, symmetry="none"):
+    from formulation import build
+
+    start = time.perf_counter()
+    result = build(data, symmetry).solve("gurobi")
+    return {"objective": result.objective, "time": time.perf_counter() - start, "status": result.status}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benders decomposition for Factory Planning with maintenance")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--workers", type=int, default=1, help="processes for the month LPs (1: in this process)")
+    parser.add_argument("--compare", action="store_true", help="also solve the monolithic MIP")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+
+    result = solve_benders(data, args.workers)
+    print(f"Benders: profit £{result['objective']:.2f} (bound £{result['bound']:.2f}) "
+          f"in {result['iterations']} subproblem rounds, {result['cuts']} cuts, {result['time']:.3f}s")
+    for machine, n, t in result["schedule"]:
+        print(f"🚧 {machine} #{n} is down for maintenance in month {t}")
+    if args.compare:
+        mono = solve_monolithic(data)
+        print(f"Monolithic: profit £{mono['objective']:.2f} in {mono['time']:.3f}s")
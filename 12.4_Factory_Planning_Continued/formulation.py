@@ -0,0 +1,152 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS, BINARY, INTEGER, MAXIMIZE, Model, quicksum  # noqa: E402
+
+GRINDING = "Grinding"
+GRINDERS_MAINTAINED = 2
+
+# Machines of a type are interchangeable, so any permutation of a maintenance schedule is as good:
+#   none       MDown[machine, n, t] per machine, as in gurobi.py
+#   order      the same binaries with symmetry-breaking ordering constraints
+#   aggregate  NDown[machine, t], the number of machines of a type down in month t; expand() gives
+#              back a per-machine schedule
+SYMMETRY = ("none", "order", "aggregate")
+
+
+# Factory Planning with maintenance on the solver-agnostic layer (same model as gurobi.py)
+def build(data, symmetry="none"):
+    if symmetry not in SYMMETRY:
+        raise ValueError(f"Unknown symmetry handling '{symmetry}', expected one of {SYMMETRY}")
+    products = data["products"]
+    months = range(0, len(data["demand"][0]))
+    # Rows are indexed by product position, so binary-instance arrays are used without a copy
+    profit = data["profit"]
+    processing_time = data["time_required"]
+    machine_types = data["machine_types"]
+    machine_availability = data["machine_availability"]
+    market_demand = data["demand"]
+    total_hours_per_machine = data["working_hours_per_day"] * data["working_days_per_month"]
+    holding_cost = data["holding_cost"]
+    max_inventory = data.get("max_inventory", 100)
+
+    model = Model("Factory_Production_Optimization")
+
+    # Decision variables
+    MPROD = model.add_vars(products, months, name="MPROD")
+    SPROD = model.add_vars(products, months, name="SPROD")
+    HPROD = model.add_vars(products, months, name="HPROD")
+    if symmetry == "aggregate":
+        NDown = {(machine, t): model.add_var(ub=count, vtype=INTEGER, name=f"NDown[{machine},{t}]")
+                 for machine, count in machine_types.items() for t in months[1:]}
+        model.variables["NDown"] = NDown
+    else:
+        MDown = {}
+        for machine, count in machine_types.items():
+            MDown.update(model.add_vars([machine], range(1, count + 1), months[1:], vtype=BINARY, name="MDown"))
+        model.variables["MDown"] = MDown
+        NDown = {(machine, t): quicksum(MDown[machine, n, t] for n in range(1, count + 1))
+                 for machine, count in machine_types.items() for t in months[1:]}
+
+    # Objective function: Maximize total profit
+    model.set_objective(
+        quicksum(profit[i - 1] * SPROD[i, t] for i in products for t in months)
+        - holding_cost * quicksum(HPROD[i, t] for i in products for t in months),
+        MAXIMIZE
+    )
+
+    # Machine capacity accounting for maintenance
+    for machine, count in machine_types.items():
+        for t in months[1:]:
+            hours = machine_availability[machine][t - 1] * total_hours_per_machine
+            model.add_constr(
+                quicksum(processing_time[machine][i - 1] * MPROD[i, t] for i in products)
+                <= count * hours - hours * NDown[machine, t],
+                f"{machine}_capacity_month_{t}"
+            )
+
+    # Maintenance scheduling
+    for machine, count in machine_types.items():
+        if machine == GRINDING:
+            model.add_constr(quicksum(NDown[machine, t] for t in months[1:]) == GRINDERS_MAINTAINED,
+                             f"Two_maintenance_{machine}")
+        elif symmetry == "aggregate":
+            model.add_constr(quicksum(NDown[machine, t] for t in months[1:]) == count, f"One_maintenance_{machine}")
+        else:
+            for n in range(1, count + 1):
+                model.add_constr(quicksum(MDown[machine, n, t] for t in months[1:]) == 1,
+                                 f"One_maintenance_{machine}_{n}")
+
+    if symmetry == "order":
+        for machine, count in machine_types.items():
+            for n in range(1, count):
+                if machine == GRINDING:
+                    # The grinders down in a month are the lowest-numbered ones
+                    for t in months[1:]:
+                        model.add_constr(MDown[machine, n, t] >= MDown[machine, n + 1, t],
+                                         f"Order_{machine}_{n}_month_{t}")
+                else:
+                    # Machine n is maintained no later than machine n + 1
+                    model.add_constr(quicksum(t * MDown[machine, n, t] for t in months[1:])
+                                     <= quicksum(t * MDown[machine, n + 1, t] for t in months[1:]),
+                                     f"Order_{machine}_{n}")
+
+    for i in products:
+        for t in months:
+            model.add_constr(SPROD[i, t] <= market_demand[i - 1][t], f"Market_demand_{i}_month_{t}")
+            model.add_constr(SPROD[i, t] <= MPROD[i, t] + HPROD[i, t], f"Sales_limit_{i}_month_{t}")
+            model.add_constr(HPROD[i, t] <= max_inventory, f"Max_hold_{i}_month_{t}")
+        for t in months[1:]:
+            model.add_constr(HPROD[i, t - 1] + MPROD[i, t] - SPROD[i, t] - HPROD[i, t] == 0,
+                             f"Stock_balance_{i}_month_{t}")
+        model.add_constr(HPROD[i, months[-1]] == data["final_inventory"], f"End_inventory_{i}")
+        model.add_constr(HPROD[i, 1] == data["initial_inventory"], f"Initial_inventory_{i}")
+
+    return model
+
+
+def expand(data, down):
+    """Per-machine schedule (sorted (machine, n, t) keys) from the machines down per type and month."""
+    schedule = []
+    for machine, count in data["machine_types"].items():
+        months = sorted(t for (m, t) in down if m == machine)
+        # Grinders may be maintained more than once, so each month starts again from grinder 1;
+        # other machines take the months in turn, so each is maintained exactly once
+        n = 0
+        for t in months:
+            k = int(round(down[machine, t]))
+            if machine == GRINDING:
+                n = 0
+            schedule += [(machine, n + j + 1, t) for j in range(k)]
+            n += k
+        if machine != GRINDING and n != count:
+            raise ValueError(f"{n} of {count} {machine} machines are maintained")
+    return sorted(schedule)
+
+
+def schedule(model, result, data):
+    """Per-machine maintenance schedule of a solved model, whichever symmetry handling it was built with."""
+    if "NDown" in model.variables:
+        return expand(data, result.values_of(model.variables["NDown"]))
+    return sorted(key for key, x in result.values_of(model.variables["MDown"]).items() if x > 0.5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Factory Planning with maintenance with a selectable backend")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--symmetry", choices=SYMMETRY, default="none",
+                        help="how the interchangeable machines of a type are modelled")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    model = build(data, args.symmetry)
+    result = model.solve(args.backend)
+    print(f"[{result.backend}] status: {result.status}, profit: £{result.objective:.2f}, time: {result.runtime:.3f}s")
+    if result.values is not None:
+        for machine, n, t in schedule(model, result, data):
+            print(f"🚧 {machine} #{n} is down for maintenance in month {t}")
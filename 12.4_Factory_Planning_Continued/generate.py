@@ -0,0 +1,52 @@
+import argparse
+import json
+
+import numpy as np
+
+MACHINE_NAMES = ["Grinding", "VerticalDrilling", "HorizontalDrilling", "Boring", "Planing"]
+
+
+# Generate a synthetic Factory Planning (with maintenance) instance with the same schema as data.json
+def generate(n_machines=5, n_months=6, n_products=7, seed=0, max_count=3):
+    rng = np.random.default_rng(seed)
+    machines = MACHINE_NAMES[:n_machines] + [f"Machine{k + 1}" for k in range(len(MACHINE_NAMES), n_machines)]
+    counts = rng.integers(1, max_count + 1, size=n_machines)
+    counts[0] = max(counts[0], 4)  # two of the grinders must be maintained
+
+    # Each product needs a handful of the machine groups
+    time_required = np.where(rng.random((n_machines, n_products)) < min(1.0, 3 / n_machines),
+                             rng.uniform(0.01, 0.8, (n_machines, n_products)).round(2), 0.0)
+    availability = np.maximum(1, counts[:, None] - rng.integers(0, 2, (n_machines, n_months)))
+    demand = rng.integers(0, 11, (n_products, n_months + 1)) * 100
+    demand[:, 0] = 0
+
+    return {
+        "products": list(range(1, n_products + 1)),
+        "months": [f"M{t + 1}" for t in range(n_months)],
+        "profit": rng.integers(3, 12, n_products).tolist(),
+        "time_required": {m: time_required[k].tolist() for k, m in enumerate(machines)},
+        "machine_types": {m: int(counts[k]) for k, m in enumerate(machines)},
+        "machine_availability": {m: availability[k].tolist() for k, m in enumerate(machines)},
+        "demand": demand.tolist(),
+        "working_days_per_month": 24,
+        "working_hours_per_day": 16,
+        "holding_cost": 0.5,
+        "total_hours_per_machine": 384,
+        "initial_inventory": 0,
+        "final_inventory": 50
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Factory Planning with maintenance instance")
+    parser.add_argument("--machines", type=int, default=5, help="number of machine groups")
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--products", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-count", type=int, default=3, help="most machines of one type")
+    parser.add_argument("--output", default="generated_data.json")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as file:
+        json.dump(generate(args.machines, args.months, args.products, args.seed, args.max_count), file, indent=4)
+    print(f"Instance with {args.machines} machine groups x {args.months} months saved to {args.output} ✅")
@@ -0,0 +1,107 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS, MINIMIZE, Model, quicksum  # noqa: E402
+from common.chapters import load_module  # noqa: E402
+
+grades = load_module("12.5-cost", "grades")
+
+
+OBJECTIVES = ("cost", "redundancy")
+
+
+# Manpower Planning on the solver-agnostic layer (manpower.py compiles it for Gurobi), with the
+# moves between grades and their wastage taken from grades.textbook_plan
+def build(data, objective="cost"):
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {OBJECTIVES}")
+    years = data["years"]
+    skill_levels = data["skill_levels"]
+    requirements = data["manpower_requirements"]
+    plan = grades.textbook_plan(data)
+    moves = plan["transitions"]
+    retraining = list(data["retraining_capacity"])
+    downgrading = [move["name"] for move in moves if move["name"] not in retraining]
+    stay = {skill: 1 - plan["wastage"][skill] for skill in skill_levels}
+    stay_new = {skill: 1 - plan["recruit_wastage"][skill] for skill in skill_levels}
+    flows = grades.transition_matrix(plan)
+
+    model = Model("Manpower_Optimization")
+
+    # Decision variables
+    TotalWorkers = model.add_vars(skill_levels, years, name="TotalWorkers")
+    RecruitedWorkers = model.add_vars(skill_levels, years, name="RecruitedWorkers")
+    RetrainedWorkers = model.add_vars(retraining, years, name="RetrainedWorkers")
+    DowngradedWorkers = model.add_vars(downgrading, years, name="DowngradedWorkers")
+    RedundantWorkers = model.add_vars(skill_levels, years, name="RedundantWorkers")
+    ShortTimeWorkers = model.add_vars(skill_levels, years, ub=plan["short_time_limit"], name="ShortTimeWorkers")
+    OvermannedWorkers = model.add_vars(skill_levels, years, name="OvermannedWorkers")
+    moved = {**RetrainedWorkers, **DowngradedWorkers}
+
+    # Initial workforce levels are constants
+    for skill in skill_levels:
+        TotalWorkers[skill, 0] = requirements[skill][0]
+
+    for year in years:
+        # Upper bounds on recruitment
+        for skill in skill_levels:
+            model.set_bounds(RecruitedWorkers[skill, year], ub=plan["recruitment"][skill])
+
+        # Workforce continuity: retained and recruited workers plus the net flow of moves
+        for g, skill in enumerate(skill_levels):
+            row = flows.getrow(g)
+            model.add_constr(
+                stay[skill] * TotalWorkers[skill, year - 1] + stay_new[skill] * RecruitedWorkers[skill, year]
+                + quicksum(value * moved[moves[k]["name"], year] for k, value in zip(row.indices, row.data))
+                - RedundantWorkers[skill, year]
+                == TotalWorkers[skill, year],
+                f"{skill}_Workforce_Balance_{year}"
+            )
+
+        # Moves limited to a number of workers a year or to a share of the destination grade
+        for move in moves:
+            if "capacity" in move:
+                model.set_bounds(moved[move["name"], year], ub=move["capacity"])
+            elif "share" in move:
+                model.add_constr(moved[move["name"], year] <= move["share"] * TotalWorkers[move["to"], year],
+                                 f"{move['name']}_Retrain_Limit_{year}")
+
+        # Overmanning limit
+        model.add_constr(quicksum(OvermannedWorkers[skill, year] for skill in skill_levels)
+                         <= plan["overmanning_limit"], f"Overmanning_Limit_{year}")
+
+        # Workforce requirements
+        for skill in skill_levels:
+            model.add_constr(TotalWorkers[skill, year] - OvermannedWorkers[skill, year]
+                             - plan["short_time_output"] * ShortTimeWorkers[skill, year] == requirements[skill][year],
+                             f"Workforce_Requirement_{skill}_{year}")
+
+    # Objective functions; both are kept in model.objectives for the Pareto frontier of manpower.py
+    model.objectives = {
+        "cost": quicksum(move.get("cost", 0.0) * moved[move["name"], year] for move in moves for year in years)
+        + quicksum(data["redundancy_cost"][skill] * RedundantWorkers[skill, year]
+                   + data["short_time_cost"][skill] * ShortTimeWorkers[skill, year]
+                   + data["overmanning_cost"][skill] * OvermannedWorkers[skill, year]
+                   for skill in skill_levels for year in years),
+        "redundancy": quicksum(RedundantWorkers[skill, year] for skill in skill_levels for year in years),
+    }
+    model.set_objective(model.objectives[objective], MINIMIZE)
+
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Manpower Planning with a selectable backend")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="cost")
+    parser.add_argument("--data", default="data.json")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    result = build(data, args.objective).solve(args.backend)
+    print(f"[{result.backend}] status: {result.status}, {args.objective}: {result.objective:.2f}, "
+          f"time: {result.runtime:.3f}s")
@@ -0,0 +1,48 @@
+import argparse
+import json
+
+import numpy as np
+
+
+# Generate a synthetic Manpower Planning instance with the same schema as data.json
+def generate(n_years=3, seed=0):
+    rng = np.random.default_rng(seed)
+    skill_levels = ["Unskilled", "SemiSkilled", "Skilled"]
+    start = np.array([2000, 1500, 1000], dtype=float)
+
+    # Requirements follow a bounded random walk from the current workforce
+    steps = rng.uniform(0.9, 1.1, (n_years, len(skill_levels)))
+    requirements = np.vstack([start, start * np.cumprod(steps, axis=0)]).round()
+
+    return {
+        "years": list(range(1, n_years + 1)),
+        "skill_levels": skill_levels,
+        "manpower_requirements": {s: requirements[:, k].tolist() for k, s in enumerate(skill_levels)},
+        "wastage_rates": {
+            "less": {"Unskilled": 0.25, "SemiSkilled": 0.20, "Skilled": 0.10},
+            "more": {"Unskilled": 0.10, "SemiSkilled": 0.05, "Skilled": 0.05}
+        },
+        "recruitment_capacity": {"Unskilled": 500, "SemiSkilled": 800, "Skilled": 500},
+        "retraining_capacity": {"UnskilledToSemi": {"capacity": 200}, "SemiToSkilled": {"share": 0.25}},
+        "retraining_cost": {"UnskilledToSemi": 400, "SemiToSkilled": 500},
+        "downgrade_wastage": 0.5,
+        # Downgrading is paid for, or shedding workers through it would cost nothing
+        "downgrade_cost": {"SkilledToSemi": 250, "SkilledToUnskilled": 300, "SemiToUnskilled": 150},
+        "redundancy_cost": {"Unskilled": 200, "SemiSkilled": 500, "Skilled": 500},
+        "overmanning_cost": {"Unskilled": 1500, "SemiSkilled": 2000, "Skilled": 3000},
+        "overmanning_limit": 150,
+        "short_time_limit": 50,
+        "short_time_cost": {"Unskilled": 500, "SemiSkilled": 400, "Skilled": 400}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Manpower Planning instance")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="generated_data.json")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as file:
+        json.dump(generate(args.years, args.seed), file, indent=2)
+    print(f"Instance with {args.years} years saved to {args.output} ✅")
@@ -0,0 +1,269 @@
+"""Manpower planning for any set of grades, years and business units, driven by data.
+
+A plan is plain data:
+
+    grades          grade names
+    years           number of planning years T (year 0 is the current workforce)
+    units           business-unit names (default one unit); units share nothing but the costs
+    requirements    {grade: [year 0, ..., year T]}, or {unit: {grade: [...]}} per unit
+    wastage         {grade: rate} of workers with more than a year of service
+    recruit_wastage {grade: rate} of workers recruited that year
+    recruitment     {grade: capacity per year}
+    transitions     [{"name", "from", "to", "wastage", "cost", "capacity" | "share"}]; a retraining
+                    or downgrading move, losing "wastage" of the movers on arrival and limited to
+                    "capacity" workers a year or to "share" of the destination grade's workforce
+    redundancy_cost, short_time_cost, overmanning_cost      {grade: cost per worker and year}
+    short_time_limit, short_time_output (the fraction of a full worker, 0.5), overmanning_limit
+
+The transitions form a sparse grades x moves matrix, so the stock balance of every (unit, year,
+grade) is one block ``total[t] = retention * total[t-1] + recruited + transitions @ moves -
+redundant``, tiled over units and years with Kronecker products like network.py in 12.6.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS, CONTINUOUS, EQUAL, INF, LESS_EQUAL, MINIMIZE, OPTIMAL  # noqa: E402
+
+LIMITS = ("capacity", "share")
+
+
+def textbook_plan(data):
+    """The three-grade data.json of the chapter as a plan."""
+    grades = data["skill_levels"]
+    more, less = data["wastage_rates"]["more"], data["wastage_rates"]["less"]
+    transitions = []
+    for name, limit in data["retraining_capacity"].items():
+        source, target = {"UnskilledToSemi": ("Unskilled", "SemiSkilled"),
+                          "SemiToSkilled": ("SemiSkilled", "Skilled")}[name]
+        # Each limit names its unit: {"capacity": workers a year} or {"share": of the destination grade}
+        if len(limit) != 1 or next(iter(limit)) not in LIMITS:
+            raise ValueError(f"retraining_capacity[{name!r}] must be one of {LIMITS}, got {limit}")
+        transitions.append({"name": name, "from": source, "to": target, "wastage": more[target],
+                            "cost": data["retraining_cost"][name], **limit})
+    for name, source, target in (("SkilledToSemi", "Skilled", "SemiSkilled"),
+                                 ("SkilledToUnskilled", "Skilled", "Unskilled"),
+                                 ("SemiToUnskilled", "SemiSkilled", "Unskilled")):
+        transitions.append({"name": name, "from": source, "to": target, "wastage": data["downgrade_wastage"],
+                            "cost": data.get("downgrade_cost", {}).get(name, 0.0)})
+    return {
+        "grades": grades,
+        "years": len(data["years"]),
+        "requirements": data["manpower_requirements"],
+        "wastage": more,
+        "recruit_wastage": less,
+        "recruitment": data["recruitment_capacity"],
+        "transitions": transitions,
+        "redundancy_cost": data["redundancy_cost"],
+        "short_time_cost": data["short_time_cost"],
+        "overmanning_cost": data["overmanning_cost"],
+        "short_time_limit": data["short_time_limit"],
+        "short_time_output": 0.5,
+        "overmanning_limit": data["overmanning_limit"],
+    }
+
+
+def transition_matrix(plan):
+    """Grades x moves: -1 at the grade a move leaves, its retention at the grade it enters."""
+    index = {grade: g for g, grade in enumerate(plan["grades"])}
+    moves = plan["transitions"]
+    K = len(moves)
+    rows = [index[m["from"]] for m in moves] + [index[m["to"]] for m in moves]
+    values = [-1.0] * K + [1.0 - m.get("wastage", 0.0) for m in moves]
+    return sp.csr_matrix((values, (rows, list(range(K)) * 2)), shape=(len(index), K))
+
+
+class ManpowerGrades:
+    def __init__(self, plan, objective="cost"):
+        if objective not in ("cost", "redundancy"):
+            raise ValueError(f"Unknown objective '{objective}', expected 'cost' or 'redundancy'")
+        self.plan = plan
+        grades, moves = plan["grades"], plan["transitions"]
+        self.units = list(plan.get("units", ["Company"]))
+        U, T, G, K = len(self.units), plan["years"], len(grades), len(moves)
+        self.shape = (U, T, G, K)
+
+        def per_grade(key):
+            return np.array([plan[key][grade] for grade in grades], dtype=float)
+
+        requirements = plan["requirements"]
+        if len(self.units) > 1 or self.units[0] in requirements:
+            requirements = [requirements[unit] for unit in self.units]
+        else:
+            requirements = [requirements]
+        # (U, T + 1, G), year 0 first
+        required = np.array([[unit[grade] for grade in grades] for unit in requirements], dtype=float).transpose(0, 2, 1)
+
+        # Column blocks, each ordered (unit, year, grade or move)
+        blocks = {"total": G, "recruited": G, "moved": K, "redundant": G, "short_time": G, "overmanned": G}
+        self.columns, n_cols = {}, 0
+        for name, width in blocks.items():
+            self.columns[name] = (n_cols, (U, T, width))
+            n_cols += U * T * width
+
+        units_years = sp.identity(U * T, format="csr")
+        lag = sp.kron(sp.identity(U), sp.eye(T, k=-1), format="csr")  # year t-1 of the same unit
+        retention = 1.0 - per_grade("wastage")
+        eye_g = sp.identity(G, format="csr")
+
+        # Stock balance: total - retention * total[t-1] - recruits - transitions @ moves + redundant = 0
+        balance = sp.hstack([
+            sp.kron(units_years, eye_g) - sp.kron(lag, sp.diags(retention)),
+            sp.kron(units_years, sp.diags(-(1.0 - per_grade("recruit_wastage")))),
+            sp.kron(units_years, -transition_matrix(plan)),
+            sp.kron(units_years, eye_g),
+            sp.csr_matrix((U * T * G, 2 * U * T * G)),
+        ], format="csr")
+        opening = np.zeros((U, T, G))
+        opening[:, 0] = retention * required[:, 0]
+
+        # Requirement: total - overmanned - short_time_output * short_time = required
+        requirement = sp.hstack([
+            sp.kron(units_years, eye_g),
+            sp.csr_matrix((U * T * G, U * T * (G + K + G))),
+            sp.kron(units_years, -plan.get("short_time_output", 0.5) * eye_g),
+            sp.kron(units_years, -eye_g),
+        ], format="csr")
+
+        # Moves limited to a share of the destination grade's workforce
+        shared = [k for k, m in enumerate(moves) if "share" in m]
+        share = sp.csr_matrix(
+            (np.r_[np.ones(len(shared)), [-moves[k]["share"] for k in shared]],
+             (np.r_[np.arange(len(shared)), np.arange(len(shared))],
+              np.r_[np.array(shared, dtype=int), [K + grades.index(moves[k]["to"]) for k in shared]])),
+            shape=(len(shared), K + G))
+        share_rows = sp.hstack([
+            sp.kron(units_years, share[:, K:]),
+            sp.csr_matrix((U * T * len(shared), U * T * G)),
+            sp.kron(units_years, share[:, :K]),
+            sp.csr_matrix((U * T * len(shared), 3 * U * T * G)),
+        ], format="csr")
+
+        # Overmanning across the grades of a unit and year
+        overmanning = sp.hstack([sp.csr_matrix((U * T, n_cols - U * T * G)),
+                                 sp.kron(units_years, np.ones((1, G)))], format="csr")
+
+        self.rows = {"balance": U * T * G, "requirement": U * T * G, "share": U * T * len(shared),
+                     "overmanning": U * T}
+        A = sp.vstack([balance, requirement, share_rows, overmanning], format="csr")
+        sense = np.r_[np.full(2 * U * T * G, EQUAL), np.full(U * T * (len(shared) + 1), LESS_EQUAL)]
+        rhs = np.r_[opening.ravel(), required[:, 1:].ravel(), np.zeros(U * T * len(shared)),
+                    np.full(U * T, float(plan["overmanning_limit"]))]
+
+        def tiled(values):
+            return np.tile(values, U * T)
+
+        ub = np.r_[np.full(U * T * G, INF), tiled(per_grade("recruitment")),
+                   tiled([m.get("capacity", INF) for m in moves]), np.full(U * T * G, INF),
+                   np.full(U * T * G, float(plan["short_time_limit"])), np.full(U * T * G, INF)]
+        if objective == "cost":
+            c = np.r_[np.zeros(2 * U * T * G), tiled([m.get("cost", 0.0) for m in moves]),
+                      tiled(per_grade("redundancy_cost")), tiled(per_grade("short_time_cost")),
+                      tiled(per_grade("overmanning_cost"))]
+        else:
+            c = np.r_[np.zeros(U * T * (2 * G + K)), np.ones(U * T * G), np.zeros(2 * U * T * G)]
+
+        self.matrix = {"c": c, "constant": 0.0, "model_sense": MINIMIZE, "A": A, "sense": sense,
+                       "rhs": rhs, "lb": np.zeros(n_cols), "ub": ub, "vtype": np.full(n_cols, CONTINUOUS)}
+        self.result = None
+
+    def solve(self, backend=None, time_limit=None, threads=None, verbose=False):
+        backend = backend or os.environ.get("MODEL_BACKEND", "gurobi")
+        self.result = BACKENDS[backend](self.matrix, time_limit=time_limit, threads=threads, verbose=verbose)
+        return self.result
+
+    def block(self, name):
+        """Solution values of one column block as a (unit, year, grade or move) array."""
+        start, shape = self.columns[name]
+        return self.result.values[start:start + int(np.prod(shape))].reshape(shape)
+
+    def table(self, name):
+        """One block as a (unit, year) x grade (or move) DataFrame."""
+        U, T, G, K = self.shape
+        labels = [m["name"] for m in self.plan["transitions"]] if name == "moved" else self.plan["grades"]
+        index = pd.MultiIndex.from_product([self.units, range(1, T + 1)], names=["Unit", "Year"])
+        return pd.DataFrame(self.block(name).reshape(U * T, -1), index=index, columns=labels)
+
+
+def generate(n_grades=30, n_years=20, n_units=1, seed=0):
+    """A grade ladder: retraining one grade up, downgrading one or two grades down, random requirements."""
+    rng = np.random.default_rng(seed)
+    grades = [f"Grade{g + 1}" for g in range(n_grades)]
+    units = [f"Unit{u + 1}" for u in range(n_units)]
+    start = rng.uniform(200, 2000, (n_units, n_grades)).round()
+    steps = rng.uniform(0.9, 1.1, (n_units, n_years, n_grades))
+    required = np.concatenate([start[:, None], start[:, None] * np.cumprod(steps, axis=1)], axis=1).round()
+
+    transitions = []
+    for g in range(n_grades - 1):
+        move = {"name": f"{grades[g]}To{grades[g + 1]}", "from": grades[g], "to": grades[g + 1], "wastage": 0.05,
+                "cost": round(rng.uniform(300, 600))}
+        move.update({"share": 0.25} if g % 2 else {"capacity": round(0.1 * start[:, g].mean())})
+        transitions.append(move)
+    # Downgrades are paid and capped, or shedding workers through them would be free of redundancy costs
+    for g in range(1, n_grades):
+        for d in (1, 2):
+            if g - d >= 0:
+                transitions.append({"name": f"{grades[g]}To{grades[g - d]}", "from": grades[g], "to": grades[g - d],
+                                    "wastage": 0.5, "cost": round(rng.uniform(100, 300)),
+                                    "capacity": round(0.05 * start[:, g].mean())})
+
+    def per_grade(low, high, digits=0):
+        return dict(zip(grades, rng.uniform(low, high, n_grades).round(digits).tolist()))
+
+    return {
+        "grades": grades, "years": n_years, "units": units,
+        "requirements": {unit: {grade: required[u, :, g].tolist() for g, grade in enumerate(grades)}
+                         for u, unit in enumerate(units)},
+        "wastage": per_grade(0.05, 0.1, 2), "recruit_wastage": per_grade(0.1, 0.25, 2),
+        "recruitment": {grade: round(0.3 * start[:, g].max()) for g, grade in enumerate(grades)},
+        "transitions": transitions,
+        "redundancy_cost": per_grade(200, 500), "short_time_cost": per_grade(400, 500),
+        "overmanning_cost": per_grade(1500, 3000),
+        "short_time_limit": 50, "short_time_output": 0.5, "overmanning_limit": 10 * n_grades,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manpower planning over any grades, years and business units")
+    parser.add_argument("--data", default="data.json", help="textbook data.json, or a plan JSON with 'grades'")
+    parser.add_argument("--grades", type=int, default=None, help="generate a ladder of this many grades instead")
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--objective", choices=["cost", "redundancy"], default="cost")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--output", default=None, help="optional CSV file for the workforce by grade")
+    args = parser.parse_args()
+
+    if args.grades:
+        plan = generate(args.grades, args.years, args.units, args.seed)
+    else:
+        with open(args.data, "r") as json_file:
+            data = json.load(json_file)
+        plan = data if "grades" in data else textbook_plan(data)
+
+    start = time.perf_counter()
+    model = ManpowerGrades(plan, args.objective)
+    build_time = time.perf_counter() - start
+    result = model.solve(args.backend)
+    rows, columns = model.matrix["A"].shape
+    U, T, G, K = model.shape
+    print(f"[{result.backend}] {G} grades, {K} transitions, {U} unit(s) x {T} year(s): "
+          f"{columns} columns, {rows} rows, build {build_time:.3f}s, solve {result.runtime:.3f}s")
+    if result.status == OPTIMAL:
+        label = "Total Cost: £" if args.objective == "cost" else "Total Redundant Workers: "
+        print(f"{label}{result.objective:.2f}")
+        if args.output:
+            model.table("total").to_csv(args.output)
+            print(f"Workforce by grade saved to {args.output} ✅")
+    else:
+        print(f"No optimal solution (status {result.status})")
@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import gurobipy as gp
+import numpy as np
+import pandas as pd
+from gurobipy import GRB
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common import export  # noqa: E402
+from common.backend import to_gurobi_model  # noqa: E402
+from common.chapters import load_module  # noqa: E402
+
+formulation = load_module("12.5-cost", "formulation")
+
+# Per-worker state: the model is built once and only the epsilon right-hand side changes
+_worker = {}
+
+
+def build_model(data, objective="cost", env=None):
+    """The layer model of formulation.py as a gurobipy model minimizing ``objective``.
+
+    cost_gurobi.py and redundancy_gurobi.py build it here. Both objectives are kept in
+    ``model._objectives`` and the variable groups in ``model._vars``.
+    """
+    built = formulation.build(data, objective)
+    model = to_gurobi_model(built, env)
+    columns = model.getVars()
+    model._objectives = {name: gp.LinExpr(list(expr.terms.values()), [columns[j] for j in expr.terms]) + expr.constant
+                         for name, expr in built.objectives.items()}
+    return model
+
+
+def yearly(values, columns):
+    """Year x category table from a (category, year) Series, dropping the fixed year-0 values."""
+    table = values.unstack(0)
+    return table.loc[table.index > 0].reindex(columns=columns).rename_axis(None, axis=1)
+
+
+def report(model, data, out, move_columns):
+    """The plan tables of a solved model; ``move_columns`` orders the training and downgrading table."""
+    skill_levels = data["skill_levels"]
+    total, recruited, retrained, downgraded, redundant, short_time, overmanned = export.values(model, *model._vars.values())
+    out.table("Recruitment Plan", yearly(recruited, skill_levels))
+    out.table("Available Workforce", yearly(total, skill_levels))
+    out.table("Training & Downgrading Plan", yearly(pd.concat([retrained, downgraded]), move_columns))
+    out.table("Redundancy Plan", yearly(redundant, skill_levels))
+    out.table("Short-Time Working Plan", yearly(short_time, skill_levels))
+    out.table("Overmanning Plan", yearly(overmanned, skill_levels))
+
+
+def endpoints(model):
+    """Redundancy range of the frontier: the least possible, and the least among cost-optimal plans."""
+    cost, redundancy = model._objectives["cost"], model._objectives["redundancy"]
+    model.setObjective(redundancy, GRB.MINIMIZE)
+    model.optimize()
+    low = model.ObjVal
+
+    model.setObjective(cost, GRB.MINIMIZE)
+    model.optimize()
+    cap = model.addConstr(cost <= model.ObjVal * (1 + 1e-9) + 1e-6)
+    model.setObjective(redundancy, GRB.MINIMIZE)
+    model.optimize()
+    high = model.ObjVal
+    model.remove(cap)
+    model.setObjective(cost, GRB.MINIMIZE)
+    return low, high
+
+
+def _init_worker(data, threads):
+    # The environment lives as long as the worker process
+    env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+    model = build_model(data, "cost", env)
+    epsilon = model.addConstr(model._objectives["redundancy"] <= GRB.INFINITY, "Redundancy_Epsilon")
+    _worker.update(env=env, model=model, epsilon=epsilon)
+
+
+def _solve_chunk(epsilons):
+    """Neighbouring epsilons on one worker, each re-solve starting from the previous basis."""
+    model, objectives = _worker["model"], _worker["model"]._objectives
+    rows = []
+    for eps in epsilons:
+        _worker["epsilon"].RHS = eps
+        model.optimize()
+        optimal = model.Status == GRB.OPTIMAL
+        rows.append({"epsilon": eps, "status": model.Status,
+                     "cost": objectives["cost"].getValue() if optimal else np.nan,
+                     "redundancy": objectives["redundancy"].getValue() if optimal else np.nan,
+                     "recruited": sum(model.getAttr("X", model._vars["RecruitedWorkers"]).values())
+                     if optimal else np.nan,
+                     "retrained": sum(model.getAttr("X", model._vars["RetrainedWorkers"]).values())
+                     if optimal else np.nan,
+                     "iterations": int(model.IterCount), "runtime": model.Runtime})
+    return rows
+
+
+def pareto_frontier(data, points=21, workers=os.cpu_count(), threads=1):
+    with gp.Env(params={"OutputFlag": 0, "Threads": threads}) as env:
+        model = build_model(data, "cost", env)
+        low, high = endpoints(model)
+        model.dispose()
+    epsilons = np.linspace(low, high, points)
+    chunks = [chunk.tolist() for chunk in np.array_split(epsilons, min(workers, points)) if len(chunk)]
+    with ProcessPoolExecutor(len(chunks), initializer=_init_worker, initargs=(data, threads)) as pool:
+        rows = [row for chunk in pool.map(_solve_chunk, chunks) for row in chunk]
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cost vs redundancy Pareto frontier for Manpower Planning")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--points", type=int, default=21, help="epsilon values between the two endpoints")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threads", type=int, default=1, help="Gurobi threads per worker")
+    export.add_arguments(parser, "pareto_frontier.txt")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    start = time.perf_counter()
+    frontier = pareto_frontier(data, args.points, args.workers, args.threads)
+    elapsed = time.perf_counter() - start
+
+    with export.SolutionWriter(args.output, args.format, args.echo) as out:
+        out.line(f"Pareto frontier: {len(frontier)} points, redundancy {frontier['redundancy'].min():.2f} to "
+                 f"{frontier['redundancy'].max():.2f}, cost £{frontier['cost'].max():.2f} to £{frontier['cost'].min():.2f}")
+        out.table("Pareto Frontier", frontier.set_index("epsilon").round(2))
+    print(f"Solved {len(frontier)} epsilon-constraint LPs in {elapsed:.2f}s on {args.workers} workers")
+    print(f"Results saved to {args.output} ✅")
@@ -0,0 +1,86 @@
+import argparse
+import copy
+import json
+import statistics
+import time
+
+import numpy as np
+
+from generate import generate
+from refinery import CAPACITIES, RefineryModel
+
+
+def daily_changes(data, days, seed):
+    """Random day-to-day changes: profits and capacities within +-10%, crude limits within +-20%."""
+    rng = np.random.default_rng(seed)
+    for _ in range(days):
+        yield {
+            "profits": {p: v * rng.uniform(0.9, 1.1) for p, v in data["productProfit"].items()},
+            "capacities": {u: data.get(f"Max{u.capitalize()}", v) * rng.uniform(0.9, 1.1) for u, v in CAPACITIES.items()},
+            "crude_limits": {c: data[f"Max{c}"] * rng.uniform(0.8, 1.2) for c in data["rawMaterials"]},
+        }
+
+
+def apply_to_data(data, change):
+    """The same change written into a fresh copy of the data, for the rebuild path."""
+    day = copy.deepcopy(data)
+    day["productProfit"].update(change["profits"])
+    day.update({f"Max{u.capitalize()}": v for u, v in change["capacities"].items()})
+    day.update({f"Max{c}": v for c, v in change["crude_limits"].items()})
+    return day
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-place update and re-solve vs full rebuild of the refinery LP")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--crudes", type=int, default=None, help="use a generated instance with this many crude oils")
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    if args.crudes:
+        data = generate(args.crudes, args.seed)
+    else:
+        with open(args.data, "r") as json_file:
+            data = json.load(json_file)
+    changes = list(daily_changes(data, args.days, args.seed))
+
+    refinery = RefineryModel(data)
+    refinery.solve()
+    incremental, rebuild = {"ms": [], "iterations": [], "profit": []}, {"ms": [], "iterations": [], "profit": []}
+    for change in changes:
+        start = time.perf_counter()
+        refinery.update(**change)
+        _, profit, iterations, _ = refinery.solve()
+        incremental["ms"].append((time.perf_counter() - start) * 1000)
+        incremental["iterations"].append(iterations)
+        incremental["profit"].append(profit)
+
+        day = apply_to_data(data, change)
+        start = time.perf_counter()
+        fresh = RefineryModel(day)
+        _, profit, iterations, _ = fresh.solve()
+        rebuild["ms"].append((time.perf_counter() - start) * 1000)
+        rebuild["iterations"].append(iterations)
+        rebuild["profit"].append(profit)
+        fresh.model.dispose()
+
+    mismatches = sum(abs(a - b) > 1e-6 * max(1.0, abs(b)) for a, b in zip(incremental["profit"], rebuild["profit"]))
+    print(f"{len(data['rawMaterials'])} crude oils, {args.days} daily changes\n")
+    print(f"{'mode':<12} {'median ms':>10} {'mean ms':>9} {'p95 ms':>8} {'mean iters':>11}")
+    summary = {}
+    for name, runs in [("update", incremental), ("rebuild", rebuild)]:
+        summary[name] = {"median_ms": statistics.median(runs["ms"]), "mean_ms": statistics.fmean(runs["ms"]),
+                         "p95_ms": float(np.percentile(runs["ms"], 95)),
+                         "mean_iterations": statistics.fmean(runs["iterations"])}
+        s = summary[name]
+        print(f"{name:<12} {s['median_ms']:>10.3f} {s['mean_ms']:>9.3f} {s['p95_ms']:>8.3f} {s['mean_iterations']:>11.1f}")
+    print(f"\nSpeed-up (median): {summary['rebuild']['median_ms'] / summary['update']['median_ms']:.1f}x, "
+          f"profit mismatches: {mismatches}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"crudes": len(data["rawMaterials"]), "days": args.days, "mismatches": mismatches, **summary},
+                      file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
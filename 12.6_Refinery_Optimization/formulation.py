@@ -0,0 +1,28 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS  # noqa: E402
+from common.chapters import load_module  # noqa: E402
+
+network = load_module("12.6", "network")
+
+
+# Refinery Optimization on the solver-agnostic layer: data.json as a process graph (network.py)
+# with one site and one period. gurobi.py and refinery.py compile this model.
+def build(data):
+    return network.RefineryNetwork(network.textbook_network(data)).model("Refinery Optimization")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Refinery Optimization with a selectable backend")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--data", default="data.json")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as json_file:
+        data = json.load(json_file)
+    result = build(data).solve(args.backend)
+    print(f"[{result.backend}] status: {result.status}, profit: $ {result.objective:.2f}, time: {result.runtime:.3f}s")
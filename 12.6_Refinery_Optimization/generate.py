@@ -0,0 +1,39 @@
+import argparse
+import json
+
+import numpy as np
+
+
+# Generate a synthetic Refinery instance with the same schema as data.json and more crude oils
+def generate(n_crudes=2, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(__file__.replace("generate.py", "data.json"), "r") as json_file:
+        data = json.load(json_file)
+
+    crudes = [f"CrudeOil{k + 1}" for k in range(n_crudes)]
+    outputs = data["distilOutputs"]
+    base = np.array(list(data["distilYields"].values())).reshape(-1, len(outputs)).mean(axis=0)
+    # Perturbed distillation yields; each crude loses 3-8% in distillation
+    yields = base * rng.uniform(0.7, 1.3, (n_crudes, len(outputs)))
+    yields *= (rng.uniform(0.92, 0.97, n_crudes) / yields.sum(axis=1))[:, None]
+
+    data["rawMaterials"] = crudes
+    data["distilYields"] = {f"{c}_{o}": round(float(yields[k, j]), 4)
+                            for k, c in enumerate(crudes) for j, o in enumerate(outputs)}
+    for key in [key for key in data if key.startswith("MaxCrudeOil")]:
+        del data[key]
+    limits = rng.integers(10, 31, n_crudes) * 1000
+    data.update({f"Max{c}": int(limit) for c, limit in zip(crudes, limits)})
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Refinery instance")
+    parser.add_argument("--crudes", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="generated_data.json")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as json_file:
+        json.dump(generate(args.crudes, args.seed), json_file, indent=2)
+    print(f"Instance with {args.crudes} crude oils saved to {args.output} ✅")
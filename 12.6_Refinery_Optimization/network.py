@@ -0,0 +1,339 @@
+"""Refinery planning over a data-defined process graph, replicated across sites and periods.
+
+A network is plain data:
+
+    streams      material names; every stream must balance (produced + stock in + received
+                 = consumed + stock out + shipped) at every site and period
+    activities   [{"name", "flows": {stream: coefficient}, "rows": {row: coefficient},
+                   "profit", "lb", "ub"}]; a flow is positive when the activity produces the
+                 stream and negative when it consumes it (buying, processing, blending, selling)
+    rows         side constraints {row: {"sense": "<"|">"|"=", "rhs": value}} such as unit
+                 capacities, quality specifications and product ratios
+
+and, optionally, how it is replicated:
+
+    periods      number of periods T (default 1), with "profit_factor": [T values]
+    sites        {site: {"rhs": {row: value}, "ub": {activity: value}}} overrides per site
+    storage      {"streams": [...], "capacity": barrels, "cost": per barrel and period,
+                  "opening": {stream: barrels}}; closing stock equals opening stock
+    transfers    [{"from", "to", "streams", "capacity", "cost"}] between sites, per period
+
+One site-period block is assembled as sparse matrices once and replicated with Kronecker
+products; inventory and transfer columns are added with index arithmetic.
+"""
+import argparse
+import itertools as it
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import BACKENDS, CONTINUOUS, EQUAL, INF, LESS_EQUAL, MAXIMIZE, OPTIMAL, Model  # noqa: E402
+
+# Processing capacities (barrels per day), overridable with MaxDistillation/MaxReforming/MaxCracking in the data
+CAPACITIES = {"distillation": 45000, "reforming": 10000, "cracking": 8000}
+
+
+def textbook_network(data):
+    """The single-day, single-site Refinery Optimization data (data.json) as a process graph."""
+    rawMaterials = data["rawMaterials"]
+    distilOutputs = data["distilOutputs"]
+    naphthas, oils = distilOutputs[:3], distilOutputs[3:5]
+    distilYields = dict(zip(it.product(rawMaterials, distilOutputs), data["distilYields"].values()))
+    reformYields = dict(zip(it.product(naphthas, data["reformOutputs"]), data["reformYields"].values()))
+    crackingYields = dict(zip(it.product(oils, data["crackingOutputs"]), data["crackingYields"].values()))
+    streams = list(dict.fromkeys(rawMaterials + distilOutputs + data["reformOutputs"] + data["crackingOutputs"]
+                                 + data["finalProducts"]))
+    activities = []
+    rows = {unit: {"sense": "<", "rhs": data.get(f"Max{unit.capitalize()}", default)}
+            for unit, default in CAPACITIES.items()}
+
+    for c in rawMaterials:
+        activities.append({"name": f"buy {c}", "flows": {c: 1}, "ub": data[f"Max{c}"]})
+        activities.append({"name": f"distil {c}", "flows": {c: -1, **{p: distilYields[c, p] for p in distilOutputs}},
+                           "rows": {"distillation": 1}})
+    # Arcs of used_to either feed a conversion unit or blend a stream into a product
+    for source, target in data["used_to"]:
+        if target in data["reformOutputs"]:
+            activities.append({"name": f"reform {source}", "rows": {"reforming": 1},
+                               "flows": {source: -1, **{p: reformYields[source, p] for p in data["reformOutputs"]}}})
+        elif target in data["ingredient"]:
+            activity = {"name": f"blend {source} into {target}", "flows": {source: -1, target: 1}}
+            if target in data["quality"]:
+                activity["rows"] = {f"octane {target}": data["octane"][source] - data["quality"][target]}
+            else:
+                activity["rows"] = {f"pressure {target}": data["pressures"][source] - 1}
+            activities.append(activity)
+        elif target in data["finalProducts"]:  # residuum to lube oil at a 0.5 yield
+            activities.append({"name": f"convert {source}", "flows": {source: -1, target: 0.5}})
+        else:
+            activities.append({"name": f"crack {source}", "rows": {"cracking": 1},
+                               "flows": {source: -1, **{p: crackingYields[source, p] for p in data["crackingOutputs"]}}})
+    for p in data["ingredient"]:
+        if p in data["quality"]:
+            rows[f"octane {p}"] = {"sense": ">", "rhs": 0}
+        else:
+            rows[f"pressure {p}"] = {"sense": "<", "rhs": 0}
+
+    # Fuel oil (the product nothing is blended into) is made in fixed proportions
+    targets = {target for _, target in data["used_to"]}
+    fuel = next(p for p in data["finalProducts"] if p not in targets)
+    activities.append({"name": f"blend {fuel}", "flows": {fuel: 1, **{i: -v for i, v in data["propor"].items()}}})
+
+    premium, regular = data["quality"]
+    rows["premium ratio"] = {"sense": ">", "rhs": 0}
+    for p in data["finalProducts"]:
+        sale = {"name": f"sell {p}", "flows": {p: -1}, "profit": data["productProfit"][p]}
+        if f"Min{p}" in data:
+            sale["lb"], sale["ub"] = data[f"Min{p}"], data[f"Max{p}"]
+        if p in (premium, regular):
+            sale["rows"] = {"premium ratio": 1 if p == premium else -0.4}
+        activities.append(sale)
+    return {"streams": streams, "activities": activities, "rows": rows}
+
+
+def block_matrices(network):
+    """Flow (streams x activities) and side-row (rows x activities) matrices of one site-period."""
+    stream_index = {s: k for k, s in enumerate(network["streams"])}
+    row_index = {r: k for k, r in enumerate(network["rows"])}
+    flows = [(stream_index[s], j, v) for j, a in enumerate(network["activities"]) for s, v in a["flows"].items()]
+    rows = [(row_index[r], j, v) for j, a in enumerate(network["activities"]) for r, v in a.get("rows", {}).items()]
+    n_activities = len(network["activities"])
+
+    def coo(entries, n_rows):
+        i, j, v = zip(*entries) if entries else ((), (), ())
+        return sp.csr_matrix((v, (i, j)), shape=(n_rows, n_activities))
+    return coo(flows, len(stream_index)), coo(rows, len(row_index))
+
+
+class RefineryNetwork:
+    def __init__(self, network):
+        self.network = network
+        streams, activities, rows = network["streams"], network["activities"], network["rows"]
+        self.sites = list(network.get("sites", {"Refinery": {}}))
+        T, S = network.get("periods", 1), len(self.sites)
+        n_s, n_a, n_r = len(streams), len(activities), len(rows)
+        self.shape = (S, T)
+        stream_index = {s: k for k, s in enumerate(streams)}
+        activity_index = {a["name"]: j for j, a in enumerate(activities)}
+        row_index = {r: k for k, r in enumerate(rows)}
+
+        # Activities: one block per (site, period), ordered site-major
+        flow, side = block_matrices(network)
+        blocks = sp.identity(S * T, format="csr")
+        A_balance = [sp.kron(blocks, flow, format="csr")]
+        A_side = [sp.kron(blocks, side, format="csr")]
+        factor = np.asarray(network.get("profit_factor", [1.0] * T), dtype=float)
+        profit = np.array([a.get("profit", 0.0) for a in activities])
+        obj = [np.tile(np.outer(factor, profit), (S, 1)).ravel()]
+        lb = np.tile([a.get("lb", 0.0) for a in activities], (S, T, 1))
+        ub = np.tile([a.get("ub", INF) for a in activities], (S, T, 1))
+        rhs = np.tile([r["rhs"] for r in rows.values()], (S, T, 1))
+        for s, site in enumerate(self.sites):
+            overrides = network.get("sites", {}).get(site, {})
+            for name, value in overrides.get("ub", {}).items():
+                ub[s, :, activity_index[name]] = value
+            for name, value in overrides.get("rhs", {}).items():
+                rhs[s, :, row_index[name]] = value
+        lbs, ubs = [lb.ravel()], [ub.ravel()]
+        sense_side = np.tile([r["sense"] for r in rows.values()], S * T)
+        rhs_balance = np.zeros((S, T, n_s))
+        n_cols = S * T * n_a
+        self.columns = {"activity": (0, (S, T, n_a))}
+
+        # Inventory: stock[s, t, k] leaves the balance of period t and enters period t+1
+        storage = network.get("storage")
+        if storage:
+            stored = np.array([stream_index[k] for k in storage["streams"]])
+            K = len(stored)
+            s_idx, t_idx, k_idx = (g.ravel() for g in np.meshgrid(np.arange(S), np.arange(T), np.arange(K),
+                                                                  indexing="ij"))
+            cols = np.arange(S * T * K)
+            out_rows = (s_idx * T + t_idx) * n_s + stored[k_idx]
+            nxt = t_idx + 1 < T
+            in_rows = (s_idx[nxt] * T + t_idx[nxt] + 1) * n_s + stored[k_idx[nxt]]
+            A_balance.append(sp.csr_matrix((np.r_[-np.ones(len(cols)), np.ones(nxt.sum())],
+                                            (np.r_[out_rows, in_rows], np.r_[cols, cols[nxt]])),
+                                           shape=(S * T * n_s, len(cols))))
+            A_side.append(sp.csr_matrix((n_r * S * T, len(cols))))
+            opening = np.array([storage.get("opening", {}).get(k, 0.0) for k in storage["streams"]])
+            rhs_balance[:, 0, stored] -= opening
+            stock_ub = np.full((S, T, K), float(storage.get("capacity", INF)))
+            stock_lb = np.zeros((S, T, K))
+            stock_lb[:, -1], stock_ub[:, -1] = opening, opening
+            obj.append(np.full(len(cols), -storage.get("cost", 0.0)))
+            lbs.append(stock_lb.ravel())
+            ubs.append(stock_ub.ravel())
+            self.columns["stock"] = (n_cols, (S, T, K))
+            n_cols += len(cols)
+
+        # Transfers: ship[l, t, k] leaves the sender's balance and enters the receiver's in the same period
+        transfers = network.get("transfers", [])
+        link_rows = []
+        for link in transfers:
+            sender, receiver = self.sites.index(link["from"]), self.sites.index(link["to"])
+            shipped = np.array([stream_index[k] for k in link["streams"]])
+            K = len(shipped)
+            t_idx, k_idx = (g.ravel() for g in np.meshgrid(np.arange(T), np.arange(K), indexing="ij"))
+            cols = np.arange(T * K)
+            A_balance.append(sp.csr_matrix(
+                (np.r_[-np.ones(len(cols)), np.ones(len(cols))],
+                 (np.r_[(sender * T + t_idx) * n_s + shipped[k_idx], (receiver * T + t_idx) * n_s + shipped[k_idx]],
+                  np.r_[cols, cols])), shape=(S * T * n_s, len(cols))))
+            A_side.append(sp.csr_matrix((n_r * S * T, len(cols))))
+            link_rows.append((len(cols), t_idx, link.get("capacity", INF)))
+            obj.append(np.full(len(cols), -link.get("cost", 0.0)))
+            lbs.append(np.zeros(len(cols)))
+            ubs.append(np.full(len(cols), INF))
+            self.columns[f"ship {link['from']}->{link['to']}"] = (n_cols, (T, K))
+            n_cols += len(cols)
+
+        A = sp.vstack([sp.hstack(A_balance), sp.hstack(A_side)], format="csr")
+        sense = np.r_[np.full(S * T * n_s, EQUAL), sense_side]
+        rhs = np.r_[rhs_balance.ravel(), rhs.ravel()]
+        # Link capacities: one row per (link, period) over the link's shipment columns
+        if link_rows:
+            start, capacity_rows = n_cols - sum(n for n, _, _ in link_rows), []
+            for n, t_idx, capacity in link_rows:
+                capacity_rows.append(sp.csr_matrix((np.ones(n), (t_idx, start + np.arange(n))), shape=(T, n_cols)))
+                rhs = np.r_[rhs, np.full(T, capacity)]
+                start += n
+            A = sp.vstack([A] + capacity_rows, format="csr")
+            sense = np.r_[sense, np.full(T * len(link_rows), LESS_EQUAL)]
+
+        self.matrix = {"c": np.concatenate(obj), "constant": 0.0, "model_sense": MAXIMIZE, "A": A, "sense": sense,
+                       "rhs": rhs.astype(float), "lb": np.concatenate(lbs), "ub": np.concatenate(ubs),
+                       "vtype": np.full(n_cols, CONTINUOUS)}
+        self.result = None
+
+    def model(self, name="Refinery"):
+        """The same LP as a layer ``Model``, for ``to_gurobi_model`` and the chapter scripts.
+
+        Each column block is one ``add_block`` group. Rows are grouped by what they constrain:
+        "<stream> balance", each side row under its own name, and "<link> capacity", indexed by
+        site-period block (site-major) or by period for links. So "distillation[0]" is the
+        distillation capacity of the first site and period.
+        """
+        S, T = self.shape
+        periods = range(1, T + 1)
+        model = Model(name)
+        model.model_sense = MAXIMIZE
+        m = self.matrix
+        for block, (start, shape) in self.columns.items():
+            if block == "activity":
+                axes = (self.sites, periods, [a["name"] for a in self.network["activities"]])
+            elif block == "stock":
+                axes = (self.sites, periods, self.network["storage"]["streams"])
+            else:
+                link = next(link for link in self.network["transfers"]
+                            if block == f"ship {link['from']}->{link['to']}")
+                axes = (periods, link["streams"])
+            end = start + int(np.prod(shape))
+            model.add_block(*axes, lb=m["lb"][start:end].reshape(shape), ub=m["ub"][start:end].reshape(shape),
+                            obj=m["c"][start:end].reshape(shape), name=block)
+
+        n_s, n_r = len(self.network["streams"]), len(self.network["rows"])
+        groups = [(f"{stream} balance", k + n_s * np.arange(S * T)) for k, stream in enumerate(self.network["streams"])]
+        groups += [(row, S * T * n_s + k + n_r * np.arange(S * T)) for k, row in enumerate(self.network["rows"])]
+        first = S * T * (n_s + n_r)
+        for k, link in enumerate(self.network.get("transfers", [])):
+            groups.append((f"ship {link['from']}->{link['to']} capacity", first + k * T + np.arange(T)))
+        for group, index in groups:
+            model.add_mconstr(m["A"][index], m["sense"][index], m["rhs"][index], group)
+        return model
+
+    def solve(self, backend=None, time_limit=None, threads=None, verbose=False):
+        backend = backend or os.environ.get("MODEL_BACKEND", "gurobi")
+        self.result = BACKENDS[backend](self.matrix, time_limit=time_limit, threads=threads, verbose=verbose)
+        return self.result
+
+    def block(self, name):
+        """Solution values of one column block, reshaped to its (site, period, ...) layout."""
+        start, shape = self.columns[name]
+        return self.result.values[start:start + int(np.prod(shape))].reshape(shape)
+
+    def activity_table(self):
+        S, T = self.shape
+        names = [a["name"] for a in self.network["activities"]]
+        values = self.block("activity").reshape(S * T, -1)
+        index = pd.MultiIndex.from_product([self.sites, range(1, T + 1)], names=["Site", "Period"])
+        return pd.DataFrame(values, index=index, columns=names)
+
+
+def replicate(network, n_sites=1, n_periods=1, seed=0):
+    """Copy a single-site network across sites and periods with random capacities, prices and links."""
+    rng = np.random.default_rng(seed)
+    network = dict(network, periods=n_periods)
+    sites = [f"Refinery{s + 1}" for s in range(n_sites)]
+    capacity_rows = [r for r, spec in network["rows"].items() if spec["sense"] == "<" and spec["rhs"] > 0]
+    supplies = [a for a in network["activities"] if all(v > 0 for v in a["flows"].values()) and "ub" in a]
+    network["sites"] = {site: {"rhs": {r: round(network["rows"][r]["rhs"] * rng.uniform(0.6, 1.4)) for r in capacity_rows},
+                               "ub": {a["name"]: round(a["ub"] * rng.uniform(0.6, 1.4)) for a in supplies}}
+                        for site in sites}
+    network["profit_factor"] = (1 + 0.1 * np.sin(np.arange(n_periods) * 2 * np.pi / 7)).round(4).tolist()
+    network["storage"] = {"streams": network["streams"], "capacity": 20000, "cost": 0.05}
+    # Sites form a ring with links in both directions
+    links = {(a, b) for a, b in zip(sites, sites[1:] + sites[:1]) if a != b}
+    network["transfers"] = [{"from": a, "to": b, "streams": network["streams"], "capacity": 5000, "cost": 0.2}
+                            for a, b in sorted(links | {(b, a) for a, b in links})]
+    return network
+
+
+def widen(network, copies, seed=0):
+    """Independent copies of the process graph (streams renamed "name#k") with perturbed yields and profits."""
+    rng = np.random.default_rng(seed)
+    wide = {"streams": [], "activities": [], "rows": {}}
+    for k in range(copies):
+        tag = f"#{k + 1}"
+        wide["streams"] += [s + tag for s in network["streams"]]
+        wide["rows"].update({r + tag: spec for r, spec in network["rows"].items()})
+        for a in network["activities"]:
+            flows = {s + tag: v * (rng.uniform(0.95, 1.05) if v > 0 and len(a["flows"]) > 2 else 1)
+                     for s, v in a["flows"].items()}
+            copy = dict(a, name=a["name"] + tag, flows=flows, rows={r + tag: v for r, v in a.get("rows", {}).items()})
+            if "profit" in a:
+                copy["profit"] = a["profit"] * rng.uniform(0.9, 1.1)
+            wide["activities"].append(copy)
+    return wide
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-period, multi-site refinery planning on a data-defined graph")
+    parser.add_argument("--data", default="data.json", help="textbook data.json, or a network JSON with 'activities'")
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--periods", type=int, default=1)
+    parser.add_argument("--copies", type=int, default=1, help="independent copies of the process graph per site")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--output", default=None, help="optional CSV file for the activity levels")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as json_file:
+        data = json.load(json_file)
+    network = data if "activities" in data else textbook_network(data)
+    if args.copies > 1:
+        network = widen(network, args.copies, args.seed)
+    if args.sites > 1 or args.periods > 1:
+        network = replicate(network, args.sites, args.periods, args.seed)
+
+    start = time.perf_counter()
+    refinery = RefineryNetwork(network)
+    build_time = time.perf_counter() - start
+    result = refinery.solve(args.backend)
+    rows, columns = refinery.matrix["A"].shape
+    print(f"[{result.backend}] {len(network['streams'])} streams, {len(refinery.sites)} site(s) x "
+          f"{network.get('periods', 1)} period(s): "
+          f"{columns} columns, {rows} rows, build {build_time:.3f}s, solve {result.runtime:.3f}s")
+    if result.status == OPTIMAL:
+        print(f"Profit of $ {result.objective:.2f}")
+        if args.output:
+            refinery.activity_table().to_csv(args.output)
+            print(f"Activity levels saved to {args.output} ✅")
+    else:
+        print(f"No optimal solution (status {result.status})")
@@ -0,0 +1,93 @@
+import argparse
+import json
+import time
+
+from gurobipy import GRB
+
+from gurobi import build, network
+
+CAPACITIES = network.CAPACITIES
+
+
+class RefineryModel:
+    """Refinery Optimization LP (gurobi.build) kept in memory between solves.
+
+    Product profits, processing capacities and crude/lube-oil limits are changed in place on
+    the Gurobi model (objective coefficients of the sell activities, right-hand sides of the unit
+    rows and bounds of the buy and sell activities), so the next ``solve`` starts from the
+    previous optimal basis instead of building a new model.
+    """
+
+    def __init__(self, data, output_flag=0):
+        self.graph = network.textbook_network(data)
+        self.crudes = data["rawMaterials"]
+        self.products = data["finalProducts"]
+        self.model = model = build(data)
+        model.Params.OutputFlag = output_flag
+
+        # Handles by activity and capacity name
+        names = [a["name"] for a in self.graph["activities"]]
+        self.activity = dict(zip(names, model._vars["activity"].reshape(-1).tolist()))
+        self.capacity = {unit: model._rows[unit][0] for unit in CAPACITIES}
+
+    # In-place updates; Gurobi keeps the current basis across these changes
+    def set_profits(self, profits):
+        self.model.setAttr("Obj", [self.activity[f"sell {p}"] for p in profits], list(profits.values()))
+
+    def set_capacities(self, capacities):
+        self.model.setAttr("RHS", [self.capacity[unit] for unit in capacities], list(capacities.values()))
+
+    def set_crude_limits(self, limits):
+        self.model.setAttr("UB", [self.activity[f"buy {c}"] for c in limits], list(limits.values()))
+
+    def set_lube_oil_limits(self, minimum=None, maximum=None):
+        if minimum is not None:
+            self.activity["sell LubeOil"].LB = minimum
+        if maximum is not None:
+            self.activity["sell LubeOil"].UB = maximum
+
+    def update(self, profits=None, capacities=None, crude_limits=None):
+        if profits:
+            self.set_profits(profits)
+        if capacities:
+            self.set_capacities(capacities)
+        if crude_limits:
+            self.set_crude_limits(crude_limits)
+
+    def solve(self):
+        """Re-optimize and return (status, profit, simplex iterations, seconds)."""
+        self.model.optimize()
+        profit = self.model.ObjVal if self.model.Status == GRB.OPTIMAL else None
+        return self.model.Status, profit, int(self.model.IterCount), self.model.Runtime
+
+    def quantities(self):
+        """Barrels of each stream, as produced (or bought) by its activities."""
+        flow, _ = network.block_matrices(self.graph)
+        levels = self.model.getAttr("X", list(self.activity.values()))
+        return dict(zip(self.graph["streams"], (flow.maximum(0) @ levels).tolist()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-solve the refinery LP after a price or capacity change")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--profit", nargs=2, action="append", default=[], metavar=("PRODUCT", "VALUE"))
+    parser.add_argument("--capacity", nargs=2, action="append", default=[], metavar=("UNIT", "BARRELS"))
+    parser.add_argument("--crude-limit", nargs=2, action="append", default=[], metavar=("CRUDE", "BARRELS"))
+    args = parser.parse_args()
+
+    with open(args.data, "r") as json_file:
+        data = json.load(json_file)
+    refinery = RefineryModel(data)
+    status, profit, iterations, _ = refinery.solve()
+    print(f"Base profit: $ {profit:.2f} ({iterations} iterations)")
+
+    start = time.perf_counter()
+    refinery.update(profits={p: float(v) for p, v in args.profit},
+                    capacities={u: float(v) for u, v in args.capacity},
+                    crude_limits={c: float(v) for c, v in args.crude_limit})
+    status, profit, iterations, _ = refinery.solve()
+    elapsed = time.perf_counter() - start
+    if status == GRB.OPTIMAL:
+        print(f"Updated profit: $ {profit:.2f} ({iterations} iterations, {elapsed * 1000:.2f} ms)")
+    else:
+        print(f"No optimal solution after the update (status {status})")
@@ -0,0 +1,82 @@
+import argparse
+import json
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from generate import generate
+from gurobi import build
+
+SIZES = [(10, 20), (100, 20), (500, 20)]
+
+
+def build_keyed_model(data, env=None):
+    """Previous formulation: string-keyed tupledicts and one constraint per (mine, year)."""
+    Mines, Years = data["Mines"], data["Years"]
+    Next_Year = dict(zip(Years[:-1], Years[1:]))
+    Year_Disc = {t: (1 + data["Discount_Rate"]) ** -i for i, t in enumerate(Years)}
+
+    model = gp.Model("Mining", env=env)
+    extract = model.addVars(Mines, Years, name="extract")
+    make = model.addVars(Years, name="make")
+    used = model.addVars(Mines, Years, name="used", vtype=GRB.BINARY)
+    active = model.addVars(Mines, Years, name="active", vtype=GRB.BINARY)
+    model.setObjective(gp.quicksum(data["Blend_Price"] * Year_Disc[t] * make[t] for t in Years)
+                       - gp.quicksum(data["Royalties"][m] * Year_Disc[t] * active[m, t] for m in Mines for t in Years),
+                       GRB.MAXIMIZE)
+    model.addConstrs((gp.quicksum(used[m, t] for m in Mines) <= 3 for t in Years), name="mines_limit")
+    model.addConstrs((extract[m, t] - data["Ore_Limit"][m] * used[m, t] <= 0 for m in Mines for t in Years),
+                     name="extract_then_used")
+    model.addConstrs((used[m, t] - active[m, t] <= 0 for m in Mines for t in Years), name="notactive_then_cantbeused")
+    model.addConstrs((active[m, Next_Year[t]] - active[m, t] <= 0 for m in Mines for t in Years if t in Next_Year),
+                     name="notactive_then_notactiveanymore")
+    model.addConstrs((gp.quicksum(data["Ore_Quality"][m] * extract[m, t] for m in Mines)
+                      - data["Required_Quality"][t] * make[t] == 0 for t in Years), name="quality")
+    model.addConstrs((gp.quicksum(extract[m, t] for m in Mines) - make[t] == 0 for t in Years), name="mass_conservation")
+    return model
+
+
+BUILDERS = {"keyed": build_keyed_model, "matrix": build}
+
+
+def measure(builder, n_mines, n_years):
+    """Runs in a fresh process so the peak RSS increase belongs to this build alone."""
+    data = generate(n_mines, n_years)
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        model = BUILDERS[builder](data, env)
+        model.update()
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        size = (model.NumVars, model.NumConstrs, model.NumNZs)
+        model.dispose()
+    return elapsed, (peak - baseline) / 1024, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build time and memory of the keyed and matrix Mining models")
+    parser.add_argument("--sizes", nargs="*", default=[f"{n}x{t}" for n, t in SIZES], help="MINESxYEARS")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'mines':>6} {'years':>6} {'vars':>8} {'constrs':>8} {'nonzeros':>9} {'builder':>7} {'build (s)':>10} "
+          f"{'peak RSS +MB':>13}")
+    for size in args.sizes:
+        n_mines, n_years = (int(v) for v in size.lower().split("x"))
+        for builder in BUILDERS:
+            with ProcessPoolExecutor(1) as pool:
+                elapsed, memory, (n_vars, n_constrs, n_nzs) = pool.submit(measure, builder, n_mines, n_years).result()
+            results.append({"mines": n_mines, "years": n_years, "builder": builder, "vars": n_vars,
+                            "constrs": n_constrs, "nonzeros": n_nzs, "build_seconds": elapsed, "peak_rss_mb": memory})
+            print(f"{n_mines:>6} {n_years:>6} {n_vars:>8} {n_constrs:>8} {n_nzs:>9} {builder:>7} {elapsed:>10.3f} "
+                  f"{memory:>13.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import time
+
+import gurobipy as gp
+from gurobipy import GurobiError
+
+from enumeration import enumerate_closures
+from generate import generate
+from gurobi import build, solve
+
+SIZES = [(4, 5), (6, 5), (8, 5), (10, 5), (15, 5), (20, 5), (30, 5)]
+
+
+def run_mip(data, time_limit):
+    try:
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            model = build(data, env)
+            start = time.perf_counter()
+            result = solve(model, time_limit=time_limit)
+            row = {"objective": result.objective, "status": result.status, "seconds": time.perf_counter() - start,
+                   "nodes": model.NodeCount}
+            model.dispose()
+            return row
+    except GurobiError as error:
+        return {"error": str(error)}
+
+
+def run_enumeration(data, workers):
+    try:
+        result = enumerate_closures(data, workers)
+    except GurobiError as error:
+        return {"error": str(error)}
+    return {key: result[key] for key in ("objective", "nodes", "pruned", "lps", "lp_seconds", "search_seconds",
+                                         "seconds")}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Closure-year enumeration vs the Gurobi MIP as the mine count grows")
+    parser.add_argument("--sizes", nargs="*", default=[f"{m}x{t}" for m, t in SIZES], help="MINESxYEARS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--time-limit", type=float, default=300.0, help="MIP time limit")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'mines':>6} {'years':>6} {'mip':>16} {'time (s)':>9} {'enumeration':>16} {'time (s)':>9} "
+          f"{'LPs':>7} {'LP (s)':>7} {'nodes':>9} {'pruned':>9}")
+    for size in args.sizes:
+        n_mines, n_years = (int(v) for v in size.lower().split("x"))
+        data = generate(n_mines, n_years, args.seed)
+        mip = run_mip(data, args.time_limit)
+        enum = run_enumeration(data, args.workers)
+        results.append({"mines": n_mines, "years": n_years, "mip": mip, "enumeration": enum})
+
+        def cells(r):
+            if "error" in r:
+                return f"{'error':>16} {'-':>9}"
+            return f"{r['objective']:>16.2f} {r['seconds']:>9.3f}"
+        detail = f"{'-':>7} {'-':>7} {'-':>9} {'-':>9}" if "error" in enum else (
+            f"{enum['lps']:>7} {enum['lp_seconds']:>7.2f} {enum['nodes']:>9} {enum['pruned']:>9}")
+        print(f"{n_mines:>6} {n_years:>6} {cells(mip)} {cells(enum)} {detail}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
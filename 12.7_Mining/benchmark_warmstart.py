@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import gurobipy as gp
+from gurobipy import GurobiError
+
+from generate import generate
+from gurobi import build
+from heuristic import warm_start
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.instrument import milestones  # noqa: E402
+
+SIZES = [(10, 20), (25, 20), (100, 20), (500, 20)]
+
+
+def run(data, warm, gap, time_limit):
+    """Solver milestones, with the heuristic's own time added to both when ``warm``."""
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        model = build(data, env)
+        start = time.perf_counter()
+        heuristic = warm_start(model, data) if warm else None
+        elapsed = time.perf_counter() - start if warm else 0.0
+        row = milestones(model, gap, time_limit)
+        model.dispose()
+    for key in ("first_incumbent", "time_to_gap"):
+        if row[key] is not None:
+            row[key] += elapsed
+    return {"warm": warm, "heuristic": heuristic, "heuristic_seconds": elapsed, **row}
+
+
+def seconds(value):
+    return f"{value:>9.2f}" if value is not None else f"{'-':>9}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to first incumbent and to a target gap, cold and warm-started")
+    parser.add_argument("--sizes", nargs="*", default=[f"{n}x{t}" for n, t in SIZES], help="MINESxYEARS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gap", type=float, default=0.01)
+    parser.add_argument("--time-limit", type=float, default=120.0)
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'mines':>6} {'years':>6} {'start':>5} {'heuristic':>16} {'first (s)':>9} {'first obj':>16} {'gap (s)':>9} "
+          f"{'objective':>16} {'final gap':>9} {'nodes':>8}")
+    for size in args.sizes:
+        n_mines, n_years = (int(v) for v in size.lower().split("x"))
+        data = generate(n_mines, n_years, args.seed)
+        for warm in (False, True):
+            try:
+                row = run(data, warm, args.gap, args.time_limit)
+            except GurobiError as error:
+                print(f"{n_mines:>6} {n_years:>6} {'warm' if warm else 'cold':>5} error: {error}")
+                results.append({"mines": n_mines, "years": n_years, "warm": warm, "error": str(error)})
+                continue
+            results.append({"mines": n_mines, "years": n_years, **row})
+            heuristic = f"{row['heuristic']:>16.2f}" if warm else f"{'-':>16}"
+            first, objective = (f"{row[key]:>16.2f}" if row[key] is not None else f"{'-':>16}"
+                                for key in ("first_objective", "objective"))
+            final_gap = f"{row['gap']:>9.2%}" if row["gap"] is not None else f"{'-':>9}"
+            print(f"{n_mines:>6} {n_years:>6} {'warm' if warm else 'cold':>5} {heuristic} "
+                  f"{seconds(row['first_incumbent'])} {first} {seconds(row['time_to_gap'])} {objective} {final_gap} "
+                  f"{row['nodes']:>8}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,217 @@
+"""Exact Mining solver that enumerates the closure year of each mine instead of branching.
+
+Once closed a mine stays closed (notactive_then_notactiveanymore), so the active binaries are one
+closure year per mine: open in years before it, closed from it on. With the mines open in a year
+fixed, the rest separates by year: pick at most 3 open mines to work (mines_limit) and blend
+their ore (quality, mass_conservation), which for a chosen set S is an LP. Its discounted
+revenue V(S, t) is computed for every set of at most 3 mines and every year up front, on a
+process pool; each worker reuses one LP and only opens the bounds of the set it scores.
+
+The search assigns closure years mine by mine, depth first and latest closure first, and prunes
+a node whose bound is not above the incumbent:
+
+    sum over years t of  max over sets S of open or undecided mines [V(S, t) - royalty in year t
+                         of the undecided mines of S]  -  royalties of the decided mines
+
+A mine worked in year t is open and pays its royalty in that year, so this bounds every
+completion, and it is the exact profit once every mine is decided.
+
+    python enumeration.py [--data data.json] [--workers 4] [--compare]
+"""
+import argparse
+import itertools as it
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+MAX_WORKED = 3
+
+# Per-worker state: one blending LP reused for every set the worker scores
+_worker = {}
+
+
+class Blend:
+    """The blending LPs of all years in one model; a (set, year) is scored by opening only its bounds."""
+
+    def __init__(self, data, env=None):
+        Mines, Years = data["Mines"], data["Years"]
+        self.limit = np.array([data["Ore_Limit"][m] for m in Mines], dtype=float)
+        quality = np.array([data["Ore_Quality"][m] for m in Mines], dtype=float)
+        required = np.array([data["Required_Quality"][t] for t in Years], dtype=float)
+        discount = (1 + data["Discount_Rate"]) ** -np.arange(len(Years))
+        self.model = gp.Model("Mining_Blend", env=env)
+        self.model.Params.OutputFlag = 0
+        self.model.ModelSense = GRB.MAXIMIZE
+        self.extract = self.model.addMVar((len(Mines), len(Years)), ub=0.0,
+                                          obj=np.outer(np.ones(len(Mines)), data["Blend_Price"] * discount))
+        # Blended quality equals the requirement: sum_m (quality_m - required_t) * extract[m, t] = 0
+        self.model.addConstr(((quality[:, None] - required[None, :]) * self.extract).sum(axis=0) == 0)
+
+    def solve(self, mines, year):
+        """Discounted revenue and extraction of working ``mines`` (positions) in ``year``."""
+        self.extract[mines, year].UB = self.limit[mines]
+        self.model.optimize()
+        value, extract = self.model.ObjVal, self.extract[mines, year].X
+        self.extract[mines, year].UB = 0.0
+        return value, extract
+
+    def dispose(self):
+        self.model.dispose()
+
+
+def _init_worker(data):
+    env = gp.Env(params={"OutputFlag": 0, "Threads": 1})
+    _worker["blend"] = Blend(data, env)
+
+
+def _score(tasks):
+    blend = _worker["blend"]
+    return [blend.solve(list(mines), year)[0] for mines, year in tasks]
+
+
+def subsets(n_mines):
+    """Every set of at most MAX_WORKED mines (the empty set first) as position tuples."""
+    return [s for size in range(min(MAX_WORKED, n_mines) + 1) for s in it.combinations(range(n_mines), size)]
+
+
+def set_values(data, sets, workers=1):
+    """V(S, t) for every set and year, as a (sets x years) array, with the LPs spread over ``workers``."""
+    T = len(data["Years"])
+    tasks = [(mines, t) for mines in sets[1:] for t in range(T)]
+    chunks = [tasks[i::max(workers, 1)] for i in range(max(workers, 1))]
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data,)) as pool:
+            scored = list(pool.map(_score, chunks))
+    else:
+        _init_worker(data)
+        scored = [_score(chunk) for chunk in chunks]
+        _worker["blend"].dispose()
+    values = np.zeros((len(sets), T))
+    flat = values[1:].reshape(-1)
+    for i, chunk in enumerate(scored):
+        flat[i::max(workers, 1)] = chunk
+    return values
+
+
+def enumerate_closures(data, workers=os.cpu_count(), tol=1e-9):
+    """Best closure year per mine (len(Years) = never closed) by bounded enumeration."""
+    Mines, Years = data["Mines"], data["Years"]
+    M, T = len(Mines), len(Years)
+    # Sets of mines are int64 bitmasks with the sign bit unused; check before any LP is solved
+    if M >= 64:
+        raise ValueError(f"enumeration handles at most 63 mines, got {M}")
+    start = time.perf_counter()
+    sets = subsets(M)
+    values = set_values(data, sets, workers)
+    lp_seconds = time.perf_counter() - start
+
+    discount = (1 + data["Discount_Rate"]) ** -np.arange(T)
+    royalty = np.outer([data["Royalties"][m] for m in Mines], discount)  # (mines, years)
+
+    # First guess: each mine closes after the last year it is worked in the sets of the root bound
+    members = np.zeros((len(sets), M))
+    for i, mines in enumerate(sets):
+        members[i, list(mines)] = 1.0
+    chosen = (values - members @ royalty).argmax(axis=0)
+    guess = [max([t + 1 for t in range(T) if m in sets[chosen[t]]], default=0) for m in range(M)]
+    # Mines worked late (their royalties add up most) and costly ones are decided first
+    order = sorted(range(M), key=lambda m: (-guess[m], -royalty[m, 0]))
+    royalty, guess, members = royalty[order], [guess[m] for m in order], members[:, order]
+    masks = members.astype(np.int64) @ (1 << np.arange(M, dtype=np.int64))
+
+    # Net value of each set while mines k.. are undecided: V(S, t) minus their royalties in year t
+    net = [values - members[:, k:] @ royalty[k:] for k in range(M + 1)]
+    # royalty_to[k, c]: royalties of mine k when it closes at the start of year c
+    royalty_to = np.hstack([np.zeros((M, 1)), np.cumsum(royalty, axis=1)])
+    undecided = [sum(1 << m for m in range(k, M)) for k in range(M + 1)]
+    open_bits = [[(1 << k) * (np.arange(T) < c) for c in range(T + 1)] for k in range(M)]
+    # A mine closing at c is worked in year c - 1; otherwise closing a year earlier pays less
+    last_bits = [[(1 << k) * (np.arange(T) == c - 1) for c in range(T + 1)] for k in range(M)]
+
+    def bound(k, opened, last, paid):
+        allowed = opened | undecided[k]
+        ok = ((masks[:, None] & ~allowed[None, :]) == 0) & ((masks[:, None] & last[None, :]) == last[None, :])
+        return np.where(ok, net[k], -np.inf).max(axis=0).sum() - paid
+
+    def profit(closure):
+        opened = np.bitwise_or.reduce([open_bits[k][c] for k, c in enumerate(closure)], axis=0)
+        last = np.bitwise_or.reduce([last_bits[k][c] for k, c in enumerate(closure)], axis=0)
+        return bound(M, opened, last, royalty_to[np.arange(M), closure].sum())
+
+    best = {"value": profit(guess), "closure": guess}
+    stats = {"nodes": 0, "pruned": 0}
+
+    def search(k, opened, last, paid, closure):
+        stats["nodes"] += 1
+        value = bound(k, opened, last, paid)
+        if value <= best["value"] + tol * max(1.0, abs(best["value"])):
+            stats["pruned"] += 1
+            return
+        if k == M:
+            best.update(value=value, closure=list(closure))
+            return
+        for c in [guess[k]] + [c for c in range(T, -1, -1) if c != guess[k]]:
+            closure.append(c)
+            search(k + 1, opened | open_bits[k][c], last | last_bits[k][c], paid + royalty_to[k, c], closure)
+            closure.pop()
+
+    search(0, np.zeros(T, dtype=np.int64), np.zeros(T, dtype=np.int64), 0.0, [])
+    closure = [0] * M
+    for k, m in enumerate(order):
+        closure[m] = best["closure"][k]
+    return {"objective": best["value"], "closure": closure, "sets": sets, "values": values,
+            "nodes": stats["nodes"], "pruned": stats["pruned"], "lps": (len(sets) - 1) * T,
+            "lp_seconds": lp_seconds, "search_seconds": time.perf_counter() - start - lp_seconds,
+            "seconds": time.perf_counter() - start}
+
+
+def plan(data, result):
+    """Worked mines and extraction per year of the enumerated optimum."""
+    Mines, Years = data["Mines"], data["Years"]
+    T = len(Years)
+    closure, sets, values = result["closure"], result["sets"], result["values"]
+    blend = Blend(data)
+    worked, extract = {}, np.zeros((len(Mines), T))
+    for t in range(T):
+        best = max((i for i, mines in enumerate(sets) if all(t < closure[m] for m in mines)),
+                   key=lambda i: values[i, t])
+        mines = list(sets[best])
+        worked[Years[t]] = [Mines[m] for m in mines]
+        if mines:
+            extract[mines, t] = blend.solve(mines, t)[1]
+    blend.dispose()
+    return worked, extract
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mining solved exactly by enumerating mine closure years")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--compare", action="store_true", help="also solve the MIP of gurobi.py")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as file:
+        data = json.load(file)
+    result = enumerate_closures(data, args.workers)
+    print(f"Profit of £{result['objective']:.2f}: {result['lps']} blending LPs in {result['lp_seconds']:.2f}s "
+          f"on {args.workers} workers, {result['nodes']} nodes ({result['pruned']} pruned) in "
+          f"{result['search_seconds']:.2f}s")
+    Years = data["Years"]
+    print("Closure:", {m: Years[c] if c < len(Years) else "open" for m, c in zip(data["Mines"], result["closure"])})
+    worked, extract = plan(data, result)
+    for year, mines in worked.items():
+        print(f"{year}: {', '.join(mines) or 'None'}")
+
+    if args.compare:
+        from gurobi import build, solve
+
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            model = build(data, env)
+            mip = solve(model)
+            print(f"MIP: £{mip.objective:.2f} in {mip.runtime:.2f}s")
+            model.dispose()
@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common import binary  # noqa: E402
+from common.backend import BACKENDS, BINARY, EQUAL, LESS_EQUAL, MAXIMIZE, Model  # noqa: E402
+
+
+# Mining on the solver-agnostic layer; gurobi.py compiles this model. Mines and years are indexed
+# by position, discount factors come from Discount_Rate, and each constraint family is one sparse block.
+def build(data):
+    Mines = data["Mines"]
+    Years = data["Years"]
+    # Arrays in Mines/Years order (zero-copy views when loaded from a binary instance)
+    Royalties = binary.array(data["Royalties"], Mines)
+    Ore_Limit = binary.array(data["Ore_Limit"], Mines)
+    Ore_Quality = binary.array(data["Ore_Quality"], Mines)
+    Req_Quality = binary.array(data["Required_Quality"], Years)
+    Year_Disc = (1 + data["Discount_Rate"]) ** -np.arange(len(Years))
+    Blend_Price = data["Blend_Price"]
+    M, T = len(Mines), len(Years)
+
+    model = Model("Mining")
+
+    # Variables, indexed [mine, year] by position, with the discounted objective coefficients
+    extract = model.add_block(Mines, Years, name="extract")
+    make = model.add_block(Years, obj=Blend_Price * Year_Disc, name="make")
+    used = model.add_block(Mines, Years, vtype=BINARY, name="used")
+    active = model.add_block(Mines, Years, vtype=BINARY, obj=-np.outer(Royalties, Year_Disc), name="active")
+    model.model_sense = MAXIMIZE
+
+    # Constraints, one sparse block per family
+    I_E, I_T = sp.identity(M * T, format="csr"), sp.identity(T, format="csr")
+    per_year = sp.kron(np.ones((1, M)), I_T, format="csr")  # sums a [mine, year] block over mines
+    next_year = sp.kron(sp.identity(M), sp.eye(T - 1, T, 1) - sp.eye(T - 1, T), format="csr")
+    model.add_mconstr([(used, per_year)], LESS_EQUAL, 3.0, "mines_limit")
+    model.add_mconstr([(extract, I_E), (used, -sp.diags(np.repeat(Ore_Limit, T)))], LESS_EQUAL, 0.0,
+                      "extract_then_used")
+    model.add_mconstr([(used, I_E), (active, -I_E)], LESS_EQUAL, 0.0, "notactive_then_cantbeused")
+    model.add_mconstr([(active, next_year)], LESS_EQUAL, 0.0, "notactive_then_notactiveanymore")
+    model.add_mconstr([(extract, sp.kron(Ore_Quality[None, :], I_T)), (make, -sp.diags(Req_Quality))], EQUAL, 0.0,
+                      "quality")
+    model.add_mconstr([(extract, per_year), (make, -I_T)], EQUAL, 0.0, "mass_conservation")
+
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Mining with a selectable backend")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--data", default="data.json")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as f:
+        data = json.load(f)
+    result = build(data).solve(args.backend)
+    print(f"[{result.backend}] status: {result.status}, profit: £{result.objective:.2f}, time: {result.runtime:.3f}s")
@@ -0,0 +1,37 @@
+import argparse
+import json
+
+import numpy as np
+
+
+# Generate a synthetic Mining instance with the same schema as data.json
+def generate(n_mines=4, n_years=5, seed=0, discount_rate=0.1):
+    rng = np.random.default_rng(seed)
+    mines = [f"MINE{k + 1}" for k in range(n_mines)]
+    years = [f"YEAR{t + 1}" for t in range(n_years)]
+
+    return {
+        "Mines": mines,
+        "Years": years,
+        "Next_Year": dict(zip(years[:-1], years[1:])),
+        "Royalties": dict(zip(mines, (rng.integers(30, 61, n_mines) * 1e5).tolist())),
+        "Ore_Limit": dict(zip(mines, (rng.integers(10, 31, n_mines) * 1e5).tolist())),
+        "Ore_Quality": dict(zip(mines, rng.uniform(0.4, 1.6, n_mines).round(2).tolist())),
+        "Required_Quality": dict(zip(years, rng.uniform(0.6, 1.2, n_years).round(2).tolist())),
+        "Year_Discount": {year: (1 + discount_rate) ** -t for t, year in enumerate(years)},
+        "Blend_Price": 10,
+        "Discount_Rate": discount_rate
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Mining instance")
+    parser.add_argument("--mines", type=int, default=4)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="generated_data.json")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as f:
+        json.dump(generate(args.mines, args.years, args.seed), f, indent=4)
+    print(f"Instance with {args.mines} mines x {args.years} years saved to {args.output} ✅")
@@ -1,83 +1,62 @@
-import pandas as pd
-import gurobipy as gp
-import json
-from gurobipy import GRB
-
-#Data Handling
-with open("data.json", "r") as f:
-    data = json.load(f)
-Mines = data["Mines"]
-Years = data["Years"]
-Next_Year = data["Next_Year"]
-Royalties = data["Royalties"]
-Ore_Limit = data["Ore_Limit"]
-Ore_Quality = data["Ore_Quality"]
-Req_Quality = data["Required_Quality"]
-Year_Disc = data["Year_Discount"]
-Blend_Price = data["Blend_Price"]
-Discount_Rate = data["Discount_Rate"]
-pd.set_option('future.no_silent_downcasting', True)
+import argparse
+import sys
+from pathlib import Path
 
+import pandas as pd
 
-model = gp.Model('Mining')
-
-# Variables
-extract = model.addVars(Mines, Years, name='extract')
-make = model.addVars(Years, name='make')
-used = model.addVars(Mines, Years, name='used', vtype=gp.GRB.BINARY)
-active = model.addVars(Mines, Years, name='active', vtype=gp.GRB.BINARY)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common import binary, export, instrument  # noqa: E402
+from common.backend import optimize_gurobi as solve  # noqa: E402
+from common.backend import to_gurobi_model  # noqa: E402
+from common.chapters import load_module  # noqa: E402
 
+__all__ = ["load_data", "build", "solve", "report", "main"]
 
-# objective function
-model.setObjective(gp.quicksum(Blend_Price*Year_Disc[t]*make[t] for t in Years)
-                   - gp.quicksum(Royalties[m]*Year_Disc[t]*active[m,t] for m in Mines for t in Years),
-                   GRB.MAXIMIZE)
+formulation = load_module("12.7", "formulation")
 
 
-# add constraints
-model.addConstrs((gp.quicksum(used[m,t] for m in Mines) <= 3 for t in Years), name='mines_limit')
-model.addConstrs((extract[m,t] - Ore_Limit[m]*used[m,t] <= 0 for m in Mines for t in Years), name='extract_then_used')
-model.addConstrs((used[m,t] - active[m,t] <= 0 for m in Mines for t in Years), name='notactive_then_cantbeused')
-model.addConstrs((active[m,Next_Year[t]] - active[m,t] <= 0 for m in Mines for t in Years[:4]), name='notactive_then_notactiveanymore')
-model.addConstrs((gp.quicksum(Ore_Quality[m]*extract[m,t] for m in Mines) - Req_Quality[t]*make[t] == 0 for t in Years), name='quality')
-model.addConstrs((gp.quicksum(extract[m,t] for m in Mines) - make[t] == 0 for t in Years), name='mass_conservation')
+#Data Handling
+def load_data(path="data.json"):
+    return binary.read(path)
 
 
-model.optimize()
+def build(data, env=None):
+    # The model is the layer formulation of formulation.py, compiled to a named gurobipy model
+    return to_gurobi_model(formulation.build(data), env)
 
 
 #Output Results
-with open("Solution.txt", "w", encoding="utf-8") as file:
-    print('Profit of \033[92m£{:.2f}\033[0m'.format(model.objVal))
-    file.write(f'Profit of £{model.objVal:.2f}')
-    print('\033[94m\n\nWORKING MINES PLAN\033[0m')
-    file.write('\n\nWORKING MINES PLAN\n')
-    working_mines = {t: [] for t in Years}
-    for m, t in used.keys():
-        if used[m, t].x > 0.5:  # Binary variable, threshold at 0.5 for robustness
-            working_mines[t].append(m)
-    for t in Years:
-        print(f"{t}: {', '.join(working_mines[t]) if working_mines[t] else 'None'}")
-        file.write(f"{t}: {', '.join(working_mines[t]) if working_mines[t] else 'None'}\n")
-
-    extract_solution = pd.DataFrame([], columns=Mines, index=Years)
-    extract_solution = extract_solution.fillna(0).infer_objects(copy=False)
-    for m, t in extract.keys():
-        extract_solution.loc[t, m] = int(extract[m, t].x)
-    extract_solution = extract_solution.astype(int)
-    print('\033[94m\n\nEXTRACTION PLAN\033[0m')
-    file.write('\n\nEXTRACTION PLAN\n')
-    print(extract_solution)
-    file.write(extract_solution.to_string())
-    file.write('\n')
-
-    make_solution = pd.DataFrame([], columns=['Tons'], index=Years)
-    make_solution = make_solution.fillna(0).infer_objects(copy=False)
-    for t in make.keys():
-        make_solution.loc[t, 'Tons'] = int(make[t].x)
-    make_solution = make_solution.astype(int)
-    print('\033[94m\n\nPRODUCING PLAN\033[0m')
-    file.write('\n\nPRODUCING PLAN\n')
-    print(make_solution)
-    file.write(make_solution.to_string())
-    file.write('\n')
\ No newline at end of file
+def report(model, data, out):
+    Mines, Years = data["Mines"], data["Years"]
+    out.line(f"Profit of £{model.objVal:.2f}", f"Profit of \033[92m£{model.objVal:.2f}\033[0m")
+    extracted = pd.DataFrame(model._vars["extract"].X, index=Mines, columns=Years)
+    working = pd.DataFrame(model._vars["used"].X > 0.5, index=Mines, columns=Years)  # binary, threshold at 0.5 for robustness
+    out.table("WORKING MINES PLAN", working.apply(lambda col: ", ".join(col.index[col]) or "None")
+              .rename("Mines").rename_axis("Year"))
+    out.table("EXTRACTION PLAN", extracted.T.astype(int))
+    out.table("PRODUCING PLAN", pd.Series(model._vars["make"].X, index=Years).astype(int).rename("Tons"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mining")
+    parser.add_argument("--data", default="data.json")
+    export.add_arguments(parser, "Solution.txt")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics = instrument.Instrument(args.metrics, args.metrics_format, run="12.7")
+
+    metrics.mark("load")
+    data = load_data(args.data)
+    metrics.mark("build")
+    model = build(data)
+    solve(model, metrics=metrics)
+    metrics.mark("report")
+    with export.SolutionWriter(args.output, args.format, args.echo) as out:
+        report(model, data, out)
+    metrics.close()
+
+    print(f"\nResults saved to {args.output} ✅")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Construction heuristic and local search for Mining, used as a MIP start.
+
+A plan is the boolean ``used[mine, year]`` matrix. Everything else follows from it: each year's
+extraction is the most ore its mines can blend to exactly the required quality (a greedy fill,
+see ``blend``), and each mine stays active, paying royalties, up to the last year it is used.
+
+    construct   per year, picks the best set of at most 3 mines among the candidates with the
+                highest discounted margin per royalty on each side of the required quality
+    improve     first-improvement local search over swap, drop and add moves in one year
+    warm_start  runs both and writes the plan into a built model's Start attributes
+"""
+import itertools as it
+import time
+
+import numpy as np
+
+MAX_MINES = 3
+
+
+class Instance:
+    def __init__(self, data):
+        Mines, Years = data["Mines"], data["Years"]
+        self.royalty = np.array([data["Royalties"][m] for m in Mines])
+        self.limit = np.array([data["Ore_Limit"][m] for m in Mines])
+        self.quality = np.array([data["Ore_Quality"][m] for m in Mines])
+        self.required = np.array([data["Required_Quality"][t] for t in Years])
+        self.discount = (1 + data["Discount_Rate"]) ** -np.arange(len(Years))
+        self.price = data["Blend_Price"]
+        self.M, self.T = len(Mines), len(Years)
+        # Royalty paid by a mine that stays active up to year t (index 0 means never opened)
+        self.royalty_to = np.concatenate([[0.0], np.cumsum(self.discount)])
+        # Discounted margin per royalty; the discount factor cancels, so it is the same every year
+        self.ratio = (self.price * self.limit - self.royalty) / self.royalty
+
+    def blend(self, mines, t):
+        """Extraction per mine (same order) maximizing tons at exactly the required quality."""
+        deviation = [self.quality[m] - self.required[t] for m in mines]
+        tons = [0.0] * len(mines)
+        surplus = sum(d * self.limit[m] for m, d in zip(mines, deviation) if d > 0)
+        deficit = -sum(d * self.limit[m] for m, d in zip(mines, deviation) if d < 0)
+        # The side with less quality deviation runs at full capacity, the other side absorbs it
+        full_side = 1 if surplus <= deficit else -1
+        budget = min(surplus, deficit)
+        for k in sorted(range(len(mines)), key=lambda k: abs(deviation[k])):
+            m, d = mines[k], deviation[k]
+            if d == 0 or d * full_side > 0:
+                tons[k] = self.limit[m]
+            elif budget > 0:
+                tons[k] = min(self.limit[m], budget / abs(d))
+                budget -= tons[k] * abs(d)
+        return tons
+
+    def revenue(self, mines, t):
+        return self.discount[t] * self.price * sum(self.blend(mines, t)) if mines else 0.0
+
+    def last_use(self, used):
+        """1 + last year each mine is used (0 if never)."""
+        return np.where(used.any(axis=1), self.T - np.argmax(used[:, ::-1], axis=1), 0)
+
+    def objective(self, used):
+        revenue = sum(self.revenue(np.flatnonzero(used[:, t]).tolist(), t) for t in range(self.T))
+        return revenue - self.royalty @ self.royalty_to[self.last_use(used)]
+
+    def candidates(self, t, pool):
+        """The ``pool`` best mines by margin per royalty above, and below, the required quality."""
+        order = np.argsort(-self.ratio)
+        above = order[self.quality[order] >= self.required[t]][:pool]
+        below = order[self.quality[order] < self.required[t]][:pool]
+        return np.concatenate([above, below]).tolist()
+
+
+def construct(data, pool=5):
+    """Greedy plan, year by year, charging each set the royalties it adds to the open mines."""
+    inst = Instance(data)
+    used = np.zeros((inst.M, inst.T), dtype=bool)
+    last = np.zeros(inst.M, dtype=int)
+    for t in range(inst.T):
+        best, best_gain = (), 0.0
+        for size in range(1, MAX_MINES + 1):
+            for mines in it.combinations(inst.candidates(t, pool), size):
+                royalties = sum(inst.royalty[m] * (inst.royalty_to[t + 1] - inst.royalty_to[last[m]]) for m in mines)
+                gain = inst.revenue(list(mines), t) - royalties
+                if gain > best_gain:
+                    best, best_gain = mines, gain
+        for m in best:
+            used[m, t] = True
+            last[m] = t + 1
+    return used
+
+
+def improve(data, used, pool=20, time_limit=5.0):
+    """First-improvement local search: swap a used mine for another, drop one, or add one in a single year."""
+    inst = Instance(data)
+    used = used.copy()
+    last = inst.last_use(used)
+    deadline = time.perf_counter() + time_limit
+
+    def royalty_change(m, t, use):
+        years = np.flatnonzero(used[m])
+        new_last = max(last[m], t + 1) if use else (years[years != t].max() + 1 if len(years) > 1 else 0)
+        return inst.royalty[m] * (inst.royalty_to[new_last] - inst.royalty_to[last[m]]), new_last
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for t in range(inst.T):
+            current = np.flatnonzero(used[:, t]).tolist()
+            revenue = inst.revenue(current, t)
+            others = [m for m in inst.candidates(t, pool) if m not in current]
+            moves = [(u, c) for u in current for c in others + [None]]
+            if len(current) < MAX_MINES:
+                moves += [(None, c) for c in others]
+            for out, into in moves:
+                mines = [m for m in current if m != out] + ([into] if into is not None else [])
+                delta, lasts = inst.revenue(mines, t) - revenue, {}
+                for m, use in ((out, False), (into, True)):
+                    if m is not None:
+                        cost, lasts[m] = royalty_change(m, t, use)
+                        delta -= cost
+                if delta > 1e-6:
+                    for m, use in ((out, False), (into, True)):
+                        if m is not None:
+                            used[m, t] = use
+                            last[m] = lasts[m]
+                    improved = True
+                    break
+    return used
+
+
+def solution(data, used):
+    """Objective and full variable values (extract, make, used, active) of a plan."""
+    inst = Instance(data)
+    extract = np.zeros((inst.M, inst.T))
+    for t in range(inst.T):
+        mines = np.flatnonzero(used[:, t]).tolist()
+        if mines:
+            extract[mines, t] = inst.blend(mines, t)
+    active = np.arange(inst.T)[None, :] < inst.last_use(used)[:, None]
+    return inst.objective(used), {"extract": extract, "make": extract.sum(axis=0), "used": used.astype(float),
+                                  "active": active.astype(float)}
+
+
+def warm_start(model, data, pool=5, time_limit=5.0):
+    """Set the heuristic plan as the MIP start of a model built by gurobi.build; returns its objective."""
+    used = improve(data, construct(data, pool), time_limit=time_limit)
+    objective, values = solution(data, used)
+    for name, value in values.items():
+        model._vars[name].Start = value
+    return objective
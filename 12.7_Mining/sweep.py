@@ -0,0 +1,134 @@
+import argparse
+import csv
+import itertools as it
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import gurobipy as gp
+import numpy as np
+
+from gurobi import build, load_data
+
+# Per-worker state: the model is built once and only its coefficients change between scenarios
+_worker = {}
+
+
+def build_model(data, threads=1):
+    """gurobi.build in a quiet environment, with handles to the blocks a scenario changes."""
+    env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+    model = build(data, env)
+    handles = {name: model._vars[name] for name in ("make", "active", "used")}
+    handles["quality"] = model._rows["quality"]
+    handles["make_vars"] = handles["make"].tolist()
+    handles["royalties"] = np.array([data["Royalties"][m] for m in data["Mines"]])
+    return model, handles
+
+
+def apply_scenario(model, handles, data, scenario):
+    """Set objective coefficients and quality requirements in place for one scenario."""
+    discount = (1 + scenario["discount_rate"]) ** -np.arange(len(data["Years"]))
+    handles["make"].Obj = scenario["blend_price"] * discount
+    handles["active"].Obj = -np.outer(handles["royalties"], discount)
+    # Required quality multiplies make[t] in the quality row, so it is a coefficient change
+    for row, make, quality in zip(handles["quality"], handles["make_vars"], scenario["required_quality"]):
+        model.chgCoeff(row, make, -quality)
+
+
+def _init_worker(data, threads):
+    model, handles = build_model(data, threads)
+    _worker.update(data=data, model=model, handles=handles)
+
+
+def _solve(scenario):
+    data, model, handles = _worker["data"], _worker["model"], _worker["handles"]
+    apply_scenario(model, handles, data, scenario)
+    model.optimize()
+    row = {**{k: v for k, v in scenario.items() if k != "required_quality"}, "status": model.Status,
+           "runtime": model.Runtime, "objective": model.ObjVal if model.SolCount else float("nan")}
+    make = handles["make"].X if model.SolCount else np.full(len(data["Years"]), np.nan)
+    used = handles["used"].X > 0.5 if model.SolCount else np.zeros((len(data["Mines"]), len(data["Years"])), bool)
+    for t, year in enumerate(data["Years"]):
+        row[f"make_{year}"] = make[t]
+        row[f"mines_{year}"] = ",".join(m for m, on in zip(data["Mines"], used[:, t]) if on)
+    return row
+
+
+def scenario_grid(data, prices, discount_rates, quality_shifts):
+    base_quality = [data["Required_Quality"][t] for t in data["Years"]]
+    for i, (price, rate, shift) in enumerate(it.product(prices, discount_rates, quality_shifts)):
+        yield {"scenario": i, "blend_price": price, "discount_rate": rate, "quality_shift": shift,
+               "required_quality": [q + shift for q in base_quality]}
+
+
+class ResultWriter:
+    """Append result batches to a Parquet file (pyarrow), or to CSV for a .csv path or when pyarrow is missing."""
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.parquet = path.endswith(".parquet")
+        if self.parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                self.path = str(Path(path).with_suffix(".csv"))
+                self.parquet = False
+                warnings.warn(f"pyarrow is not installed, writing {self.path} instead of {path}")
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pylist(rows)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+        else:
+            if self.writer is None:
+                self.file = open(self.path, "w", newline="")
+                self.writer = csv.DictWriter(self.file, fieldnames=list(rows[0]))
+                self.writer.writeheader()
+            self.writer.writerows(rows)
+
+    def close(self):
+        if self.writer is not None:
+            (self.writer if self.parquet else self.file).close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel price / discount-rate / quality sweep for the Mining model")
+    parser.add_argument("--data", default="data.json")
+    parser.add_argument("--prices", type=float, nargs="*", default=[8, 9, 10, 11, 12])
+    parser.add_argument("--discount-rates", type=float, nargs="*", default=[0.05, 0.08, 0.10, 0.12])
+    parser.add_argument("--quality-shifts", type=float, nargs="*", default=[-0.1, -0.05, 0.0, 0.05, 0.1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threads", type=int, default=1, help="solver threads per worker")
+    parser.add_argument("--batch", type=int, default=256, help="rows buffered before each write")
+    parser.add_argument("--output", default="sweep_results.parquet", help=".parquet or .csv")
+    args = parser.parse_args()
+
+    data = load_data(args.data)
+    scenarios = list(scenario_grid(data, args.prices, args.discount_rates, args.quality_shifts))
+
+    writer = ResultWriter(args.output)
+    start = time.perf_counter()
+    buffer = []
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(data, args.threads)) as pool:
+        chunksize = max(1, len(scenarios) // (4 * args.workers))
+        for row in pool.map(_solve, scenarios, chunksize=chunksize):
+            buffer.append(row)
+            if len(buffer) >= args.batch:
+                writer.write(buffer)
+                buffer = []
+    writer.write(buffer)
+    writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Solved {len(scenarios)} scenarios in {elapsed:.2f}s "
+          f"({len(scenarios) / elapsed:.1f} scenarios/s on {args.workers} workers)")
+    print(f"Results saved to {writer.path} ✅")
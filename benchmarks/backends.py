@@ -0,0 +1,62 @@
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.backend import available_backends  # noqa: E402
+from common.chapters import MODELS, chapter_dir, load_data, load_module  # noqa: E402
+
+
+# Objective value on the first line of a committed solution file
+def reference_objective(key):
+    text = (chapter_dir(key) / MODELS[key]["solution"]).read_bytes().decode("utf-8", errors="replace")
+    match = re.search(r"-?\d[\d,]*\.\d+", text.splitlines()[0])
+    return float(match.group().replace(",", ""))
+
+
+def run(key, backend, repeat=1):
+    data = load_data(key)
+    formulation = load_module(key, "formulation")
+    start = time.perf_counter()
+    model = formulation.build(data, **MODELS[key]["options"])
+    build_time = time.perf_counter() - start
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = model.solve(backend)
+        times.append(time.perf_counter() - start)
+    return result, build_time, min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare backends against the committed solution files")
+    parser.add_argument("--models", nargs="*", default=list(MODELS))
+    parser.add_argument("--backends", nargs="*", default=available_backends())
+    parser.add_argument("--repeat", type=int, default=3, help="solves per backend, the fastest is reported")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="relative objective tolerance")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'model':<16} {'backend':<8} {'status':<10} {'objective':>18} {'reference':>18} {'match':>6} "
+          f"{'build (s)':>10} {'solve (s)':>10}")
+    for key in args.models:
+        reference = reference_objective(key)
+        for backend in args.backends:
+            result, build_time, solve_time = run(key, backend, args.repeat)
+            match = abs(result.objective - reference) <= args.tolerance * max(1.0, abs(reference))
+            rows.append({"model": key, "backend": backend, "status": result.status, "objective": result.objective,
+                         "reference": reference, "match": bool(match), "build_seconds": build_time,
+                         "solve_seconds": solve_time})
+            print(f"{key:<16} {backend:<8} {result.status:<10} {result.objective:>18.2f} {reference:>18.2f} "
+                  f"{'yes' if match else 'NO':>6} {build_time:>10.4f} {solve_time:>10.4f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(rows, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
+    if not all(row["match"] for row in rows):
+        sys.exit(1)
@@ -0,0 +1,123 @@
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from common.binary import convert, load  # noqa: E402
+from common.chapters import MODELS, load_module  # noqa: E402
+
+# Generated instances with about a million numeric coefficients each
+SIZES = {
+    "12.1": {"oils": 2000, "months": 520},
+    "12.3": {"products": 5000, "machines": 200, "months": 24},
+    "12.4": {"machines": 200, "months": 24, "products": 5000},
+    "12.7": {"mines": 250000, "years": 4},
+}
+
+
+def parse_size(text):
+    return {axis: int(value) for axis, value in (item.split("=") for item in text.split(","))}
+
+
+def touch(data):
+    """Sum every number once, so lazily mapped arrays are actually read."""
+    import numpy as np
+
+    if isinstance(data, dict):
+        return sum(touch(value) for value in data.values())
+    if hasattr(data, "array"):
+        return float(np.sum(data.array))
+    if isinstance(data, np.ndarray):
+        return float(np.sum(data))
+    if isinstance(data, list):
+        return sum(touch(value) for value in data)
+    return data if isinstance(data, (int, float)) else 0
+
+
+def rss_mb():
+    """Current resident set size (Linux), falling back to the peak elsewhere."""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(fmt, path):
+    """Load one instance in this process (called in a fresh child process)."""
+    before = rss_mb()
+    start = time.perf_counter()
+    if fmt == "json":
+        with open(path, "r") as file:
+            data = json.load(file)
+    else:
+        data = load(path)
+    loaded = time.perf_counter()
+    load_rss = rss_mb()
+    touch(data)
+    touched = time.perf_counter()
+    return {"format": fmt, "load": loaded - start, "touch": touched - loaded,
+            "load_rss_mb": load_rss - before, "touch_rss_mb": rss_mb() - before}
+
+
+def run_child(fmt, path):
+    completed = subprocess.run([sys.executable, __file__, "--child", fmt, str(path)], capture_output=True, text=True,
+                               check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def disk_mb(path):
+    files = path.iterdir() if path.is_dir() else [path]
+    return sum(file.stat().st_size for file in files) / 2 ** 20
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load time and RSS of data.json against the memory-mapped binary format")
+    parser.add_argument("--models", nargs="*", default=list(SIZES), choices=list(MODELS))
+    parser.add_argument("--size", action="append", default=[],
+                        help="MODEL:axis=value,... (e.g. 12.3:products=1000,machines=100,months=12)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    parser.add_argument("--child", nargs=2, metavar=("FORMAT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        sys.exit(0)
+
+    plan = [(key, SIZES[key]) for key in args.models if key in SIZES]
+    if args.size:
+        plan = [(text.split(":", 1)[0], parse_size(text.split(":", 1)[1])) for text in args.size]
+
+    results = []
+    print(f"{'model':<8} {'size':<36} {'format':<7} {'disk MB':>8} {'load (s)':>9} {'touch (s)':>9} "
+          f"{'load RSS MB':>11} {'touch RSS MB':>12}")
+    for key, size in plan:
+        data = load_module(key, "generate").generate(**{f"n_{axis}": value for axis, value in size.items()},
+                                                      seed=args.seed)
+        workdir = Path(tempfile.mkdtemp())
+        paths = {"json": workdir / "data.json", "binary": workdir / "data.npd"}
+        with open(paths["json"], "w") as file:
+            json.dump(data, file)
+        convert(data, paths["binary"])
+        del data
+
+        label = ",".join(f"{axis}={value}" for axis, value in size.items())
+        for fmt, path in paths.items():
+            row = {"model": key, "size": size, "disk_mb": disk_mb(path), **run_child(fmt, path)}
+            results.append(row)
+            print(f"{key:<8} {label:<36} {fmt:<7} {row['disk_mb']:>8.1f} {row['load']:>9.3f} {row['touch']:>9.3f} "
+                  f"{row['load_rss_mb']:>11.1f} {row['touch_rss_mb']:>12.1f}")
+        shutil.rmtree(workdir)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
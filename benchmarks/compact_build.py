@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from common.chapters import MODELS, load_module  # noqa: E402
+
+# Generated instances with a few hundred thousand to a million variables on the modelling layer
+SIZES = {
+    "12.1": {"oils": 1000, "months": 200},
+    "12.3": {"products": 5000, "machines": 20, "months": 24},
+    "12.4": {"machines": 20, "months": 24, "products": 5000},
+    "12.5-cost": {"years": 20000},
+    "12.7": {"mines": 5000, "years": 50},
+}
+MODES = {"named": "1", "compact": "0"}
+
+
+def parse_size(text):
+    return {axis: int(value) for axis, value in (item.split("=") for item in text.split(","))}
+
+
+def rss_mb():
+    """Current resident set size (Linux), falling back to the peak elsewhere."""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(model_key, path):
+    """Build one instance in this process, in the mode set by MODEL_NAMES (called in a fresh child process)."""
+    formulation = load_module(model_key, "formulation")
+    with open(path, "r") as file:
+        data = json.load(file)
+    before = rss_mb()
+    start = time.perf_counter()
+    model = formulation.build(data, **MODELS[model_key]["options"])
+    built = time.perf_counter()
+    build_rss = rss_mb()
+    matrix = model.to_matrix()
+    compiled = time.perf_counter()
+    names = model.var_names
+    named = time.perf_counter()
+    return {"vars": model.num_vars, "constrs": model.num_constrs, "nonzeros": int(matrix["A"].nnz),
+            "build": built - start, "compile": compiled - built, "names": named - compiled,
+            "build_rss_mb": build_rss - before, "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "first_name": names[0]}
+
+
+def run_child(model_key, path, mode):
+    completed = subprocess.run([sys.executable, __file__, "--child", model_key, str(path)], capture_output=True,
+                               text=True, check=True, env={**os.environ, "MODEL_NAMES": MODES[mode]})
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build time and memory of named against compact (MODEL_NAMES=0) models")
+    parser.add_argument("--models", nargs="*", default=list(SIZES), choices=list(MODELS))
+    parser.add_argument("--size", action="append", default=[],
+                        help="MODEL:axis=value,... (e.g. 12.7:mines=1000,years=20)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    parser.add_argument("--child", nargs=2, metavar=("MODEL", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        sys.exit(0)
+
+    plan = [(key, SIZES[key]) for key in args.models if key in SIZES]
+    if args.size:
+        plan = [(text.split(":", 1)[0], parse_size(text.split(":", 1)[1])) for text in args.size]
+
+    results = []
+    print(f"{'model':<10} {'size':<34} {'mode':<8} {'vars':>9} {'build (s)':>9} {'compile (s)':>11} "
+          f"{'names (s)':>9} {'build RSS MB':>12} {'peak RSS MB':>11}")
+    for key, size in plan:
+        workdir = Path(tempfile.mkdtemp())
+        path = workdir / "data.json"
+        with open(path, "w") as file:
+            json.dump(load_module(key, "generate").generate(**{f"n_{axis}": value for axis, value in size.items()},
+                                                            seed=args.seed), file)
+        label = ",".join(f"{axis}={value}" for axis, value in size.items())
+        for mode in MODES:
+            row = {"model": key, "size": size, "mode": mode, **run_child(key, path, mode)}
+            results.append(row)
+            print(f"{key:<10} {label:<34} {mode:<8} {row['vars']:>9} {row['build']:>9.2f} {row['compile']:>11.2f} "
+                  f"{row['names']:>9.2f} {row['build_rss_mb']:>12.1f} {row['peak_rss_mb']:>11.1f}")
+        shutil.rmtree(workdir)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output} ✅")
@@ -0,0 +1,152 @@
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from common import export, instrument  # noqa: E402
+from common.chapters import MODELS, load_module  # noqa: E402
+
+# Default size ladders, passed as keyword arguments (n_<axis>) to each chapter's generate()
+LADDERS = {
+    "12.1": [{"oils": 5, "months": 6}, {"oils": 50, "months": 52}, {"oils": 200, "months": 104}],
+    "12.3": [{"products": 7, "machines": 5, "months": 6}, {"products": 50, "machines": 20, "months": 12},
+             {"products": 200, "machines": 40, "months": 24}],
+    "12.4": [{"machines": 5, "months": 6, "products": 7}, {"machines": 20, "months": 12, "products": 20},
+             {"machines": 40, "months": 24, "products": 50}],
+    "12.5-cost": [{"years": 3}, {"years": 20}, {"years": 100}],
+    "12.5-redundancy": [{"years": 3}, {"years": 20}, {"years": 100}],
+    "12.6": [{"crudes": 2}, {"crudes": 20}, {"crudes": 200}],
+    "12.7": [{"mines": 4, "years": 5}, {"mines": 50, "years": 10}, {"mines": 200, "years": 20}],
+}
+
+
+def parse_size(text):
+    return {axis: int(value) for axis, value in (item.split("=") for item in text.split(","))}
+
+
+def write_report(built, result, output, fmt):
+    """Export the solution as the chapter scripts do: one table per variable group, through SolutionWriter."""
+    import pandas as pd
+
+    with export.SolutionWriter(output, fmt) as out:
+        out.line(f"Objective: {result.objective:.2f}")
+        for name, group in built.variables.items():
+            out.table(name, pd.Series(result.values_of(group), name=name))
+
+
+def measure(model_key, size, time_limit, seed, fmt="txt"):
+    """Run one instance in this process and return its record (called in a fresh child process)."""
+    import gurobipy as gp
+    import numpy as np
+    from common.backend import Result, gurobi_status, to_gurobi
+
+    generate = load_module(model_key, "generate").generate
+    formulation = load_module(model_key, "formulation")
+    record = {"model": model_key, "size": size}
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+        json.dump(generate(**{f"n_{axis}": value for axis, value in size.items()}, seed=seed), file)
+        path = file.name
+
+    timings = {}
+    start = time.perf_counter()
+    with open(path, "r") as file:
+        data = json.load(file)
+    timings["parse"] = time.perf_counter() - start
+    Path(path).unlink()
+
+    with gp.Env(params={"OutputFlag": 0, "TimeLimit": time_limit}) as env:
+        start = time.perf_counter()
+        built = formulation.build(data, **MODELS[model_key]["options"])
+        model, _ = to_gurobi(built.to_matrix(), env)
+        model.update()
+        timings["build"] = time.perf_counter() - start
+        record.update(vars=model.NumVars, constrs=model.NumConstrs, nonzeros=model.NumNZs, names=built.names)
+
+        try:
+            # One optimize, split into presolve and solve by the Instrument callback
+            metrics = instrument.Instrument()
+            metrics.optimize(model)
+            timings["presolve"], timings["solve"] = metrics.phases["presolve"], metrics.phases["solve"]
+            record.update(status=gurobi_status(model), objective=model.ObjVal if model.SolCount else None)
+
+            if model.SolCount:
+                with tempfile.TemporaryDirectory() as folder:
+                    start = time.perf_counter()
+                    result = Result("gurobi", record["status"], model.ObjVal,
+                                    np.array(model.getAttr("X", model.getVars())))
+                    write_report(built, result, Path(folder) / f"solution.{fmt}", fmt)
+                    timings["report"] = time.perf_counter() - start
+                    record["report_format"] = fmt
+        except gp.GurobiError as error:
+            record.update(status="error", error=str(error))
+
+    record["seconds"] = timings
+    record["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return record
+
+
+def run_child(model_key, size, time_limit, seed, fmt):
+    command = [sys.executable, __file__, "--child", model_key, json.dumps(size),
+               "--time-limit", str(time_limit), "--seed", str(seed), "--report-format", fmt]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"model": model_key, "size": size, "status": "crashed", "error": completed.stderr.strip()[-2000:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark: parse/build/presolve/solve/report time and peak RSS")
+    parser.add_argument("--models", nargs="*", default=list(LADDERS), choices=list(MODELS))
+    parser.add_argument("--size", action="append", default=[],
+                        help="MODEL:axis=value,... (e.g. 12.7:mines=100,years=20); overrides the default ladder")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="solver time limit per instance")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-format", choices=export.FORMATS, default="txt",
+                        help="format the solution is exported in for the report phase")
+    parser.add_argument("--output", default="scaling_results.jsonl", help="JSON Lines file the records are appended to")
+    parser.add_argument("--child", nargs=2, metavar=("MODEL", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], json.loads(args.child[1]), args.time_limit, args.seed,
+                                 args.report_format)))
+        sys.exit(0)
+
+    plan = [(key, size) for key in args.models for size in LADDERS[key]]
+    if args.size:
+        plan = [(text.split(":", 1)[0], parse_size(text.split(":", 1)[1])) for text in args.size]
+
+    meta = {"commit": git_commit(), "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "machine": platform.machine()}
+    print(f"{'model':<16} {'size':<34} {'vars':>9} {'parse':>8} {'build':>8} {'presolve':>9} {'solve':>8} "
+          f"{'report':>8} {'RSS MB':>8} status")
+    with open(args.output, "a") as out:
+        for key, size in plan:
+            record = {**meta, **run_child(key, size, args.time_limit, args.seed, args.report_format)}
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            t = record.get("seconds", {})
+            cells = " ".join(f"{t[phase]:>{width}.3f}" if phase in t else f"{'-':>{width}}"
+                             for phase, width in [("parse", 8), ("build", 8), ("presolve", 9), ("solve", 8),
+                                                  ("report", 8)])
+            label = ",".join(f"{axis}={value}" for axis, value in size.items())
+            print(f"{key:<16} {label:<34} {record.get('vars', '-'):>9} {cells} "
+                  f"{record.get('peak_rss_mb', 0):>8.1f} {record['status']}")
+    print(f"\nResults appended to {args.output} ✅")
@@ -0,0 +1,579 @@
+"""Thin solver-agnostic modelling layer.
+
+Formulations are written against ``Model``/``Var``/``LinExpr`` and compiled to one sparse
+matrix (c, A, sense, rhs, bounds, integrality) that each backend passes to its solver in bulk.
+
+Formulations that are built from sparse blocks rather than row by row use ``add_block`` (a
+``VarIndex`` of contiguous columns, like ``addMVar``) and ``add_mconstr`` (the rows of a sparse
+matrix, like ``addMConstr``). ``to_gurobi_model`` compiles any model into a named gurobipy model
+for the chapter scripts, so each chapter has one formulation for every backend.
+
+``Model(names=False)`` (or ``MODEL_NAMES=0`` in the environment) is a low-memory build mode for
+large instances: no variable or row names are kept, ``add_vars`` returns a ``VarIndex`` that maps
+keys to contiguous column offsets, and rows go straight into flat CSR arrays. Names are only
+rebuilt when ``var_names``/``constr_names`` are read, for reports.
+"""
+import array
+import itertools as it
+import math
+import os
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+import scipy.sparse as sp
+
+CONTINUOUS, BINARY, INTEGER = "C", "B", "I"
+MINIMIZE, MAXIMIZE = 1, -1
+LESS_EQUAL, GREATER_EQUAL, EQUAL = "<", ">", "="
+INF = float("inf")
+
+OPTIMAL, INFEASIBLE, UNBOUNDED, TIME_LIMIT, ERROR = "optimal", "infeasible", "unbounded", "time_limit", "error"
+
+
+class LinExpr:
+    __slots__ = ("terms", "constant")
+
+    def __init__(self, terms=None, constant=0.0):
+        self.terms = terms if terms is not None else {}
+        self.constant = constant
+
+    def _iadd(self, other, scale=1.0):
+        if isinstance(other, Var):
+            self.terms[other.index] = self.terms.get(other.index, 0.0) + scale
+        elif isinstance(other, LinExpr):
+            for index, coef in other.terms.items():
+                self.terms[index] = self.terms.get(index, 0.0) + scale * coef
+            self.constant += scale * other.constant
+        else:
+            self.constant += scale * other
+        return self
+
+    def copy(self):
+        return LinExpr(dict(self.terms), self.constant)
+
+    def __add__(self, other):
+        return self.copy()._iadd(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.copy()._iadd(other, -1.0)
+
+    def __rsub__(self, other):
+        return (-self)._iadd(other)
+
+    def __mul__(self, scalar):
+        return LinExpr({index: scalar * coef for index, coef in self.terms.items()}, scalar * self.constant)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __le__(self, other):
+        return Constraint(self - other, LESS_EQUAL)
+
+    def __ge__(self, other):
+        return Constraint(self - other, GREATER_EQUAL)
+
+    def __eq__(self, other):
+        return Constraint(self - other, EQUAL)
+
+    __hash__ = None
+
+
+class Var:
+    __slots__ = ("index", "name")
+
+    def __init__(self, index, name):
+        self.index = index
+        self.name = name
+
+    def _expr(self):
+        return LinExpr({self.index: 1.0})
+
+    def __add__(self, other):
+        return self._expr()._iadd(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._expr()._iadd(other, -1.0)
+
+    def __rsub__(self, other):
+        return LinExpr({self.index: -1.0})._iadd(other)
+
+    def __mul__(self, scalar):
+        return LinExpr({self.index: float(scalar)})
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return LinExpr({self.index: -1.0})
+
+    def __le__(self, other):
+        return Constraint(self - other, LESS_EQUAL)
+
+    def __ge__(self, other):
+        return Constraint(self - other, GREATER_EQUAL)
+
+    def __eq__(self, other):
+        return Constraint(self - other, EQUAL)
+
+    def __hash__(self):
+        return self.index
+
+    def __repr__(self):
+        return f"<Var {self.name}>"
+
+
+class VarIndex(Mapping):
+    """The variables of one ``add_vars`` call in compact mode, at columns ``start .. start + size - 1``.
+
+    Keys are the cartesian product of the axes in row-major order. Each axis keeps one label ->
+    position table, so a key is found by arithmetic on positions in a flat list of nameless Vars,
+    instead of through a key tuple, a dict entry and a name per variable. Keys can be set to
+    constants (such as initial stocks), which are then returned in place of their column or, for
+    keys outside the axes, added after them, as with a dict.
+    """
+
+    def __init__(self, name, start, axes, block=False):
+        self.name = name
+        self.start = start
+        self.block = block  # added by add_block, so gurobipy handles are one MVar
+        self.axes = [list(axis) for axis in axes]
+        self.positions = [{label: k for k, label in enumerate(axis)} for axis in self.axes]
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.strides = tuple(math.prod(self.shape[k + 1:]) for k in range(len(self.shape)))
+        self.size = math.prod(self.shape)
+        self.vars = [Var(j, None) for j in range(start, start + self.size)]
+        self.fixed = {}
+        self.extra = {}  # fixed keys outside the axes
+
+    def position(self, key):
+        """Position of ``key`` in column order (its column is ``start + position``)."""
+        positions = self.positions
+        if len(positions) == 1:
+            return positions[0][key]
+        if len(positions) == 2:
+            return positions[0][key[0]] * self.strides[0] + positions[1][key[1]]
+        return sum(p[k] * stride for p, k, stride in zip(positions, key, self.strides))
+
+    def __getitem__(self, key):
+        try:
+            return self.vars[self.position(key)]
+        except (KeyError, TypeError, IndexError, ValueError):
+            if key in self.extra:
+                return self.extra[key]
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.vars[self.position(key)] = value
+        else:
+            self.extra[key] = value
+        self.fixed[key] = value
+
+    def __contains__(self, key):
+        try:
+            self.position(key)
+        except (KeyError, TypeError, IndexError, ValueError):
+            return key in self.extra
+        return True
+
+    def __iter__(self):
+        keys = iter(self.axes[0]) if len(self.axes) == 1 else it.product(*self.axes)
+        return it.chain(keys, self.extra)
+
+    def __len__(self):
+        return self.size + len(self.extra)
+
+    def labels(self):
+        """Names in column order, as ``add_vars`` gives them in named mode."""
+        return [f"{self.name}[{','.join(str(k) for k in key)}]" for key in it.product(*self.axes)]
+
+
+@dataclass
+class Constraint:
+    expr: LinExpr
+    sense: str
+
+
+def quicksum(items):
+    total = LinExpr()
+    for item in items:
+        total._iadd(item)
+    return total
+
+
+@dataclass
+class Result:
+    backend: str
+    status: str
+    objective: float = float("nan")
+    values: np.ndarray = None
+    runtime: float = 0.0
+    info: dict = field(default_factory=dict)
+
+    def value(self, var):
+        return self.values[var.index]
+
+    def values_of(self, variables):
+        if isinstance(variables, VarIndex):
+            values = dict(zip(variables, self.values[variables.start:variables.start + variables.size].tolist()))
+            values.update(variables.fixed)
+            return values
+        # Keys set to constants (the initial workforce of 12.5) keep their value
+        return {key: self.values[var.index] if isinstance(var, Var) else var for key, var in variables.items()}
+
+
+def default_names():
+    """Whether models keep names unless told otherwise (``MODEL_NAMES=0`` turns them off)."""
+    return os.environ.get("MODEL_NAMES", "1") != "0"
+
+
+class Model:
+    def __init__(self, name="", names=None):
+        self.name = name
+        self.names = default_names() if names is None else names
+        self.lb, self.ub, self.vtype, self._var_names = [], [], [], []
+        self.sense, self.rhs, self._constr_names = [], [], []
+        if self.names:
+            self.row_terms = []
+        else:
+            self.indptr, self.indices, self.coefs = array.array("q", [0]), array.array("q"), array.array("d")
+        self.groups = []
+        self.objective = LinExpr()
+        self.model_sense = MINIMIZE
+        self.variables = {}
+        self.constraints = {}
+
+    @property
+    def num_vars(self):
+        return len(self.lb)
+
+    @property
+    def num_constrs(self):
+        return len(self.rhs)
+
+    @property
+    def var_names(self):
+        """Column names; in compact mode rebuilt from the ``add_vars`` groups, other columns are C<column>."""
+        if self.names:
+            return self._var_names
+        names = [f"C{j}" for j in range(self.num_vars)]
+        for group in self.groups:
+            names[group.start:group.start + group.size] = group.labels()
+        return names
+
+    @property
+    def constr_names(self):
+        """Row names; rows are R<row> in compact mode."""
+        return self._constr_names if self.names else [f"R{i}" for i in range(self.num_constrs)]
+
+    def add_var(self, lb=0.0, ub=INF, vtype=CONTINUOUS, name=""):
+        var = Var(len(self.lb), name if self.names else None)
+        if vtype == BINARY:
+            lb, ub = max(lb, 0.0), min(ub, 1.0)
+        self.lb.append(lb)
+        self.ub.append(ub)
+        self.vtype.append(vtype)
+        if self.names:
+            self._var_names.append(name)
+        return var
+
+    def add_vars(self, *indices, lb=0.0, ub=INF, vtype=CONTINUOUS, name=""):
+        """Add one variable per element of the cartesian product of ``indices`` (like ``Model.addVars``).
+
+        Returns a dict of Vars, or a ``VarIndex`` in compact mode.
+        """
+        if not self.names:
+            group = VarIndex(name, self.num_vars, indices)
+            if vtype == BINARY:
+                lb, ub = max(lb, 0.0), min(ub, 1.0)
+            self.lb.extend(it.repeat(lb, group.size))
+            self.ub.extend(it.repeat(ub, group.size))
+            self.vtype.extend(it.repeat(vtype, group.size))
+            self.groups.append(group)
+            if name:
+                self.variables[name] = group
+            return group
+        variables = {}
+        for key in it.product(*indices):
+            label = f"{name}[{','.join(str(k) for k in key)}]"
+            variables[key[0] if len(key) == 1 else key] = self.add_var(lb, ub, vtype, label)
+        if name:
+            self.variables[name] = variables
+        return variables
+
+    def add_block(self, *indices, lb=0.0, ub=INF, vtype=CONTINUOUS, obj=None, name=""):
+        """Add the cartesian product of ``indices`` as one block of contiguous columns (like ``Model.addMVar``).
+
+        Returns a ``VarIndex`` in either naming mode, so rows can be built as sparse matrices over
+        its columns. ``lb``, ``ub`` and the objective coefficients ``obj`` are scalars or arrays of
+        the block's shape.
+        """
+        group = VarIndex(name, self.num_vars, indices, block=True)
+        lb = np.broadcast_to(np.asarray(lb, dtype=float), group.shape).ravel()
+        ub = np.broadcast_to(np.asarray(ub, dtype=float), group.shape).ravel()
+        if vtype == BINARY:
+            lb, ub = np.maximum(lb, 0.0), np.minimum(ub, 1.0)
+        self.lb.extend(lb.tolist())
+        self.ub.extend(ub.tolist())
+        self.vtype.extend(it.repeat(vtype, group.size))
+        if obj is not None:
+            coefs = np.broadcast_to(np.asarray(obj, dtype=float), group.shape).ravel()
+            self.objective.terms.update(zip(range(group.start, group.start + group.size), coefs.tolist()))
+        if self.names:
+            self._var_names.extend(group.labels())
+        self.groups.append(group)
+        if name:
+            self.variables[name] = group
+        return group
+
+    def set_bounds(self, var, lb=None, ub=None):
+        if lb is not None:
+            self.lb[var.index] = lb
+        if ub is not None:
+            self.ub[var.index] = ub
+
+    def add_constr(self, constr, name=""):
+        expr = constr.expr
+        if self.names:
+            self.row_terms.append(expr.terms)
+            self._constr_names.append(name)
+        else:
+            self.indices.extend(expr.terms.keys())
+            self.coefs.extend(expr.terms.values())
+            self.indptr.append(len(self.indices))
+        self.sense.append(constr.sense)
+        self.rhs.append(0.0 - expr.constant)
+        return len(self.rhs) - 1
+
+    def add_constrs(self, constrs, name=""):
+        rows = [self.add_constr(constr, f"{name}[{i}]" if name else "") for i, constr in enumerate(constrs)]
+        if name:
+            self.constraints[name] = rows
+        return rows
+
+    def add_mconstr(self, A, sense, rhs, name=""):
+        """Add one row per row of the sparse matrix ``A`` over the model's columns (like ``Model.addMConstr``).
+
+        ``A`` may also be given as (block, matrix) pairs, each matrix over the columns of one
+        ``add_block`` group. ``sense`` and ``rhs`` are scalars or one value per row. Returns the
+        range of the new rows, which is also kept in ``constraints[name]``.
+        """
+        if isinstance(A, (list, tuple)):
+            parts = [(group.start, sp.coo_matrix(part)) for group, part in A]
+            A = sp.csr_matrix((np.concatenate([part.data for _, part in parts]),
+                               (np.concatenate([part.row for _, part in parts]),
+                                np.concatenate([part.col + start for start, part in parts]))),
+                              shape=(parts[0][1].shape[0], self.num_vars))
+        A = sp.csr_matrix(A)
+        A.sum_duplicates()
+        A.eliminate_zeros()
+        n_rows, n_cols = A.shape
+        if n_cols > self.num_vars:
+            raise ValueError(f"the matrix has {n_cols} columns but the model only {self.num_vars}")
+        first = self.num_constrs
+        if self.names:
+            indices, coefs = A.indices.tolist(), A.data.tolist()
+            self.row_terms.extend(dict(zip(indices[a:b], coefs[a:b])) for a, b in zip(A.indptr[:-1], A.indptr[1:]))
+            self._constr_names.extend(f"{name}[{i}]" if name else "" for i in range(n_rows))
+        else:
+            self.indptr.frombytes((A.indptr[1:] + self.indptr[-1]).astype(np.int64).tobytes())
+            self.indices.frombytes(A.indices.astype(np.int64).tobytes())
+            self.coefs.frombytes(A.data.astype(float).tobytes())
+        self.sense.extend(np.broadcast_to(np.asarray(sense), n_rows).tolist())
+        self.rhs.extend(np.broadcast_to(np.asarray(rhs, dtype=float), n_rows).tolist())
+        rows = range(first, first + n_rows)
+        if name:
+            self.constraints[name] = rows
+        return rows
+
+    def set_objective(self, expr, sense=MINIMIZE):
+        self.objective = expr if isinstance(expr, LinExpr) else LinExpr()._iadd(expr)
+        self.model_sense = sense
+
+    def to_matrix(self):
+        """Compile the model to arrays: c, A (CSR), sense, rhs, lb, ub, vtype."""
+        c = np.zeros(self.num_vars)
+        if self.objective.terms:
+            index, coef = zip(*self.objective.terms.items())
+            c[list(index)] = coef
+        if self.names:
+            lengths = np.fromiter((len(terms) for terms in self.row_terms), dtype=np.int64, count=self.num_constrs)
+            indptr = np.concatenate([[0], np.cumsum(lengths)])
+            indices = np.fromiter((i for terms in self.row_terms for i in terms), dtype=np.int64, count=indptr[-1])
+            data = np.fromiter((v for terms in self.row_terms for v in terms.values()), dtype=float, count=indptr[-1])
+        else:
+            # Copied, so the arrays can still grow if rows are added after compiling
+            indptr, indices, data = (np.array(self.indptr, dtype=np.int64), np.array(self.indices, dtype=np.int64),
+                                     np.array(self.coefs, dtype=float))
+        A = sp.csr_matrix((data, indices, indptr), shape=(self.num_constrs, self.num_vars))
+        return {
+            "c": c, "constant": self.objective.constant, "model_sense": self.model_sense, "A": A,
+            "sense": np.array(self.sense), "rhs": np.array(self.rhs, dtype=float),
+            "lb": np.array(self.lb, dtype=float), "ub": np.array(self.ub, dtype=float), "vtype": np.array(self.vtype),
+        }
+
+    def solve(self, backend=None, time_limit=None, threads=None, verbose=False):
+        backend = backend or os.environ.get("MODEL_BACKEND", "gurobi")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {sorted(BACKENDS)}")
+        return BACKENDS[backend](self.to_matrix(), time_limit=time_limit, threads=threads, verbose=verbose)
+
+
+def _row_bounds(m):
+    lo = np.where(m["sense"] == LESS_EQUAL, -INF, m["rhs"])
+    hi = np.where(m["sense"] == GREATER_EQUAL, INF, m["rhs"])
+    return lo, hi
+
+
+def to_gurobi(m, env=None):
+    """Load the compiled arrays into a gurobipy model; returns the model and its MVar."""
+    import gurobipy as gp
+    from gurobipy import GRB
+
+    model = gp.Model(env=env)
+    x = model.addMVar(len(m["c"]), lb=m["lb"], ub=m["ub"], obj=m["c"], vtype=m["vtype"])
+    model.ObjCon = m["constant"]
+    model.ModelSense = GRB.MINIMIZE if m["model_sense"] == MINIMIZE else GRB.MAXIMIZE
+    model.addMConstr(m["A"], x, m["sense"], m["rhs"])
+    return model, x
+
+
+def to_gurobi_model(model, env=None):
+    """Compile a layer ``Model`` into a gurobipy model with its variable and row names.
+
+    ``_vars`` holds the gurobipy variables of each group: an MVar of the block's shape for
+    ``add_block`` groups, else a tupledict with the group's keys (keys set to constants keep them).
+    ``_rows`` holds the gurobipy rows of each named ``add_mconstr``/``add_constrs`` call (gurobipy
+    itself uses ``_constrs``).
+    """
+    import gurobipy as gp
+
+    gurobi_model, x = to_gurobi(model.to_matrix(), env)
+    gurobi_model.ModelName = model.name
+    gurobi_model.update()
+    columns, rows = gurobi_model.getVars(), gurobi_model.getConstrs()
+    gurobi_model.setAttr("VarName", columns, model.var_names)
+    if model.names:
+        gurobi_model.setAttr("ConstrName", rows, model.constr_names)
+    gurobi_model._vars = {}
+    for name, group in model.variables.items():
+        if isinstance(group, VarIndex) and group.block:
+            gurobi_model._vars[name] = x[group.start:group.start + group.size].reshape(group.shape)
+        else:
+            gurobi_model._vars[name] = gp.tupledict(
+                (key, columns[var.index] if isinstance(var, Var) else var) for key, var in group.items())
+    gurobi_model._rows = {name: [rows[i] for i in indices] for name, indices in model.constraints.items()}
+    gurobi_model.update()
+    return gurobi_model
+
+
+def gurobi_status(model):
+    from gurobipy import GRB
+    return {GRB.OPTIMAL: OPTIMAL, GRB.INFEASIBLE: INFEASIBLE, GRB.UNBOUNDED: UNBOUNDED,
+            GRB.TIME_LIMIT: TIME_LIMIT}.get(model.Status, ERROR)
+
+
+def optimize_gurobi(model, time_limit=None, threads=None, metrics=None):
+    """Optimize a built gurobipy model (the chapter ``gurobi.py`` scripts) and return a Result."""
+    if time_limit is not None:
+        model.Params.TimeLimit = time_limit
+    if threads is not None:
+        model.Params.Threads = threads
+    if metrics is not None:
+        metrics.optimize(model)
+    else:
+        model.optimize()
+    if model.SolCount > 0:
+        return Result("gurobi", gurobi_status(model), model.ObjVal, np.array(model.getAttr("X", model.getVars())),
+                      model.Runtime)
+    return Result("gurobi", gurobi_status(model), runtime=model.Runtime)
+
+
+def solve_gurobi(m, time_limit=None, threads=None, verbose=False):
+    import gurobipy as gp
+
+    start = time.perf_counter()
+    with gp.Env(params={"OutputFlag": int(verbose)}) as env:
+        model, x = to_gurobi(m, env)
+        with model:
+            if time_limit is not None:
+                model.Params.TimeLimit = time_limit
+            if threads is not None:
+                model.Params.Threads = threads
+            model.optimize()
+            if model.SolCount > 0:
+                return Result("gurobi", gurobi_status(model), model.ObjVal, x.X.copy(), time.perf_counter() - start)
+            return Result("gurobi", gurobi_status(model), runtime=time.perf_counter() - start)
+
+
+def solve_highs(m, time_limit=None, threads=None, verbose=False):
+    import highspy
+
+    start = time.perf_counter()
+    A = m["A"].tocsc()
+    lo, hi = _row_bounds(m)
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_ = A.shape[1], A.shape[0]
+    lp.col_cost_ = m["c"]
+    lp.col_lower_, lp.col_upper_ = m["lb"], m["ub"]
+    lp.row_lower_, lp.row_upper_ = lo, hi
+    lp.offset_ = m["constant"]
+    lp.sense_ = highspy.ObjSense.kMinimize if m["model_sense"] == MINIMIZE else highspy.ObjSense.kMaximize
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_, lp.a_matrix_.index_, lp.a_matrix_.value_ = A.indptr, A.indices, A.data
+    if np.any(m["vtype"] != CONTINUOUS):
+        lp.integrality_ = [highspy.HighsVarType.kContinuous if v == CONTINUOUS else highspy.HighsVarType.kInteger
+                           for v in m["vtype"]]
+
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", verbose)
+    if time_limit is not None:
+        highs.setOptionValue("time_limit", float(time_limit))
+    if threads is not None:
+        highs.setOptionValue("threads", int(threads))
+    highs.passModel(lp)
+    highs.run()
+    model_status = highs.getModelStatus()
+    status = {highspy.HighsModelStatus.kOptimal: OPTIMAL, highspy.HighsModelStatus.kInfeasible: INFEASIBLE,
+              highspy.HighsModelStatus.kUnbounded: UNBOUNDED,
+              highspy.HighsModelStatus.kTimeLimit: TIME_LIMIT}.get(model_status, ERROR)
+    solution = highs.getSolution()
+    if solution.value_valid:
+        return Result("highs", status, highs.getInfo().objective_function_value,
+                      np.array(solution.col_value), time.perf_counter() - start)
+    return Result("highs", status, runtime=time.perf_counter() - start)
+
+
+def solve_scipy(m, time_limit=None, threads=None, verbose=False):
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    start = time.perf_counter()
+    lo, hi = _row_bounds(m)
+    c = m["c"] * m["model_sense"]
+    options = {"disp": verbose}
+    if time_limit is not None:
+        options["time_limit"] = time_limit
+    res = milp(c, integrality=(m["vtype"] != CONTINUOUS).astype(int), bounds=Bounds(m["lb"], m["ub"]),
+               constraints=LinearConstraint(m["A"], lo, hi), options=options)
+    status = {0: OPTIMAL, 1: TIME_LIMIT, 2: INFEASIBLE, 3: UNBOUNDED}.get(res.status, ERROR)
+    if res.x is not None:
+        return Result("scipy", status, m["model_sense"] * res.fun + m["constant"], res.x,
+                      time.perf_counter() - start)
+    return Result("scipy", status, runtime=time.perf_counter() - start)
+
+
+BACKENDS = {"gurobi": solve_gurobi, "highs": solve_highs, "scipy": solve_scipy}
+BACKEND_MODULES = {"gurobi": "gurobipy", "highs": "highspy", "scipy": "scipy.optimize"}
+
+
+def available_backends():
+    import importlib.util
+    return [name for name, module in BACKEND_MODULES.items()
+            if importlib.util.find_spec(module.split(".")[0]) is not None]
@@ -0,0 +1,183 @@
+"""Local batch runner that solves queued chapter-model jobs on a bounded process pool.
+
+A job is a JSON file in the queue directory:
+
+    {"model": "12.7", "data": "mines_50.json", "time_limit": 60, "threads": 2, "values": true}
+
+``data`` is a path (relative to the queue directory) or an inline object, and defaults to the
+chapter's data.json. ``time_limit`` defaults to ``--time-limit``. ``threads`` is capped at
+``--threads``. With ``values`` the result also holds the nonzero variable values by name.
+
+A runner claims a job by renaming it into ``running/``, so several runners can share one
+queue. Each finished job gets ``results/<job>.json``, written to a temporary file and renamed
+into place, and the job file then moves to ``done/`` or ``failed/``.
+If a worker process dies, every job still in the pool gets an error result and moves to
+``failed/``, since the one that killed it cannot be told apart. Later jobs then run on a new pool.
+
+    python -m common.batch queue/ [--workers 4] [--threads 1] [--time-limit 300] [--watch]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from common.backend import ERROR
+from common.chapters import MODELS, load_data, load_module
+
+# Per-worker state: one quiet Gurobi environment reused by every job the worker runs
+_worker = {}
+
+
+def _init_worker():
+    import gurobipy as gp
+    _worker["env"] = gp.Env(params={"OutputFlag": 0})
+
+
+def _read_data(key, data, base):
+    if isinstance(data, dict):
+        return data
+    return load_data(key, base / data if data else None)
+
+
+def run_job(path, base, time_limit=None, threads=None):
+    """Build and solve one job in this process; returns the result record."""
+    start = time.perf_counter()
+    with open(path, "r") as file:
+        job = json.load(file)
+    key = job["model"]
+    if key not in MODELS:
+        raise ValueError(f"unknown model {key!r}, expected one of {sorted(MODELS)}")
+    module = load_module(key, MODELS[key]["script"])
+    time_limit = job.get("time_limit", time_limit)
+    threads = min(job.get("threads", threads), threads) if threads else job.get("threads")
+
+    model = module.build(_read_data(key, job.get("data"), base), env=_worker.get("env"))
+    model.update()
+    built = time.perf_counter()
+    result = module.solve(model, time_limit=time_limit, threads=threads)
+    record = {"model": key, "status": result.status, "objective": result.objective if result.values is not None else None,
+              "bound": model.ObjBound if model.IsMIP and result.values is not None else None,
+              "solve_seconds": result.runtime, "build_seconds": built - start,
+              "wall_seconds": time.perf_counter() - start, "time_limit": time_limit, "threads": threads,
+              "columns": model.NumVars, "rows": model.NumConstrs, "worker": os.getpid()}
+    if job.get("values") and result.values is not None:
+        names = model.getAttr("VarName", model.getVars())
+        record["values"] = {name: value for name, value in zip(names, result.values.tolist()) if value != 0}
+    model.dispose()
+    return record
+
+
+def _run_job(path, base, time_limit, threads):
+    try:
+        return run_job(path, base, time_limit, threads)
+    except Exception as error:
+        return {"status": ERROR, "error": f"{type(error).__name__}: {error}"}
+
+
+def write_atomic(path, record):
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(staging, "w") as file:
+        json.dump(record, file, indent=2)
+    os.replace(staging, path)
+
+
+class JobQueue:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.running, self.done, self.failed = (self.root / name for name in ("running", "done", "failed"))
+        for directory in (self.running, self.done, self.failed):
+            directory.mkdir(parents=True, exist_ok=True)
+        self._candidates = deque()
+
+    def claim(self):
+        """Move the oldest waiting job into running/ and return its new path, or None if the queue is empty."""
+        for _ in range(2):
+            if not self._candidates:
+                self._candidates.extend(sorted(self.root.glob("*.json"), key=lambda p: p.stat().st_mtime))
+            while self._candidates:
+                job = self._candidates.popleft()
+                try:
+                    os.rename(job, self.running / job.name)
+                except FileNotFoundError:  # claimed by another runner
+                    continue
+                return self.running / job.name
+        return None
+
+    def finish(self, job, ok):
+        os.replace(job, (self.done if ok else self.failed) / job.name)
+
+
+def run(queue, results=None, workers=os.cpu_count(), threads=None, time_limit=None, watch=False, poll=1.0):
+    """Drain the queue (or keep polling it with ``watch``); returns the number of jobs run and failed."""
+    queue = JobQueue(queue)
+    results = Path(results or queue.root / "results")
+    results.mkdir(parents=True, exist_ok=True)
+    threads = threads or max(1, os.cpu_count() // workers)
+
+    pending, finished, failed = {}, 0, 0
+    start = time.perf_counter()
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker)
+    try:
+        while True:
+            while len(pending) < workers:
+                job = queue.claim()
+                if job is None:
+                    break
+                pending[pool.submit(_run_job, job, queue.root, time_limit, threads)] = job
+            if not pending:
+                if not watch:
+                    break
+                time.sleep(poll)
+                continue
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in completed:
+                job = pending.pop(future)
+                try:
+                    outcome = future.result()
+                except BrokenProcessPool as error:
+                    # A worker died (crash, kill or out of memory): every job still in the pool fails with it
+                    outcome = {"status": ERROR, "error": f"worker process died: {error}"}
+                    broken = True
+                record = {"job": job.stem, **outcome}
+                write_atomic(results / f"{job.stem}.json", record)
+                ok = record["status"] != ERROR
+                queue.finish(job, ok)
+                finished += 1
+                failed += not ok
+                rate = finished / (time.perf_counter() - start) * 60
+                detail = f"objective {record['objective']:.2f}" if record.get("objective") is not None \
+                    else record.get("error", "no solution")
+                print(f"[{finished}] {job.stem}: {record.get('model', '?')} {record['status']}, {detail} "
+                      f"({record.get('wall_seconds', 0.0):.2f}s) - {rate:.1f} jobs/min", flush=True)
+            if broken:
+                # The other pending futures already hold the same error; new jobs go to a fresh pool
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(workers, initializer=_init_worker)
+    finally:
+        pool.shutdown()
+    elapsed = time.perf_counter() - start
+    print(f"{finished} jobs ({failed} failed) in {elapsed:.2f}s on {workers} workers x {threads} threads: "
+          f"{finished / max(elapsed, 1e-9) * 60:.1f} jobs/min")
+    return finished, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve queued chapter-model jobs on a bounded worker pool")
+    parser.add_argument("queue", help="directory of job files")
+    parser.add_argument("--results", default=None, help="result directory (defaults to <queue>/results)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Gurobi thread cap per job (defaults to the CPU count divided by the workers)")
+    parser.add_argument("--time-limit", type=float, default=None, help="time limit for jobs that do not set one")
+    parser.add_argument("--watch", action="store_true", help="keep polling the queue for new jobs")
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between polls with --watch")
+    args = parser.parse_args()
+
+    _, failed = run(args.queue, args.results, args.workers, args.threads, args.time_limit, args.watch, args.poll)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,176 @@
+"""Binary instance format: one .npy file per numeric array plus a manifest.json, memory-mapped on load.
+
+``convert`` walks a data.json object and stores
+
+    numeric lists (nested, rectangular)           as an .npy array
+    dicts of numbers or of equal-length rows      as an .npy array with the keys as row labels
+    other dicts                                   as nested fields
+    scalars, strings and lists of labels          inline in manifest.json, each distinct label list once
+
+``load`` gives back the same structure. Arrays are read-only ``np.memmap`` views, and labelled
+arrays are ``Table`` mappings, so code written against the JSON dicts (``data["Royalties"][m]``)
+keeps working while array builders take ``Table.array`` (or ``array(node, labels)``) without a copy.
+
+    python -m common.binary 12.7 mining.npd        # chapter data.json -> mining.npd/
+    python -m common.binary generated.json out.npd
+"""
+import argparse
+import json
+import re
+import sys
+from collections.abc import Mapping
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+VERSION = 1
+
+
+class Table(Mapping):
+    """Read-only mapping from labels to the rows of an array (scalars for a 1-D array)."""
+
+    def __init__(self, labels, array):
+        self.labels = labels
+        self.array = array
+
+    @cached_property
+    def index(self):
+        return {label: i for i, label in enumerate(self.labels)}
+
+    def __getitem__(self, label):
+        row = self.array[self.index[label]]
+        return row.item() if row.ndim == 0 else row
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __repr__(self):
+        return f"Table({len(self.labels)} x {self.array.shape[1:]}, {self.array.dtype})"
+
+
+def _numeric(value):
+    """The value as an int/float array, or None if it is not a rectangular numeric list."""
+    if not isinstance(value, list) or not value:
+        return None
+    try:
+        array = np.asarray(value)
+    except ValueError:  # ragged
+        return None
+    return array if array.dtype.kind in "iuf" else None
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _labels(value, shared):
+    """Index of the label list in ``shared``; equal lists are stored once."""
+    return shared.setdefault(tuple(value), len(shared))
+
+
+def _encode(value, path, directory, shared):
+    array = _numeric(value)
+    labels = None
+    if array is None and isinstance(value, dict) and value:
+        rows = list(value.values())
+        if all(_is_number(row) for row in rows) or all(isinstance(row, list) for row in rows):
+            array, labels = _numeric(rows), _labels(value, shared)
+        if array is None:
+            return {"fields": {key: _encode(item, path + [key], directory, shared) for key, item in value.items()}}
+    if array is None:
+        if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+            return {"labels": _labels(value, shared)}
+        return {"value": value}
+    name = re.sub(r"[^\w.-]", "_", ".".join(map(str, path))) + ".npy"
+    np.save(directory / name, array, allow_pickle=False)
+    return {"array": name, "labels": labels} if labels is not None else {"array": name}
+
+
+def convert(data, directory):
+    """Write a data.json object (or the path of one) as a binary instance directory."""
+    if not isinstance(data, dict):
+        with open(data, "r") as file:
+            data = json.load(file)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    shared = {}
+    root = _encode(data, [], directory, shared)
+    manifest = {"version": VERSION, "labels": [list(labels) for labels in shared], "root": root}
+    with open(directory / MANIFEST, "w") as file:
+        json.dump(manifest, file)
+    return directory
+
+
+def _decode(node, directory, mmap, shared):
+    if "fields" in node:
+        return {key: _decode(item, directory, mmap, shared) for key, item in node["fields"].items()}
+    if "array" in node:
+        array = np.load(directory / node["array"], mmap_mode="r" if mmap else None, allow_pickle=False)
+        return Table(shared[node["labels"]], array) if "labels" in node else array
+    if "labels" in node:
+        return shared[node["labels"]]
+    return node["value"]
+
+
+def load(directory, mmap=True):
+    """Read a binary instance; arrays are memory-mapped unless ``mmap`` is False."""
+    directory = Path(directory)
+    with open(directory / MANIFEST, "r") as file:
+        manifest = json.load(file)
+    if manifest.get("version") != VERSION:
+        raise ValueError(f"{directory}: unsupported binary instance version {manifest.get('version')!r}")
+    return _decode(manifest["root"], directory, mmap, manifest["labels"])
+
+
+def read(path):
+    """Load an instance from a data.json file or a binary instance directory."""
+    path = Path(path)
+    if path.is_dir():
+        return load(path)
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def array(node, labels=None):
+    """The values of a Table, dict or list as an array in ``labels`` order; no copy when already in that order."""
+    if isinstance(node, Table):
+        if labels is None or labels is node.labels or list(labels) == node.labels:
+            return node.array
+        return node.array[[node.index[label] for label in labels]]
+    if isinstance(node, Mapping):
+        return np.array([node[label] for label in (node if labels is None else labels)])
+    return np.asarray(node)
+
+
+def plain(data):
+    """A loaded instance as plain JSON types (the inverse of ``convert``)."""
+    if isinstance(data, Table):
+        return {label: plain(data[label]) for label in data.labels}
+    if isinstance(data, dict):
+        return {key: plain(value) for key, value in data.items()}
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    return data
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from common.chapters import MODELS, chapter_dir
+
+    parser = argparse.ArgumentParser(description="Convert a data.json instance to the memory-mapped binary format")
+    parser.add_argument("source", help="a chapter key (e.g. 12.7) or the path of a data.json file")
+    parser.add_argument("output", help="directory to write the .npy arrays and manifest.json to")
+    args = parser.parse_args()
+
+    source = chapter_dir(args.source) / "data.json" if args.source in MODELS else Path(args.source)
+    with open(source, "r") as file:
+        data = json.load(file)
+    convert(data, args.output)
+    if plain(load(args.output)) != data:
+        sys.exit(f"{args.output}: round trip does not reproduce {source}")
+    print(f"{source} converted to {args.output} ✅")
@@ -0,0 +1,189 @@
+"""Content-addressed on-disk cache of built chapter models.
+
+An entry is keyed by the SHA-256 of the raw data.json bytes, the chapter's Python sources (the
+formulation and the modules it loads, such as 12.5's grades.py), the modelling layer
+(common/backend.py), the build options and the naming mode (``MODEL_NAMES``). A hit is thus
+found without parsing the data, an edit to the modelling layer invalidates every entry, and a
+compact build's ``C<column>`` names are never handed to a named caller. Each entry directory holds
+
+    model.mps      the compiled model
+    index.json     variable names in column order
+    solution.json  the last optimal solution (optional)
+
+Entries are evicted least-recently-used first once the cache grows past ``max_bytes``.
+
+    python -m common.cache 12.7 [--data path] [--no-solution] [--max-mb 512]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from common import backend
+from common.backend import OPTIMAL, Result, default_names, gurobi_status, to_gurobi
+from common.chapters import MODELS, chapter_dir, load_module
+
+DEFAULT_ROOT = Path(os.environ.get("MODEL_CACHE_DIR", Path.home() / ".cache" / "model_building"))
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+
+class ModelCache:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(model_key, data_bytes, names=None):
+        digest = hashlib.sha256()
+        digest.update(model_key.encode())
+        for source in sorted(chapter_dir(model_key).glob("*.py")):
+            digest.update(source.read_bytes())
+        digest.update(Path(backend.__file__).read_bytes())
+        digest.update(json.dumps(MODELS[model_key]["options"], sort_keys=True).encode())
+        digest.update(b"named" if (default_names() if names is None else names) else b"compact")
+        digest.update(data_bytes)
+        return digest.hexdigest()
+
+    def _entry(self, key):
+        return self.root / key
+
+    def get(self, key):
+        """Return the entry directory on a hit (and mark it as recently used), else None."""
+        entry = self._entry(key)
+        if not (entry / "model.mps").exists():
+            return None
+        os.utime(entry)
+        return entry
+
+    def put(self, key, gurobi_model, names, solution=None):
+        """Write an entry atomically: build it in a temporary directory, then rename it into place."""
+        staging = Path(tempfile.mkdtemp(dir=self.root, prefix=".staging-"))
+        gurobi_model.write(str(staging / "model.mps"))
+        with open(staging / "index.json", "w") as file:
+            json.dump(names, file)
+        if solution is not None:
+            self._write_solution(staging, solution)
+        entry = self._entry(key)
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(staging, entry)
+        self.evict()
+        return entry
+
+    def put_solution(self, key, solution):
+        entry = self._entry(key)
+        if entry.exists():
+            self._write_solution(entry, solution)
+
+    @staticmethod
+    def _write_solution(directory, solution):
+        tmp = directory / "solution.json.tmp"
+        with open(tmp, "w") as file:
+            json.dump(solution, file)
+        os.replace(tmp, directory / "solution.json")
+
+    @staticmethod
+    def read_solution(entry):
+        path = entry / "solution.json"
+        if not path.exists():
+            return None
+        with open(path, "r") as file:
+            return json.load(file)
+
+    @staticmethod
+    def read_index(entry):
+        with open(entry / "index.json", "r") as file:
+            return json.load(file)
+
+    def size(self):
+        return sum(self._entry_size(entry) for entry in self._entries())
+
+    def _entries(self):
+        return [entry for entry in self.root.iterdir() if entry.is_dir() and not entry.name.startswith(".")]
+
+    @staticmethod
+    def _entry_size(entry):
+        return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        sizes = {entry: self._entry_size(entry) for entry in entries}
+        total = sum(sizes.values())
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+
+
+def cached_solve(model_key, data_path=None, cache=None, use_solution=True, env=None):
+    """Solve a chapter model, skipping parse and build on a cache hit.
+
+    Returns the Result (with ``info["cache"]`` set to "solution", "model" or "miss") and the
+    variable names in column order.
+    """
+    import gurobipy as gp
+
+    cache = cache or ModelCache()
+    start = time.perf_counter()
+    data_path = Path(data_path or chapter_dir(model_key) / "data.json")
+    data_bytes = data_path.read_bytes()
+    key = cache.key(model_key, data_bytes)
+
+    entry = cache.get(key)
+    if entry is not None:
+        names = cache.read_index(entry)
+        solution = cache.read_solution(entry) if use_solution else None
+        if solution is not None:
+            return Result("gurobi", solution["status"], solution["objective"], np.array(solution["values"]),
+                          time.perf_counter() - start, {"cache": "solution"}), names
+        model = gp.read(str(entry / "model.mps"), env=env)
+        hit = "model"
+    else:
+        formulation = load_module(model_key, "formulation")
+        built = formulation.build(json.loads(data_bytes), **MODELS[model_key]["options"])
+        names = built.var_names
+        model, _ = to_gurobi(built.to_matrix(), env)
+        model.update()
+        hit = "miss"
+
+    model.optimize()
+    values = np.array(model.getAttr("X", model.getVars())) if model.SolCount else None
+    result = Result("gurobi", gurobi_status(model), model.ObjVal if model.SolCount else float("nan"), values,
+                    time.perf_counter() - start, {"cache": hit})
+    solution = None
+    if result.status == OPTIMAL:
+        solution = {"status": result.status, "objective": result.objective, "values": values.tolist()}
+    if hit == "miss":
+        cache.put(key, model, names, solution)
+    elif solution is not None:
+        cache.put_solution(key, solution)
+    model.dispose()
+    return result, names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a chapter model through the on-disk model cache")
+    parser.add_argument("model", choices=sorted(MODELS))
+    parser.add_argument("--data", default=None, help="data file (defaults to the chapter's data.json)")
+    parser.add_argument("--no-solution", action="store_true", help="re-solve even if a cached solution exists")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2 ** 20)
+    parser.add_argument("--cache-dir", default=DEFAULT_ROOT)
+    args = parser.parse_args()
+
+    import gurobipy as gp
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        cache = ModelCache(args.cache_dir, int(args.max_mb * 2 ** 20))
+        result, names = cached_solve(args.model, args.data, cache, not args.no_solution, env)
+    print(f"[{result.info['cache']}] status: {result.status}, objective: {result.objective:.2f}, "
+          f"time: {result.runtime:.4f}s, cache size: {cache.size() / 2 ** 10:.1f} KiB")
+    sys.exit(0 if result.status == OPTIMAL else 1)
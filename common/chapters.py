@@ -0,0 +1,42 @@
+"""Registry of the chapter models and helpers to load their data and modules from anywhere."""
+import importlib.util
+import sys
+from pathlib import Path
+
+from common.binary import read
+
+ROOT = Path(__file__).resolve().parents[1]
+
+MODELS = {
+    "12.1": {"directory": "12.1_Food_Manufacture", "solution": "solution.txt", "script": "gurobi", "options": {}},
+    "12.3": {"directory": "12.3_Factory_Planning", "solution": "solution.txt", "script": "gurobi", "options": {}},
+    "12.4": {"directory": "12.4_Factory_Planning_Continued", "solution": "solution.txt", "script": "gurobi",
+             "options": {}},
+    "12.5-cost": {"directory": "12.5_Manpower_Planning", "solution": "Cost_Minimization_solution.txt",
+                  "script": "cost_gurobi", "options": {"objective": "cost"}},
+    "12.5-redundancy": {"directory": "12.5_Manpower_Planning", "solution": "Redundancy_Minimization_Solution.txt",
+                        "script": "redundancy_gurobi", "options": {"objective": "redundancy"}},
+    "12.6": {"directory": "12.6_Refinery_Optimization", "solution": "Solution.txt", "script": "gurobi", "options": {}},
+    "12.7": {"directory": "12.7_Mining", "solution": "Solution.txt", "script": "gurobi", "options": {}},
+}
+
+
+def chapter_dir(key):
+    return ROOT / MODELS[key]["directory"]
+
+
+def load_data(key, path=None):
+    """The chapter's data.json, or the instance at ``path`` (a JSON file or a binary instance directory)."""
+    return read(path or chapter_dir(key) / "data.json")
+
+
+def load_module(key, name):
+    """Import ``<chapter dir>/<name>.py`` under a unique module name so chapters do not clash."""
+    module_name = f"chapter_{key.split('-')[0].replace('.', '_')}_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, chapter_dir(key) / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,101 @@
+"""Bulk solution export for the chapter scripts.
+
+``values`` reads every variable's X in one ``getAttr`` call and returns a pandas Series per
+variable group; tables are then shaped with vectorized pandas (``unstack``) and handed to a
+``SolutionWriter``, which streams each one to disk as soon as it is written:
+
+    txt      one human-readable file (the chapter's solution.txt layout)
+    csv      <output>/<table>.csv plus <output>/summary.txt
+    parquet  <output>/<table>.parquet plus <output>/summary.txt (needs pyarrow)
+    jsonl    <output> as JSON Lines, one record per row with a "table" field
+
+Console output is off unless ``echo=True``.
+"""
+import json
+import numbers
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("txt", "csv", "parquet", "jsonl")
+
+
+def values(model, *groups):
+    """Solution values of each group (a tupledict or dict of Vars/constants) as pandas Series."""
+    flat = [item for group in groups for item in group.values()]
+    is_const = np.fromiter((isinstance(item, numbers.Number) for item in flat), bool, len(flat))
+    x = np.empty(len(flat))
+    x[~is_const] = model.getAttr("X", [item for item, const in zip(flat, is_const) if not const])
+    x[is_const] = [item for item, const in zip(flat, is_const) if const]
+
+    series, start = [], 0
+    for group in groups:
+        keys = list(group.keys())
+        index = pd.MultiIndex.from_tuples(keys) if keys and isinstance(keys[0], tuple) else pd.Index(keys)
+        series.append(pd.Series(x[start:start + len(keys)], index=index))
+        start += len(keys)
+    return series[0] if len(series) == 1 else series
+
+
+class SolutionWriter:
+    def __init__(self, output, fmt="txt", echo=False, chunksize=100_000):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown export format {fmt!r}, expected one of {FORMATS}")
+        self.output = Path(output)
+        self.fmt = fmt
+        self.echo = echo
+        self.chunksize = chunksize
+        if fmt in ("txt", "jsonl"):
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.output, "w", encoding="utf-8")
+        else:
+            self.output.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.output / "summary.txt", "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def line(self, text, styled=None):
+        """A summary line (summary.txt for csv/parquet), printed (optionally with ANSI styling) when echoing."""
+        if self.fmt == "jsonl":
+            self.file.write(json.dumps({"table": "summary", "text": text}) + "\n")
+        else:
+            self.file.write(text + "\n")
+        if self.echo:
+            print(styled or text)
+
+    def table(self, name, frame):
+        if isinstance(frame, pd.Series):
+            frame = frame.to_frame(frame.name or name)
+        if self.fmt == "txt":
+            self.file.write(f"\n{name}\n{frame.to_string()}\n")
+        elif self.fmt == "jsonl":
+            rows = frame.reset_index()
+            rows.columns = [str(column) for column in rows.columns]
+            rows.insert(0, "table", name)
+            for start in range(0, len(rows), self.chunksize):
+                rows.iloc[start:start + self.chunksize].to_json(self.file, orient="records", lines=True)
+        else:
+            path = self.output / f"{name.replace(' ', '_')}.{self.fmt}"
+            if self.fmt == "csv":
+                frame.to_csv(path, chunksize=self.chunksize)
+            else:
+                frame.columns = [str(column) for column in frame.columns]
+                frame.to_parquet(path)
+        if self.echo:
+            print(f"\n\033[94m{name}:\033[0m\n{frame.to_string()}")
+
+
+def add_arguments(parser, default_output):
+    parser.add_argument("--format", choices=FORMATS, default="txt", help="export format")
+    parser.add_argument("--output", default=default_output, help="file (txt/jsonl) or directory (csv/parquet)")
+    parser.add_argument("--echo", action="store_true", help="also print the tables to the console")
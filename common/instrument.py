@@ -0,0 +1,161 @@
+"""Per-phase timers and MIP progress sampling for the chapter scripts.
+
+    metrics = Instrument("metrics.jsonl", run="12.7")
+    metrics.mark("load")        # starts a phase (and ends the previous one)
+    ...
+    metrics.mark("build")
+    ...
+    metrics.optimize(model)     # records "presolve" and "solve" and samples MIP progress
+    metrics.mark("report")
+    ...
+    metrics.close()
+
+With ``fmt="jsonl"`` every phase and sample is appended to the file as one JSON object when it
+happens. With ``fmt="prom"`` the file is rewritten at ``close`` in the Prometheus text format
+(phase durations, final gap/incumbent/bound/nodes and the sample count), ready for a
+node-exporter textfile collector. Without a path nothing is written.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+FORMATS = ("jsonl", "prom")
+
+
+class Instrument:
+    def __init__(self, path=None, fmt="jsonl", run="", interval=0.5, **labels):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown metrics format {fmt!r}, expected one of {FORMATS}")
+        self.path = Path(path) if path else None
+        self.fmt = fmt
+        self.labels = {"run": run, **labels}
+        self.interval = interval
+        self.phases = {}
+        self.samples = []
+        self._phase, self._start = None, None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8") if self.path and fmt == "jsonl" else None
+
+    def _emit(self, record):
+        if self._file:
+            self._file.write(json.dumps({"time": time.time(), **self.labels, **record}) + "\n")
+            self._file.flush()
+
+    def _record_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self._emit({"type": "phase", "phase": name, "seconds": seconds})
+
+    def mark(self, phase=None):
+        """End the running phase and start ``phase`` (None just ends it)."""
+        now = time.perf_counter()
+        if self._phase is not None:
+            self._record_phase(self._phase, now - self._start)
+        self._phase, self._start = phase, now
+
+    def callback(self):
+        """Gurobi callback: notes when presolve ends and samples MIP progress every ``interval`` seconds.
+
+        Presolve ends at the first simplex, MIP or barrier callback. MESSAGE callbacks and the
+        MIPSOL of a heuristic run before presolve come earlier and are not counted; if presolve
+        solves the model outright, its last PRESOLVE callback is used instead.
+        """
+        from gurobipy import GRB
+
+        state = {"presolve_end": None, "presolve_last": None, "last": -self.interval}
+        solving = (GRB.Callback.SIMPLEX, GRB.Callback.MIP, GRB.Callback.BARRIER)
+
+        def sample(model, where):
+            if where in (GRB.Callback.POLLING, GRB.Callback.MESSAGE):
+                return
+            runtime = model.cbGet(GRB.Callback.RUNTIME)
+            if where == GRB.Callback.PRESOLVE:
+                state["presolve_last"] = runtime
+                return
+            if state["presolve_end"] is None and where in solving:
+                state["presolve_end"] = runtime
+            if where == GRB.Callback.MIP and runtime - state["last"] >= self.interval:
+                state["last"] = runtime
+                self._sample("progress", runtime, model.cbGet(GRB.Callback.MIP_OBJBST),
+                             model.cbGet(GRB.Callback.MIP_OBJBND), model.cbGet(GRB.Callback.MIP_NODCNT))
+            elif where == GRB.Callback.MIPSOL:
+                self._sample("incumbent", runtime, model.cbGet(GRB.Callback.MIPSOL_OBJ),
+                             model.cbGet(GRB.Callback.MIPSOL_OBJBND), model.cbGet(GRB.Callback.MIPSOL_NODCNT))
+
+        sample.state = state
+        return sample
+
+    def _sample(self, kind, runtime, incumbent, bound, nodes):
+        from gurobipy import GRB
+
+        has_incumbent, has_bound = abs(incumbent) < GRB.INFINITY, abs(bound) < GRB.INFINITY
+        gap = abs(bound - incumbent) / max(abs(incumbent), 1e-10) if has_incumbent and has_bound else None
+        record = {"type": kind, "runtime": runtime, "incumbent": incumbent if has_incumbent else None,
+                  "bound": bound if has_bound else None, "gap": gap, "nodes": nodes}
+        self.samples.append(record)
+        self._emit(record)
+
+    def optimize(self, model):
+        """model.optimize() with sampling; splits the time into presolve and solve phases."""
+        self.mark(None)
+        callback = self.callback()
+        model.optimize(callback)
+        state = callback.state
+        presolve = next((t for t in (state["presolve_end"], state["presolve_last"]) if t is not None), 0.0)
+        self._record_phase("presolve", presolve)
+        self._record_phase("solve", max(model.Runtime - presolve, 0.0))
+        if model.IsMIP and model.SolCount:
+            self._sample("final", model.Runtime, model.ObjVal, model.ObjBound, model.NodeCount)
+
+    def close(self):
+        self.mark(None)
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.path and self.fmt == "prom":
+            self._write_prometheus()
+
+    def _write_prometheus(self):
+        labels = ",".join(f'{k}="{v}"' for k, v in self.labels.items())
+        lines = ["# HELP model_phase_seconds Wall time per phase.", "# TYPE model_phase_seconds gauge"]
+        lines += [f'model_phase_seconds{{{labels},phase="{name}"}} {seconds:.6f}' for name, seconds in self.phases.items()]
+        if self.samples:
+            last = self.samples[-1]
+            for metric, key, text in [("model_mip_gap", "gap", "Relative MIP gap."),
+                                      ("model_mip_incumbent", "incumbent", "Best objective found."),
+                                      ("model_mip_bound", "bound", "Best objective bound."),
+                                      ("model_mip_nodes", "nodes", "Explored branch-and-bound nodes.")]:
+                if last[key] is not None:
+                    lines += [f"# HELP {metric} {text}", f"# TYPE {metric} gauge", f"{metric}{{{labels}}} {last[key]}"]
+        lines += ["# HELP model_mip_samples_total Progress samples taken.", "# TYPE model_mip_samples_total counter",
+                  f"model_mip_samples_total{{{labels}}} {len(self.samples)}"]
+        staging = self.path.with_name(self.path.name + ".tmp")
+        staging.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(staging, self.path)
+
+
+def milestones(model, gap=0.01, time_limit=None):
+    """Optimize until ``gap``; returns solver seconds to the first incumbent (and its objective) and to the gap."""
+    from gurobipy import GRB
+
+    first = {}
+
+    def record(model, where):
+        if where == GRB.Callback.MIPSOL and "incumbent" not in first:
+            first["incumbent"] = model.cbGet(GRB.Callback.RUNTIME)
+            first["objective"] = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+
+    model.Params.MIPGap = gap
+    if time_limit is not None:
+        model.Params.TimeLimit = time_limit
+    model.optimize(record)
+    return {"first_incumbent": first.get("incumbent"), "first_objective": first.get("objective"),
+            "time_to_gap": model.Runtime if model.Status == GRB.OPTIMAL else None,
+            "objective": model.ObjVal if model.SolCount else None, "bound": model.ObjBound,
+            "gap": model.MIPGap if model.SolCount else None, "nodes": int(model.NodeCount)}
+
+
+def add_arguments(parser):
+    parser.add_argument("--metrics", default=None, help="write phase timings and MIP progress to this file")
+    parser.add_argument("--metrics-format", choices=FORMATS, default="jsonl")
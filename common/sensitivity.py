@@ -0,0 +1,62 @@
+"""Sensitivity and ranging tables of a solved LP, read in bulk right after the solve.
+
+``constraints`` reads Slack, Pi and SARHSLow/Up of every row, and ``variables`` reads X, RC and
+SAObjLow/Up of every column, each attribute in one ``getAttr`` call. ``report`` writes both
+tables through a ``SolutionWriter``, with the chapter's key rows (name patterns such as
+``Workforce_Requirement_*``) as a table of their own. Ranging needs a basic LP solution, so MIPs
+and barrier solves without crossover are reported without it.
+"""
+from fnmatch import fnmatchcase
+
+import pandas as pd
+from gurobipy import GRB, GurobiError
+
+ROW_ATTRIBUTES = ("Sense", "RHS", "Slack", "Pi", "SARHSLow", "SARHSUp")
+COLUMN_ATTRIBUTES = ("X", "Obj", "LB", "UB", "RC", "SAObjLow", "SAObjUp")
+
+
+def _matches(name, patterns):
+    return any(fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _table(model, items, attributes, index):
+    columns = {}
+    for attribute in attributes:
+        try:
+            columns[attribute] = model.getAttr(attribute, items)
+        except GurobiError:  # duals and ranging are not available (MIP, no basis)
+            continue
+    return pd.DataFrame(columns, index=pd.Index(model.getAttr(index, items), name=index))
+
+
+def constraints(model, patterns=None):
+    """Slack, shadow price and RHS range of each linear constraint (those matching ``patterns`` if given)."""
+    rows = model.getConstrs()
+    if patterns:
+        rows = [row for row, name in zip(rows, model.getAttr("ConstrName", rows)) if _matches(name, patterns)]
+    return _table(model, rows, ROW_ATTRIBUTES, "ConstrName")
+
+
+def variables(model):
+    """Value, reduced cost and objective range of each variable."""
+    return _table(model, model.getVars(), COLUMN_ATTRIBUTES, "VarName")
+
+
+def report(model, out, key_rows=()):
+    """Write the sensitivity tables of a solved model to a SolutionWriter."""
+    if model.Status != GRB.OPTIMAL:
+        out.line(f"No sensitivity report: the model status is {model.Status}")
+        return
+    rows = constraints(model)
+    if "SARHSLow" not in rows:
+        out.line("Ranging is only available for an LP with a basic solution")
+    if key_rows:
+        out.table("Key constraints", rows[[_matches(name, key_rows) for name in rows.index]])
+    out.table("Constraints", rows)
+    out.table("Variables", variables(model))
+
+
+def add_arguments(parser):
+    parser.add_argument("--sensitivity", default=None,
+                        help="also write shadow prices, reduced costs and ranging to this file or directory "
+                             "(in the --format of the solution)")
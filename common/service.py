@@ -0,0 +1,304 @@
+"""Asyncio solve service for interactive front ends such as the chapter Streamlit dashboards.
+
+    async with SolveService(workers=4) as service:
+        async with service.solve("12.7", data, session="user-1/mining") as solve:
+            async for event in solve:
+                ...
+
+A solve streams ``{"event": "progress", "runtime", "incumbent", "bound", "gap", "nodes"}`` records
+and ends with one ``{"event": "result", ...}`` record (fields as in common/batch.py) or
+``{"event": "cancelled"}``. Models are built and solved on a process pool, with one quiet Gurobi
+environment per worker. A solver callback posts MIP progress, at most every ``interval`` seconds
+plus every new incumbent, to a queue that a reader thread forwards to the event loop.
+
+Identical requests (same model, data and options) share the solve that is already in flight.
+Each caller gets its own stream, starting from the latest progress. A request with a
+``session`` supersedes the previous request of that session, whose stream ends with
+"cancelled". A solve that nobody is waiting for any more is cancelled: it is dropped from the
+pool queue before it starts, or stopped with ``Model.terminate`` from the callback.
+
+    python -m common.service 12.7 12.1 --repeat 3 --time-limit 10   # a dashboard-like demo
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from common.backend import ERROR
+from common.chapters import MODELS, load_data, load_module
+
+FINAL = ("result", "cancelled")
+
+# Per-worker state: the Gurobi environment, the progress queue and the shared cancellation flags
+_worker = {}
+
+
+def _init_worker(events, cancelled):
+    import gurobipy as gp
+    _worker.update(env=gp.Env(params={"OutputFlag": 0}), events=events, cancelled=cancelled)
+
+
+class _Progress:
+    """Passed as ``metrics`` to the chapter ``solve``: posts progress and stops cancelled solves."""
+
+    def __init__(self, job, interval):
+        self.job = job
+        self.interval = interval
+
+    def optimize(self, model):
+        from gurobipy import GRB
+
+        events, cancelled = _worker["events"], _worker["cancelled"]
+        last = {"post": -self.interval, "check": -self.interval}
+
+        def post(runtime, incumbent, bound, nodes):
+            has_incumbent, has_bound = abs(incumbent) < GRB.INFINITY, abs(bound) < GRB.INFINITY
+            gap = abs(bound - incumbent) / max(abs(incumbent), 1e-10) if has_incumbent and has_bound else None
+            events.put((self.job, {"event": "progress", "runtime": runtime,
+                                   "incumbent": incumbent if has_incumbent else None,
+                                   "bound": bound if has_bound else None, "gap": gap, "nodes": nodes}))
+
+        def callback(model, where):
+            if where == GRB.Callback.POLLING:
+                return
+            runtime = model.cbGet(GRB.Callback.RUNTIME)
+            # The flags live in a manager process, so they are only read every interval
+            if runtime - last["check"] >= self.interval:
+                last["check"] = runtime
+                if self.job in cancelled:
+                    model.terminate()
+                    return
+            if where == GRB.Callback.MIP and runtime - last["post"] >= self.interval:
+                last["post"] = runtime
+                post(runtime, model.cbGet(GRB.Callback.MIP_OBJBST), model.cbGet(GRB.Callback.MIP_OBJBND),
+                     model.cbGet(GRB.Callback.MIP_NODCNT))
+            elif where == GRB.Callback.MIPSOL:
+                post(runtime, model.cbGet(GRB.Callback.MIPSOL_OBJ), model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+                     model.cbGet(GRB.Callback.MIPSOL_NODCNT))
+
+        model.optimize(callback)
+
+
+def _solve(job, key, data, time_limit, threads, values, interval):
+    """Build and solve one request in a worker; returns the result record."""
+    start = time.perf_counter()
+    try:
+        module = load_module(key, MODELS[key]["script"])
+        model = module.build(data if data is not None else load_data(key), env=_worker["env"])
+        model.update()
+        built = time.perf_counter()
+        result = module.solve(model, time_limit=time_limit, threads=threads, metrics=_Progress(job, interval))
+    except Exception as error:
+        return {"status": ERROR, "error": f"{type(error).__name__}: {error}"}
+    finally:
+        _worker["cancelled"].pop(job, None)
+    record = {"model": key, "status": result.status, "objective": result.objective if result.values is not None else None,
+              "bound": model.ObjBound if model.IsMIP and result.values is not None else None,
+              "solve_seconds": result.runtime, "build_seconds": built - start,
+              "wall_seconds": time.perf_counter() - start, "worker": os.getpid()}
+    if values and result.values is not None:
+        names = model.getAttr("VarName", model.getVars())
+        record["values"] = {name: value for name, value in zip(names, result.values.tolist()) if value != 0}
+    model.dispose()
+    return record
+
+
+def request_key(key, data=None, time_limit=None, threads=None, values=False):
+    """Digest of everything that determines a solve; equal digests share one solve."""
+    if key not in MODELS:
+        raise ValueError(f"unknown model {key!r}, expected one of {sorted(MODELS)}")
+    text = json.dumps([key, data, time_limit, threads, values], sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class _Job:
+    def __init__(self, number, digest):
+        self.number = number
+        self.digest = digest
+        self.subscribers = set()
+        self.progress = None
+        self.future = None
+
+
+class Subscription:
+    """One caller's stream of a solve: an async iterator of event records."""
+
+    def __init__(self, service, job, session):
+        self._service = service
+        self.job = job
+        self.session = session
+        self._queue = asyncio.Queue()
+        self.closed = False
+        if job.progress is not None:
+            self._queue.put_nowait(job.progress)
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def __anext__(self):
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        if event["event"] in FINAL:
+            self.close()
+        return event
+
+    def _push(self, event):
+        if not self.closed:
+            self._queue.put_nowait(event)
+
+    def close(self):
+        """Stop listening; the solve is cancelled if no one else is waiting for it."""
+        if not self.closed:
+            self.closed = True
+            self._service._detach(self)
+
+
+class SolveService:
+    def __init__(self, workers=os.cpu_count(), threads=None, interval=0.25):
+        self.workers = workers
+        self.threads = threads or max(1, os.cpu_count() // workers)
+        self.interval = interval
+        self._jobs = {}       # digest -> job in flight
+        self._running = {}    # job number -> job
+        self._sessions = {}   # session -> its current subscription
+        self._numbers = itertools.count()
+        self.stats = {"submitted": 0, "shared": 0, "cancelled": 0, "superseded": 0}
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._manager = multiprocessing.Manager()
+        self._events, self._cancelled = self._manager.Queue(), self._manager.dict()
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                         initargs=(self._events, self._cancelled))
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    async def close(self):
+        for job in list(self._running.values()):
+            for subscription in list(job.subscribers):
+                subscription._push({"event": "cancelled", "reason": "shutdown"})
+                subscription.close()
+        await self._loop.run_in_executor(None, self._pool.shutdown)
+        self._events.put(None)
+        await self._loop.run_in_executor(None, self._reader.join)
+        self._manager.shutdown()
+
+    def _read(self):
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._progress, *item)
+
+    def _progress(self, number, event):
+        job = self._running.get(number)
+        if job is not None:
+            job.progress = event
+            for subscription in list(job.subscribers):
+                subscription._push(event)
+
+    def solve(self, key, data=None, time_limit=None, session=None, values=False):
+        """Subscribe to the solve of ``key`` on ``data`` (the chapter's data.json if None)."""
+        digest = request_key(key, data, time_limit, self.threads, values)
+        previous = self._sessions.pop(session, None) if session is not None else None
+        if previous is not None and not previous.closed:
+            self.stats["superseded"] += 1
+            previous._push({"event": "cancelled", "reason": "superseded"})
+            previous.close()
+
+        job = self._jobs.get(digest)
+        if job is None:
+            job = _Job(next(self._numbers), digest)
+            self._jobs[digest] = self._running[job.number] = job
+            job.future = self._pool.submit(_solve, job.number, key, data, time_limit, self.threads, values,
+                                           self.interval)
+            job.future.add_done_callback(lambda future: self._loop.call_soon_threadsafe(self._finish, job))
+            self.stats["submitted"] += 1
+        else:
+            self.stats["shared"] += 1
+        subscription = Subscription(self, job, session)
+        job.subscribers.add(subscription)
+        if session is not None:
+            self._sessions[session] = subscription
+        return subscription
+
+    def _finish(self, job):
+        self._running.pop(job.number, None)
+        if self._jobs.get(job.digest) is job:
+            del self._jobs[job.digest]
+        if job.future.cancelled():
+            return
+        try:
+            event = {"event": "result", **job.future.result()}
+        except Exception as error:  # the worker process died
+            event = {"event": "result", "status": ERROR, "error": f"{type(error).__name__}: {error}"}
+        for subscription in list(job.subscribers):
+            subscription._push(event)
+            subscription.close()
+
+    def _detach(self, subscription):
+        job = subscription.job
+        job.subscribers.discard(subscription)
+        if subscription.session is not None and self._sessions.get(subscription.session) is subscription:
+            del self._sessions[subscription.session]
+        if job.subscribers or job.future.done():
+            return
+        # Nobody is waiting: a new identical request starts afresh
+        if self._jobs.get(job.digest) is job:
+            del self._jobs[job.digest]
+        self.stats["cancelled"] += 1
+        if not job.future.cancel():
+            self._cancelled[job.number] = True
+
+
+async def _demo(keys, repeat, time_limit, workers):
+    """Each key is asked for ``repeat`` times at once (shared), then re-asked in one session (superseded)."""
+    async with SolveService(workers) as service:
+        async def watch(name, subscription):
+            async for event in subscription:
+                if event["event"] == "progress":
+                    print(f"{name}: {event['runtime']:.2f}s incumbent {event['incumbent']} bound {event['bound']}")
+                elif event["event"] == "result":
+                    print(f"{name}: {event['status']}, objective {event['objective']} ({event.get('wall_seconds', 0):.2f}s)")
+                else:
+                    print(f"{name}: cancelled ({event.get('reason')})")
+
+        tasks = [watch(f"{key} viewer {n + 1}", service.solve(key, time_limit=time_limit))
+                 for key in keys for n in range(repeat)]
+        first = {key: service.solve(key, time_limit=time_limit + 1, session=f"{key}/slider") for key in keys}
+        tasks += [watch(f"{key} slider (old)", subscription) for key, subscription in first.items()]
+        tasks += [watch(f"{key} slider (new)", service.solve(key, time_limit=time_limit + 2, session=f"{key}/slider"))
+                  for key in keys]
+        await asyncio.gather(*tasks)
+        print(f"\n{service.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent requests against the async solve service")
+    parser.add_argument("models", nargs="*", default=["12.7"], choices=list(MODELS))
+    parser.add_argument("--repeat", type=int, default=3, help="identical requests per model")
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    asyncio.run(_demo(args.models, args.repeat, args.time_limit, args.workers))